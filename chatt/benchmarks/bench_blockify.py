@@ -0,0 +1,150 @@
+# 파일 경로: benchmarks/bench_blockify.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_blockify --mb 100 --batch 1000
+# 사례 말뭉치를 만들어 (1) 예전 read_lines+blockify 와 스트리밍 iter_blocks 의 시간·최대 메모리,
+# (2) 예전 merge_blocks 와 BlockIndex 병합의 시간을 비교합니다. 각 방식은 별도 프로세스에서 잽니다.
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import resource
+import tempfile
+import time
+
+from modules import rules_config
+
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+
+
+def write_corpus(path: str, megabytes: float) -> int:
+    """사례 블록을 megabytes 크기만큼 씁니다. 반환: 사례 수"""
+    target = int(megabytes * 1024 * 1024)
+    written, i = 0, 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("이 책의 사례는 모두 실제 상담에서 가져왔다.\n\n")
+        while written < target:
+            stems = "".join(STEMS[(i * 7 + k) % 10] for k in range(4))
+            branches = "".join(BRANCHES[(i * 5 + k) % 12] for k in range(4))
+            block = (f"<사례 {i}>\n{stems}(乾)\n{branches}\n대운\n{STEMS[i % 10]}{STEMS[(i + 1) % 10]}\n"
+                     f"{BRANCHES[i % 12]}{BRANCHES[(i + 1) % 12]}\n"
+                     f"제압방식: 官이 劫을 제압하는 구조 {i % 97}\n"
+                     f"{i % 13}세에 응기하여 재물을 얻었다. 합충이 함께 있어 변화가 많다.\n\n")
+            f.write(block)
+            written += len(block.encode("utf-8"))
+            i += 1
+    return i
+
+
+# --- 예전 구현 (비교 기준) ---
+def legacy_read_lines(filename):
+    with open(filename, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def legacy_blockify(lines, filename):
+    blocks, block = [], None
+    for line in lines:
+        if re.match(r'^<사례\s*\d+>|^사례\d*[\):]', line):
+            if block: blocks.append(block)
+            block = {"type":"사례", "title":line, "팔자":[], "대운":[], "본문":[], "tags":[], "meta":{"source":filename}}
+        elif block:
+            if re.match(r"^[甲乙丙丁戊己庚辛壬癸⼀-⿕]+.*[(乾)(坤)]?$", line): block["팔자"].append(line)
+            elif re.match(r"^[戌亥子丑寅卯申未午酉辰巳⺒]+$", line): block["팔자"].append(line)
+            elif line.startswith("대운"): continue
+            elif re.match(r"^[甲乙丙丁戊己庚辛壬癸⼀-⿕]+", line): block["대운"].append(line)
+            elif re.match(r"^[戌亥子丑寅卯申未午酉辰巳⺒]+", line): block["대운"].append(line)
+            elif "제압방식" in line or "구조" in line or "格" in line:
+                block["tags"].extend(re.findall(r"[傷官印財比劫官殺格構造제압적포귀격합충파형穿墓공망운응기생극화허투]", line))
+                block["본문"].append(line)
+            else: block["본문"].append(line)
+        else:
+            blocks.append({"type":"해설문", "text":line, "meta":{"source":filename}})
+    if block: blocks.append(block)
+    for b in blocks:
+        if "tags" in b: b["tags"] = list(set(b["tags"]))
+    return blocks
+
+
+def legacy_merge_blocks(existing, new):
+    seen, merged = set(), []
+    for b in existing + new:
+        key = json.dumps(b, ensure_ascii=False, sort_keys=True)
+        if key not in seen:
+            merged.append(b)
+            seen.add(key)
+    return merged
+
+
+# --- 측정 (자식 프로세스) ---
+def _parse(kind: str, path: str, queue):
+    start = time.perf_counter()
+    if kind == "legacy":
+        count = len(legacy_blockify(legacy_read_lines(path), path))
+    else:
+        count = sum(1 for _ in rules_config.iter_blocks(rules_config.iter_lines(path), path))
+    elapsed = time.perf_counter() - start
+    queue.put({"blocks": count, "seconds": elapsed,
+               "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024})
+
+
+def _in_child(target, *args) -> dict:
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=target, args=(*args, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def bench_merge(path: str, existing_count: int, batch: int, tmp: str):
+    blocks = rules_config.iter_blocks(rules_config.iter_lines(path), path)
+    existing = [b for _, b in zip(range(existing_count), blocks)]
+    # 새 묶음: 절반은 이미 있는 블록, 절반은 처음 보는 블록
+    new = existing[:batch // 2] + [b for _, b in zip(range(batch - batch // 2), blocks)]
+
+    start = time.perf_counter()
+    legacy = legacy_merge_blocks(existing, new)
+    legacy_seconds = time.perf_counter() - start
+
+    index = rules_config.BlockIndex(os.path.join(tmp, "block_index.db"))
+    start = time.perf_counter()
+    index.rebuild(existing)
+    rebuild_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    merged = rules_config.merge_blocks(existing, new, index=index)
+    index.commit()
+    indexed_seconds = time.perf_counter() - start
+    index.close()
+    assert len(merged) == len(legacy), (len(merged), len(legacy))
+    return {"existing": len(existing), "batch": len(new), "added": len(merged) - len(existing),
+            "legacy_seconds": legacy_seconds, "indexed_seconds": indexed_seconds, "rebuild_seconds": rebuild_seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="blockify 스트리밍 / merge_blocks 색인 벤치마크")
+    parser.add_argument("--mb", type=float, default=100, help="사례 말뭉치 크기 (MB)")
+    parser.add_argument("--existing", type=int, default=200_000, help="병합 시험에서 기존 지식 블록 수")
+    parser.add_argument("--batch", type=int, default=1000, help="한 번에 병합하는 새 블록 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cases.txt")
+        cases = write_corpus(path, args.mb)
+        print(f"말뭉치: {os.path.getsize(path) / 1024 / 1024:.1f} MB, 사례 {cases:,}개")
+
+        print(f"{'blockify':<10} {'blocks':>9} {'seconds':>8} {'max RSS MB':>11}")
+        for kind in ("legacy", "stream"):
+            r = _in_child(_parse, kind, path)
+            print(f"{kind:<10} {r['blocks']:>9,} {r['seconds']:>8.2f} {r['max_rss_mb']:>11.0f}")
+
+        r = bench_merge(path, args.existing, args.batch, tmp)
+        print(f"\nmerge: 기존 {r['existing']:,}개 + 새 {r['batch']:,}개 → 추가 {r['added']:,}개")
+        print(f"  legacy merge_blocks   {r['legacy_seconds'] * 1000:>9.1f} ms  (병합할 때마다)")
+        print(f"  BlockIndex merge      {r['indexed_seconds'] * 1000:>9.1f} ms  (병합할 때마다)")
+        print(f"  BlockIndex.rebuild    {r['rebuild_seconds'] * 1000:>9.1f} ms  (최초 한 번)")
+
+
+if __name__ == "__main__":
+    main()
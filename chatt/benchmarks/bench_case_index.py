@@ -0,0 +1,141 @@
+# 파일 경로: benchmarks/bench_case_index.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_case_index --entries 20000
+# knowledge_base.json 의 항목을 변형해 늘린 지식으로 (1) 색인 생성/증분 갱신 시간,
+# (2) 조회마다 전체를 훑는 선형 탐색과 CaseIndex.find / search 의 응답 시간을 비교합니다.
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from modules import case_index
+from modules.case_index import PILLAR_POSITIONS, TAG_ALIASES, UNKNOWN_CHAR
+
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+
+QUERIES = [
+    "일간:戊",
+    "일간:戊 월지:未",
+    "#傷官 #공망",
+    "#穿|#沖 -#合",
+    "팔자:??癸?",
+    "회계",
+    "자식宮 #入墓",
+    "일간:甲 #傷官 자식",
+]
+
+
+def make_knowledge(source: dict, entries: int, seed: int = 0) -> dict:
+    """원본 항목을 돌려 쓰되, 팔자 글자와 사례 번호를 바꿔 서로 다른 항목으로 만듭니다."""
+    rng = random.Random(seed)
+    originals = [item for topic in source.values() for item in topic.get("sub_topics", {}).values()]
+    table = str.maketrans({c: STEMS[(i + 3) % 10] for i, c in enumerate(STEMS)} |
+                          {c: BRANCHES[(i + 5) % 12] for i, c in enumerate(BRANCHES)})
+    sub_topics = {}
+    for i in range(entries):
+        content = originals[i % len(originals)]["content"]
+        for _ in range(rng.randrange(4)):
+            content = content.translate(table)
+        sub_topics[f"항목_{i}"] = {"content": content.replace("<사례 ", f"<사례 {i}0"), "category": "미실행"}
+    return {"문서AI": {"sub_topics": sub_topics}}
+
+
+# --- 선형 탐색 (비교 기준): 조회마다 모든 사례를 파싱된 상태에서 조건과 대조 ---
+def _atom_matches(case, atom: str) -> bool:
+    if atom.startswith("#"):
+        return TAG_ALIASES.get(atom[1:], atom[1:]) in case.tags
+    field, sep, value = atom.partition(":")
+    if sep and field == "팔자":
+        return any(all(v in (UNKNOWN_CHAR, ".") or (p < len(c) and c[p] == v) for p, v in enumerate(value))
+                   for c in case.charts)
+    if sep and field in PILLAR_POSITIONS:
+        pos = PILLAR_POSITIONS.index(field)
+        return any(c[pos] == value for c in case.charts)
+    return atom in case.text
+
+
+def linear_find(cases, query: str):
+    result = []
+    clauses = query.split()
+    for i, case in enumerate(cases):
+        ok = True
+        for clause in clauses:
+            negated = clause.startswith("-") and len(clause) > 1
+            hit = any(_atom_matches(case, a) for a in clause[1 if negated else 0:].split("|") if a)
+            if hit == negated:
+                ok = False
+                break
+        if ok:
+            result.append((case.entry, case.seq))
+    return result
+
+
+def _ms(fn, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사례 역색인 벤치마크")
+    parser.add_argument("--entries", type=int, default=20_000, help="지식 항목 수")
+    parser.add_argument("--source", default=case_index.KB_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(args.source, encoding="utf-8") as f:
+        knowledge = make_knowledge(json.load(f), args.entries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb_path = os.path.join(tmp, "knowledge_base.json")
+        with open(kb_path, "w", encoding="utf-8") as f:
+            json.dump(knowledge, f, ensure_ascii=False)
+        print(f"지식: 항목 {args.entries:,}개, {os.path.getsize(kb_path) / 1024 / 1024:.1f} MB")
+
+        index = case_index.CaseIndex(os.path.join(tmp, "case_index.db"))
+        start = time.perf_counter()
+        index.update_from_file(kb_path)
+        print(f"색인 생성: {time.perf_counter() - start:.2f} s, 사례 {len(index):,}개, "
+              f"{os.path.getsize(index.path) / 1024 / 1024:.1f} MB")
+
+        # 1% 항목을 고친 뒤 증분 갱신
+        changed = dict(knowledge["문서AI"]["sub_topics"])
+        for i in range(0, args.entries, 100):
+            changed[f"항목_{i}"] = {"content": changed[f"항목_{i}"]["content"] + "\n추가 메모 회계"}
+        start = time.perf_counter()
+        counts = index.update({"문서AI": {"sub_topics": changed}})
+        print(f"증분 갱신: {(time.perf_counter() - start) * 1000:.0f} ms ({counts})")
+        start = time.perf_counter()
+        index.update({"문서AI": {"sub_topics": changed}})
+        print(f"변경 없음 확인: {(time.perf_counter() - start) * 1000:.0f} ms")
+        knowledge = {"문서AI": {"sub_topics": changed}}
+
+        # 선형 탐색은 "전부 읽어 훑기" 이므로 파싱 비용도 함께 보여줍니다.
+        start = time.perf_counter()
+        cases = list(case_index.iter_cases(knowledge))
+        print(f"선형 탐색 준비(전체 파싱): {time.perf_counter() - start:.2f} s\n")
+
+        index.close()
+        index = case_index.CaseIndex(index.path)  # 다시 열어 지연 로드 포함
+        print(f"{'query':<22} {'hits':>7} {'linear ms':>10} {'index ms':>9} {'same':>5}")
+        for query in QUERIES:
+            linear_ms, expected = _ms(lambda: linear_find(cases, query), args.repeat)
+            index_ms, ids = _ms(lambda: index.find(query), args.repeat)
+            found = [(c.entry, c.seq) for c in index.get(ids)]
+            print(f"{query:<22} {len(ids):>7,} {linear_ms:>10.1f} {index_ms:>9.1f} {sorted(found) == sorted(expected)!s:>5}")
+
+        for text, where in (("자식이 入墓", None), ("부모 이혼", "#穿"), ("회계사 財星", "일간:戊")):
+            ms, hits = _ms(lambda: index.search(text, k=10, where=where), args.repeat)
+            print(f"search {text!r} where={where!r}: {ms:.1f} ms, 상위 {len(hits)}개")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
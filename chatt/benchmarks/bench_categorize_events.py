@@ -0,0 +1,109 @@
+# 파일 경로: benchmarks/bench_categorize_events.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_categorize_events --rows 2000000 --workers 1 2
+# 예전 방식(전체 read_csv + Series.apply)과 청크 스트리밍(CSV/Parquet 출력)의 시간·최대 메모리를 비교합니다.
+
+import argparse
+import contextlib
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+
+import pandas as pd
+
+import categorize_events
+
+EVENTS = ["결혼했다", "이혼하였다", "승진하였다", "창업을 했다", "파재하였다", "부친이 사망하였다", "수술을 받았다",
+          "관재구설이 있었다", "이사를 했다", "여행을 다녀왔다", "투자를 시작했다", "시험합격하였다"]
+
+
+def write_events(path: str, rows: int, seed: int = 0):
+    """case_id, age, description 열의 사건 CSV. 설명의 약 1/3 은 고유 문구를 포함합니다."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("case_id,age,description\n")
+        for i in range(rows):
+            event = rng.choice(EVENTS)
+            if rng.random() < 0.33:
+                event = f"{rng.randint(1, 99)}세 {event} ({i})"
+            f.write(f"{i // 5},{rng.randint(1, 90)},{event}\n")
+
+
+def check_mixed_chunks(tmp: str) -> bool:
+    """첫 청크에서는 전부 비어 있던 열에 뒤 청크에서 글자가 나와도 Parquet 출력이 깨지지 않는지 (chunksize=10)."""
+    input_filename = os.path.join(tmp, "mixed.csv")
+    with open(input_filename, "w", encoding="utf-8") as f:
+        f.write("case_id,age,note,description\n")
+        for i in range(30):
+            note = f"메모 {i}" if i >= 10 else ""
+            age = "" if i == 25 else str(20 + i)  # 뒤 청크에만 결측 나이 (int → float 추론 변화)
+            f.write(f"{i},{age},{note},{EVENTS[i % len(EVENTS)]}\n")
+    output_filename = os.path.join(tmp, "mixed.parquet")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        categorize_events.categorize_file(input_filename, output_filename, chunksize=10)
+    result = pd.read_parquet(output_filename)
+    expected = pd.read_csv(input_filename, dtype=str)
+    return len(result) == 30 and result[expected.columns].equals(expected)
+
+
+def legacy(input_filename: str, output_filename: str):
+    """예전 main: 전체를 읽고 행마다 lambda 를 적용한 뒤 튜플 목록으로 DataFrame 을 다시 만듭니다."""
+    rules = categorize_events.compile_keyword_rules(categorize_events.KEYWORD_RULES)
+    df = pd.read_csv(input_filename)
+    categories = df['description'].apply(lambda x: categorize_events.categorize_description(x, rules))
+    df[['category1', 'category2', 'outcome']] = pd.DataFrame(categories.tolist(), index=df.index)
+    df.to_csv(output_filename, index=False, encoding='utf-8-sig')
+
+
+def _measure(kind: str, input_filename: str, output_filename: str, chunksize: int, workers: int, queue):
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):  # 미리보기/진행 출력 숨김
+        if kind == "legacy":
+            legacy(input_filename, output_filename)
+        else:
+            categorize_events.categorize_file(input_filename, output_filename, chunksize, workers)
+    queue.put({"seconds": time.perf_counter() - start,
+               # 자식 프로세스(풀 worker) 중 가장 큰 값도 함께 봅니다.
+               "max_rss_mb": max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                                 resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024})
+
+
+def measure(*args) -> dict:
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_measure, args=(*args, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="categorize_events 청크 스트리밍 벤치마크")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunksize", type=int, default=categorize_events.CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_filename = os.path.join(tmp, "life_events.csv")
+        write_events(input_filename, args.rows)
+        print(f"입력: {args.rows:,}행, {os.path.getsize(input_filename) / 1024 / 1024:.0f} MB")
+
+        runs = [("legacy", "legacy.csv", 1)]
+        runs += [(f"stream w={w}", "stream.csv", w) for w in args.workers]
+        runs += [(f"parquet w={w}", "stream.parquet", w) for w in args.workers[:1]]
+        print(f"{'mode':<14} {'seconds':>8} {'rows/s':>10} {'max RSS MB':>11}")
+        for name, output, workers in runs:
+            kind = "legacy" if name == "legacy" else "stream"
+            r = measure(kind, input_filename, os.path.join(tmp, output), args.chunksize, workers)
+            print(f"{name:<14} {r['seconds']:>8.2f} {args.rows / r['seconds']:>10,.0f} {r['max_rss_mb']:>11.0f}")
+
+        same = pd.read_csv(os.path.join(tmp, "legacy.csv")).equals(pd.read_csv(os.path.join(tmp, "stream.csv")))
+        print(f"\n예전 방식과 결과 동일: {same}")
+        print(f"혼합 청크(빈 열 → 글자) Parquet 출력: {'OK' if check_mixed_chunks(tmp) else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
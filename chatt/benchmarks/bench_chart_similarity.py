@@ -0,0 +1,80 @@
+# 파일 경로: benchmarks/bench_chart_similarity.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_chart_similarity --charts 200000
+# 무작위 팔자 라이브러리에서 (1) 파이썬으로 사례마다 특징 집합을 비교하는 방식과
+# (2) ChartLibrary 의 행렬-벡터 곱 top-k 의 응답 시간을 비교하고, mmap 으로 다시 연 라이브러리도 잽니다.
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from modules.chart_similarity import FEATURE_WEIGHTS, ChartLibrary, encode_charts
+
+
+def random_library(count: int, seed: int = 0) -> ChartLibrary:
+    rng = np.random.default_rng(seed)
+    stems, branches = rng.integers(0, 10, (count, 4)), rng.integers(0, 12, (count, 4))
+    # 실제 팔자처럼 천간/지지 음양을 맞춥니다. (양간-양지, 음간-음지)
+    branches = branches - (branches % 2) + (stems % 2)
+    charts = ["".join("甲乙丙丁戊己庚辛壬癸"[s] for s in st) + "".join("子丑寅卯辰巳午未申酉戌亥"[b] for b in br)
+              for st, br in zip(stems, branches)]
+    start = time.perf_counter()
+    matrix = encode_charts(stems, branches)
+    print(f"특징 인코딩: {count:,}개 {time.perf_counter() - start:.2f} s, 행렬 {matrix.nbytes / 1024 / 1024:.0f} MB")
+    return ChartLibrary(matrix, ["bench"] * count, list(range(count)), [""] * count, charts)
+
+
+def python_top_k(feature_sets, query_set, weights, k):
+    """예전 방식: 사례마다 파이썬으로 공통 특징의 가중치를 더합니다."""
+    scored = [(sum(weights[f] for f in query_set & features), i) for i, features in enumerate(feature_sets)]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [i for _, i in scored[:k]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="팔자 유사 사례 검색 벤치마크")
+    parser.add_argument("--charts", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    library = random_library(args.charts)
+    queries = library.charts[:args.queries]
+    weights = FEATURE_WEIGHTS.tolist()
+    feature_sets = [set(np.flatnonzero(row).tolist()) for row in library.matrix]
+
+    start = time.perf_counter()
+    expected = [python_top_k(feature_sets, feature_sets[i], weights, args.k) for i in range(3)]
+    python_ms = (time.perf_counter() - start) * 1000 / 3
+    start = time.perf_counter()
+    results = [library.top_k(chart, args.k) for chart in queries]
+    numpy_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    same = all([r.row for r in results[i]] == expected[i] for i in range(3))
+    start = time.perf_counter()
+    library.top_k_many(queries, args.k)
+    batch_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"{'method':<26} {'ms/query':>9}")
+    print(f"{'python pairwise':<26} {python_ms:>9.1f}")
+    print(f"{'numpy top_k':<26} {numpy_ms:>9.1f}")
+    print(f"{'numpy top_k_many (batch)':<26} {batch_ms:>9.1f}")
+    print(f"상위 {args.k}개 동일: {same}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "chart_library")
+        library.save(path)
+        start = time.perf_counter()
+        mapped = ChartLibrary.load(path, mmap=True)
+        load_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        hits = [mapped.top_k(chart, args.k) for chart in queries]
+        mapped_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        print(f"\nmmap 라이브러리: 열기 {load_ms:.0f} ms, 조회 {mapped_ms:.1f} ms/query, "
+              f"결과 동일: {[[h.row for h in r] for r in hits] == [[h.row for h in r] for r in results]}")
+        del mapped, hits
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# 파일 경로: benchmarks/bench_classifier_modes.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_classifier_modes --repeat 4
+# (nli 는 transformers+torch, embedding 은 sentence-transformers 가 필요합니다. 없는 방식은 건너뜁니다.)
+
+import argparse
+import importlib.util
+import time
+from typing import List, Tuple
+
+from modules.ai_utils import CLASSIFIER_MODES, load_classifier, local_ai_classify
+
+CATEGORIES = ["격국", "십신", "재물", "혼인", "건강", "직업", "상호작용", "기타"]
+
+# (문단, 정답 카테고리) — 자동_지식_구축 페이지의 기본 카테고리로 손으로 붙인 정답
+LABELED: List[Tuple[str, str]] = [
+    ("월령에 정관이 있고 재성이 생해 주니 정관격이 성격되었다.", "격국"),
+    ("인수격에 재성이 투출하여 인수를 깨니 파격이 된다.", "격국"),
+    ("식신이 월령을 얻고 편인이 없으니 식신격이 맑다.", "격국"),
+    ("상관이 정관을 보면 화가 백 가지로 일어난다고 하였다.", "십신"),
+    ("비견과 겁재가 많으면 형제와 재물을 다툰다.", "십신"),
+    ("편인이 식신을 극하니 도식이 된다.", "십신"),
+    ("재성이 왕하고 신강하여 큰 재물을 모았다.", "재물"),
+    ("겁재 대운에 사업이 기울어 재산을 크게 잃었다.", "재물"),
+    ("재고가 열리는 해에 부동산으로 돈을 벌었다.", "재물"),
+    ("일지 배우자궁이 충을 맞아 결혼이 늦어졌다.", "혼인"),
+    ("여명에 관성이 둘이니 재혼할 수 있다.", "혼인"),
+    ("남명에 재성이 합거되어 아내와 인연이 약하다.", "혼인"),
+    ("수가 태과하고 화가 꺼지니 심장과 눈을 조심해야 한다.", "건강"),
+    ("금목이 상전하여 간과 담에 병이 생겼다.", "건강"),
+    ("양인이 충을 맞는 해에 수술을 받았다.", "건강"),
+    ("관인상생하여 공직에 나가 승진을 거듭했다.", "직업"),
+    ("식상생재하니 기술로 장사를 하는 직업이 맞다.", "직업"),
+    ("편관이 제화되어 군인이나 경찰로 이름을 얻었다.", "직업"),
+    ("자축이 육합하고 인신이 충하여 합과 충이 함께 있다.", "상호작용"),
+    ("신자진 삼합 수국이 이루어져 일간을 돕는다.", "상호작용"),
+    ("갑기합토로 천간이 합하여 본성을 잃는다.", "상호작용"),
+    ("이 책은 옛 명리서를 현대어로 풀어 쓴 것이다.", "기타"),
+    ("다음 장에서는 여러 사례를 차례로 살펴본다.", "기타"),
+    ("저자는 오랫동안 상담한 경험을 바탕으로 이 글을 썼다.", "기타"),
+]
+
+
+def run(mode: str, repeat: int) -> dict:
+    paragraphs = [text for text, _ in LABELED] * repeat
+    answers = [label for _, label in LABELED] * repeat
+    load_classifier(mode)
+    # 카테고리 프로토타입 벡터는 한 번만 계산되므로, 처음 호출(모델 워밍업 포함)은 측정에서 뺍니다.
+    local_ai_classify(paragraphs[:2], CATEGORIES, mode=mode)
+    start = time.perf_counter()
+    predictions = local_ai_classify(paragraphs, CATEGORIES, mode=mode)
+    elapsed = time.perf_counter() - start
+    correct = sum(p == a for p, a in zip(predictions, answers))
+    return {"mode": mode, "paragraphs": len(paragraphs), "seconds": elapsed,
+            "paragraphs_per_sec": len(paragraphs) / elapsed, "accuracy": correct / len(paragraphs)}
+
+
+def _available(mode: str) -> bool:
+    """분류 방식에 필요한 라이브러리가 설치돼 있는지 import 하지 않고 확인합니다."""
+    required = ("sentence_transformers",) if mode == "embedding" else ("transformers", "torch")
+    return all(importlib.util.find_spec(name) is not None for name in required)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 분류 방식(NLI / 임베딩) 정확도·속도 비교")
+    parser.add_argument("--repeat", type=int, default=4, help="정답 문단 묶음을 반복할 횟수")
+    parser.add_argument("--modes", nargs="+", default=list(CLASSIFIER_MODES), choices=list(CLASSIFIER_MODES))
+    args = parser.parse_args()
+
+    print(f"{'mode':>10} {'paragraphs':>10} {'seconds':>9} {'para/s':>9} {'accuracy':>9}")
+    for mode in args.modes:
+        if not _available(mode):
+            print(f"{mode:>10}  (필요한 라이브러리가 없어 건너뜀)")
+            continue
+        r = run(mode, args.repeat)
+        print(f"{r['mode']:>10} {r['paragraphs']:>10} {r['seconds']:>9.2f} {r['paragraphs_per_sec']:>9.1f} "
+              f"{r['accuracy']:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# 파일 경로: benchmarks/bench_doc_stream.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_doc_stream --sizes-mb 1 10 50
+
+import argparse
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+
+from modules import doc_stream
+
+
+def make_txt(path: str, size_mb: float):
+    para = "<사례> 己戊丁壬(坤) 未申未子 木火勢가 金水勢를 제압하는 구조. 子未穿: 빈위의 財이니 파괴하는 것이 길하다.\n\n"
+    count = int(size_mb * 1024 * 1024 / len(para.encode("utf-8")))
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(count):
+            f.write(para)
+
+
+def whole_file(path: str, chunk_size: int) -> int:
+    """기존 방식: 전체 텍스트를 읽어 문단 리스트를 만든 뒤 처리."""
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8")
+    paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+    return len(paragraphs)
+
+
+def streaming(path: str, chunk_size: int) -> int:
+    count = 0
+    for chunk in doc_stream.chunked(doc_stream.iter_document_paragraphs(path), chunk_size):
+        count += len(chunk)
+    return count
+
+
+def measure(func, path: str, chunk_size: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func(path, chunk_size)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문서 전체 읽기 vs 스트리밍 문단 처리의 최대 메모리")
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--chunk-size", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes_mb:
+            path = os.path.join(tmp, "doc.txt")
+            make_txt(path, size_mb)
+            whole = measure(whole_file, path, args.chunk_size)
+            stream = measure(streaming, path, args.chunk_size)
+            assert whole[0] == stream[0]
+            print(f"{size_mb:>6} MB ({whole[0]:,} 문단) | 전체 읽기: 최대 {whole[2] / 2**20:7.1f} MiB, {whole[1]:.2f} s "
+                  f"| 스트리밍: 최대 {stream[2] / 2**20:5.1f} MiB, {stream[1]:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
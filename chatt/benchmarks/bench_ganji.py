@@ -0,0 +1,73 @@
+# 파일 경로: benchmarks/bench_ganji.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_ganji --rows 1000000
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+from korean_lunar_calendar import KoreanLunarCalendar
+
+from modules.analyzer_engine import JIJI_TIMES, get_ganji, get_ganji_batch
+
+
+def make_birth_datetimes(rows: int, seed: int = 0) -> np.ndarray:
+    """1900~2049년 사이의 임의 생년월일시(분 단위) 배열을 만듭니다."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('1900-01-01T00:00', 'm').astype(np.int64)
+    end = np.datetime64('2049-12-31T23:59', 'm').astype(np.int64)
+    return rng.integers(start, end, size=rows).astype('datetime64[m]')
+
+
+def legacy_day_and_hour(year, month, day, hour):
+    """기존 방식: 호출마다 KoreanLunarCalendar 를 만들고 JIJI_TIMES 를 선형 탐색합니다."""
+    calendar = KoreanLunarCalendar()
+    calendar.setSolarDate(year, month, day)
+    ilju = calendar.getGapJaString().split()[2][:2]
+    current_time = datetime(year, month, day, hour).time()
+    time_index = 0
+    for i in range(1, len(JIJI_TIMES)):
+        if current_time < JIJI_TIMES[i]:
+            time_index = i
+            break
+    return ilju, time_index
+
+
+def per_row(func, rows):
+    start = time.perf_counter()
+    for dt in rows:
+        func(dt.year, dt.month, dt.day, dt.hour)
+    return (time.perf_counter() - start) / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="get_ganji 스칼라 vs get_ganji_batch 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=20_000, help="스칼라 방식은 표본으로 측정 후 환산")
+    args = parser.parse_args()
+
+    dts = make_birth_datetimes(args.rows)
+    sample = dts[:args.sample].astype(datetime)
+
+    legacy = per_row(legacy_day_and_hour, sample)
+    scalar = per_row(get_ganji, sample)
+
+    start = time.perf_counter()
+    batch = get_ganji_batch(dts)
+    batch_total = time.perf_counter() - start
+
+    # 결과 일치 확인 (표본)
+    for i, dt in enumerate(sample[:2000]):
+        expected = get_ganji(dt.year, dt.month, dt.day, dt.hour, dt.minute)
+        assert all(batch[key][i] == value for key, value in expected.items()), dt
+
+    print(f"행 수: {args.rows:,}")
+    print(f"기존(달력 객체/선형 탐색, 환산): {legacy * args.rows:8.2f} s")
+    print(f"get_ganji 스칼라 반복 (환산):    {scalar * args.rows:8.2f} s")
+    print(f"get_ganji_batch:                  {batch_total:8.2f} s")
+    print(f"속도 향상: 기존 대비 x{legacy * args.rows / batch_total:,.0f}, "
+          f"스칼라 대비 x{scalar * args.rows / batch_total:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
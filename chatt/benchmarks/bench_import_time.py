@@ -0,0 +1,71 @@
+# 파일 경로: benchmarks/bench_import_time.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_import_time
+# 코어 모듈을 새 파이썬 프로세스에서 `python -X importtime` 으로 import 해 누적 import 시간을 재고,
+# 예산(BUDGET_MS)을 넘거나 UI/ML 라이브러리(HEAVY_MODULES)를 끌어오면 0 이 아닌 코드로 끝납니다. (CI 검사용)
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# 모듈 → import 시간 예산 (ms, 여러 번 잰 중앙값 기준)
+BUDGET_MS = {
+    "worker": 400,
+    "modules.ai_utils": 300,
+    "modules.analyzer_engine": 300,
+    "modules.saju_chart": 200,
+    "modules.case_index": 200,
+    "modules.chart_similarity": 300,
+    "modules.db_handler": 100,
+    "modules.doc_stream": 50,
+    "modules.knowledge_extractor": 100,
+    "modules.rules_config": 100,
+}
+# 코어 모듈이 import 시점에 끌어오면 안 되는 라이브러리 (필요한 함수 안에서만 import)
+HEAVY_MODULES = ("streamlit", "transformers", "torch", "sentence_transformers", "openai", "PyPDF2", "docx", "gensim",
+                 "langchain_core", "langchain_openai", "pydantic")
+
+_PROBE = "import sys, {module}; print(','.join(m for m in {heavy!r} if m in sys.modules))"
+
+
+def import_time(module: str):
+    """새 프로세스에서 module 을 import 한 누적 시간(ms)과 함께 딸려 온 무거운 라이브러리 목록."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{result.stderr[-2000:]}")
+    # "import time: self [us] | cumulative | imported package". 인터프리터 시작(site 등) 줄은 빼고
+    # 대상 모듈과 그 상위 패키지(modules.ai_utils → modules)의 최상위 줄만 더합니다.
+    parts = module.split(".")
+    targets = {".".join(parts[:i]) for i in range(1, len(parts) + 1)}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name[1:2] != " " and name.strip() in targets:
+            total_us += int(cumulative)
+    return total_us / 1000, [m for m in result.stdout.strip().split(",") if m]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="코어 모듈 import 시간 예산 검사")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("modules", nargs="*", help="검사할 모듈 (기본: BUDGET_MS 전체)")
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'module':<28} {'median ms':>10} {'budget':>7}  heavy imports")
+    for module in args.modules or list(BUDGET_MS):
+        runs = [import_time(module) for _ in range(args.runs)]
+        median = statistics.median(ms for ms, _ in runs)
+        heavy = sorted({m for _, found in runs for m in found})
+        budget = BUDGET_MS.get(module)
+        ok = (budget is None or median <= budget) and not heavy
+        failures += not ok
+        print(f"{module:<28} {median:>10.1f} {budget or '-':>7}  {', '.join(heavy) or '-'}{'' if ok else '  <-- FAIL'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
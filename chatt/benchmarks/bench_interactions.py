@@ -0,0 +1,92 @@
+# 파일 경로: benchmarks/bench_interactions.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_interactions --charts 1000000
+# 차트마다 if/elif 로 합충형파해묘와 십신을 판정하는 방식과 ganji_tables 조회표(배치)의 처리량을 비교합니다.
+
+import argparse
+import time
+
+import numpy as np
+
+from modules.ganji_tables import (BRANCH_ELEMENT, HIDDEN_STEMS, INTERACTIONS, POSITION_PAIRS, STEM_ELEMENT, STEM_YANG,
+                                  SIPSIN_ORDER, interactions_batch, sipsin_batch)
+
+GENERATES = {0: 1, 1: 2, 2: 3, 3: 4, 4: 0}
+CONTROLS = {0: 2, 1: 3, 2: 4, 3: 0, 4: 1}
+
+
+def legacy_sipsin(day: int, element: int, yang: bool) -> str:
+    me, same = STEM_ELEMENT[day], STEM_YANG[day] == yang
+    if element == me:
+        return "비견" if same else "겁재"
+    elif GENERATES[me] == element:
+        return "식신" if same else "상관"
+    elif CONTROLS[me] == element:
+        return "편재" if same else "정재"
+    elif CONTROLS[element] == me:
+        return "편관" if same else "정관"
+    else:
+        return "편인" if same else "정인"
+
+
+def legacy_pair(a: int, b: int) -> set:
+    found = set()
+    x, y = min(a, b), max(a, b)
+    if (a + b) % 12 == 1:
+        found.add("六合")
+    if (x, y) in ((0, 4), (0, 8), (1, 9), (2, 6), (3, 7), (3, 11), (5, 9), (6, 10)):
+        found.add("半合")
+    if abs(a - b) == 6:
+        found.add("沖")
+    if (x, y) in ((2, 5), (5, 8), (2, 8), (1, 10), (7, 10), (1, 7), (0, 3)) or (a == b and a in (4, 6, 9, 11)):
+        found.add("刑")
+    if (x, y) in ((0, 9), (3, 6), (5, 8), (2, 11), (1, 4), (7, 10)):
+        found.add("破")
+    if (a + b) % 12 == 7:
+        found.add("穿")
+    for p, q in ((a, b), (b, a)):
+        if p not in (1, 4, 7, 10) and q == {0: 7, 1: 10, 2: 4, 3: 1, 4: 4}[BRANCH_ELEMENT[p]]:
+            found.add("墓")
+    return found
+
+
+def legacy_chart(stems, branches):
+    sipsin = [legacy_sipsin(stems[1], STEM_ELEMENT[s], STEM_YANG[s]) for s in stems] + \
+             [legacy_sipsin(stems[1], STEM_ELEMENT[HIDDEN_STEMS[b, 2]], STEM_YANG[HIDDEN_STEMS[b, 2]]) for b in branches]
+    found = set()
+    for i, j in POSITION_PAIRS:
+        found |= legacy_pair(branches[i], branches[j])
+    return sipsin, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="십신/합충 조회표 벤치마크")
+    parser.add_argument("--charts", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=50_000, help="if/elif 방식은 표본으로 측정 후 환산")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    stems = rng.integers(0, 10, (args.charts, 4))
+    branches = rng.integers(0, 12, (args.charts, 4))
+    sample_s, sample_b = stems[:args.sample].tolist(), branches[:args.sample].tolist()
+
+    start = time.perf_counter()
+    expected = [legacy_chart(s, b) for s, b in zip(sample_s, sample_b)]
+    legacy_rate = args.sample / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    sipsin = sipsin_batch(stems, branches)
+    interactions = interactions_batch(stems, branches)
+    batch_seconds = time.perf_counter() - start
+
+    names = np.array(SIPSIN_ORDER)
+    same = all(names[np.concatenate([sipsin["천간"][k], sipsin["지지"][k]])].tolist() == sip and
+               {n for n in INTERACTIONS if interactions[n][k]} == found
+               for k, (sip, found) in enumerate(expected))
+    print(f"차트 {args.charts:,}개")
+    print(f"  if/elif (차트별)   {legacy_rate * 60:>14,.0f} charts/min")
+    print(f"  조회표 (배치)      {args.charts / batch_seconds * 60:>14,.0f} charts/min  ({batch_seconds:.2f} s)")
+    print(f"  결과 동일(표본 {args.sample:,}개): {same}")
+
+
+if __name__ == "__main__":
+    main()
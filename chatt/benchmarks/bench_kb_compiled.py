@@ -0,0 +1,63 @@
+# 파일 경로: benchmarks/bench_kb_compiled.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_kb_compiled [--sizes 1 10 50]
+# 크기별(MB) 지식 파일(사례 본문 + 수리해석규칙)에 대해 (1) JSON 으로 읽기 (2) 컴파일본(.kbc) 열기
+# (3) 컴파일본에서 규칙표 읽기 (4) 사례 하나 읽기 (5) 사례 본문 전체 읽기 시간을 각각 새 프로세스에서 재고,
+# 왕복 결과가 원본 JSON 과 같은지 확인합니다.
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_kb_save import make_knowledge
+from benchmarks.bench_saju_chart import RULES
+from modules import kb_compiled, kb_storage
+
+# 새 프로세스에서 실행할 측정 코드 (import 시간은 빼고, 페이지 캐시는 데워진 상태)
+_PROBES = {
+    "json": "data, _ = kb_storage.read_knowledge_file(path + '.plain')",
+    "open": "data = kb_compiled.load_compiled(path)",
+    "rules": "data = kb_compiled.load_compiled(path); [rule['조건'] for rule in data['수리해석규칙']['응기']]",
+    "first_entry": "data = kb_compiled.load_compiled(path); next(iter(data['문서AI']['sub_topics'].values()))['content']",
+    "all_content": "data = kb_compiled.load_compiled(path); [v['content'] for v in data['문서AI']['sub_topics'].values()]",
+}
+_RUNNER = ("import sys, time; from modules import kb_compiled, kb_storage; path = sys.argv[1]; "
+           "start = time.perf_counter(); {probe}; print(time.perf_counter() - start)")
+
+
+def cold_seconds(probe: str, path: str, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", _RUNNER.format(probe=_PROBES[probe]), path],
+                                capture_output=True, text=True, check=True)
+        times.append(float(result.stdout))
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지식 컴파일본(.kbc) 콜드 로드 벤치마크")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10, 50], help="지식 파일 크기 (MB)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'MB':>5} {'build s':>8} {'kbc MB':>7} {'json ms':>9} {'open ms':>8} {'rules ms':>9} {'1 entry ms':>11} "
+          f"{'all ms':>8}  round-trip")
+    with tempfile.TemporaryDirectory() as tmp:
+        for megabytes in args.sizes:
+            path = os.path.join(tmp, f"kb_{megabytes:g}.json")
+            kb_storage.atomic_write_json(path, {**RULES, **make_knowledge(int(megabytes * 1024 * 1024))})
+            os.link(path, path + ".plain")  # 컴파일본이 없는 같은 내용 (JSON 경로 측정용)
+            start = time.perf_counter()
+            kb_compiled.build_compiled(path)
+            build = time.perf_counter() - start
+            ms = {probe: cold_seconds(probe, path, args.runs) * 1000 for probe in _PROBES}
+            ok = kb_compiled.check_round_trip(path)
+            print(f"{megabytes:>5g} {build:>8.2f} {os.path.getsize(kb_compiled.compiled_path(path)) / 2**20:>7.1f} "
+                  f"{ms['json']:>9.1f} {ms['open']:>8.1f} {ms['rules']:>9.1f} {ms['first_entry']:>11.1f} "
+                  f"{ms['all_content']:>8.1f}  {'OK' if ok else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
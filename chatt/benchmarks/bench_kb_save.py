@@ -0,0 +1,64 @@
+# 파일 경로: benchmarks/bench_kb_save.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_kb_save
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from modules import kb_storage
+
+
+def make_knowledge(size_bytes: int) -> dict:
+    """대략 size_bytes 크기(indent=2 JSON 기준)의 지식 파일 내용을 만듭니다."""
+    entry = {"content": "<사례> 己戊丁壬(坤) 未申未子 木火勢가 金水勢를 제압하는 구조 " * 4, "category": "미실행"}
+    entry_size = len(json.dumps(entry, ensure_ascii=False, indent=2).encode("utf-8"))
+    return {"문서AI": {"sub_topics": {f"항목_{i}": dict(entry) for i in range(max(1, size_bytes // entry_size))}}}
+
+
+def legacy_save(file_path: str, data_to_save: dict):
+    """기존 save_kb: 전체 파일을 읽어 병합한 뒤 제자리에서 다시 씁니다."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        existing_data = json.load(f)
+    kb_storage.merge_knowledge(existing_data, data_to_save)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(existing_data, f, ensure_ascii=False, indent=2)
+
+
+def rewrite_save(file_path: str, data_to_save: dict):
+    kb_storage.append_journal(file_path, data_to_save)
+    kb_storage.compact(file_path)
+
+
+def journal_save(file_path: str, data_to_save: dict):
+    kb_storage.append_journal(file_path, data_to_save)
+
+
+def measure(save, file_path: str, saves: int) -> float:
+    start = time.perf_counter()
+    for i in range(saves):
+        save(file_path, {"문서AI": {"sub_topics": {f"새항목_{i}": {"content": "추가된 문단", "category": "기타"}}}})
+    return (time.perf_counter() - start) / saves
+
+
+def main():
+    parser = argparse.ArgumentParser(description="save_kb 저장 방식별 1회 저장 지연 시간")
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[0.1, 1, 10])
+    parser.add_argument("--saves", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'파일 크기':>10} | {'기존(제자리 재작성)':>18} | {'rewrite(원자적)':>15} | {'journal':>10}")
+    for size_mb in args.sizes_mb:
+        data = make_knowledge(int(size_mb * 1024 * 1024))
+        row = []
+        for save in (legacy_save, rewrite_save, journal_save):
+            with tempfile.TemporaryDirectory() as tmp:
+                file_path = os.path.join(tmp, "bench.json")
+                kb_storage.atomic_write_json(file_path, data)
+                row.append(measure(save, file_path, args.saves))
+        print(f"{size_mb:>8} MB | {row[0] * 1000:>15.2f} ms | {row[1] * 1000:>12.2f} ms | {row[2] * 1000:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
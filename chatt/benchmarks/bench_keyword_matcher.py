@@ -0,0 +1,90 @@
+# 파일 경로: benchmarks/bench_keyword_matcher.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_keyword_matcher --keywords 20 200 2000 5000 --texts 5000
+
+import argparse
+import random
+import time
+from typing import List
+
+from modules.keyword_matcher import KeywordRules
+
+SYLLABLES = [chr(c) for c in range(0xAC00, 0xAC00 + 400)]  # 한글 음절 일부
+
+
+def make_keywords(count: int, rng: random.Random) -> List[str]:
+    keywords = set()
+    while len(keywords) < count:
+        keywords.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return list(keywords)
+
+
+def make_texts(count: int, keywords: List[str], rng: random.Random, length: int = 80) -> List[str]:
+    texts = []
+    for _ in range(count):
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))) for _ in range(length // 3)]
+        if rng.random() < 0.5:  # 절반은 키워드를 하나 이상 포함
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        texts.append(" ".join(words))
+    return texts
+
+
+def linear_first(text, pairs, default=None):
+    """예전 categorize_description 방식: 규칙을 순서대로 in 검사"""
+    for keyword, value in pairs:
+        if keyword in text:
+            return value
+    return default
+
+
+def linear_all(texts, pairs):
+    """예전 apply_rules 방식: 규칙 × 본문 줄마다 in 검사"""
+    return [value for keyword, value in pairs if any(keyword in text for text in texts)]
+
+
+def run(keyword_count: int, text_count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    keywords = make_keywords(keyword_count, rng)
+    pairs = [(k, i) for i, k in enumerate(keywords)]
+    texts = make_texts(text_count, keywords, rng)
+    blocks = [texts[i:i + 5] for i in range(0, len(texts), 5)]  # 본문 5줄짜리 블록
+
+    start = time.perf_counter()
+    rules = KeywordRules(pairs)
+    compile_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected_first = [linear_first(t, pairs) for t in texts]
+    linear_first_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    got_first = [rules.first(t) for t in texts]
+    matcher_first_seconds = time.perf_counter() - start
+    assert got_first == expected_first
+
+    start = time.perf_counter()
+    expected_all = [linear_all(b, pairs) for b in blocks]
+    linear_all_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    got_all = [rules.all(b) for b in blocks]
+    matcher_all_seconds = time.perf_counter() - start
+    assert got_all == expected_all
+
+    return {"keywords": keyword_count, "compile": compile_seconds,
+            "linear_first": linear_first_seconds, "matcher_first": matcher_first_seconds,
+            "linear_all": linear_all_seconds, "matcher_all": matcher_all_seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 매처(Aho-Corasick) vs 규칙별 in 검사")
+    parser.add_argument("--keywords", type=int, nargs="+", default=[20, 200, 2000, 5000])
+    parser.add_argument("--texts", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'keywords':>8} {'compile':>8} | {'first: linear':>13} {'rules':>8} | {'all: linear':>11} {'rules':>8}  (초)")
+    for count in args.keywords:
+        r = run(count, args.texts)
+        print(f"{r['keywords']:>8} {r['compile']:>8.3f} | {r['linear_first']:>13.3f} {r['matcher_first']:>8.3f} | "
+              f"{r['linear_all']:>11.3f} {r['matcher_all']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
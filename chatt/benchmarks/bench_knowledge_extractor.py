@@ -0,0 +1,99 @@
+# 파일 경로: benchmarks/bench_knowledge_extractor.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_knowledge_extractor --chapters 40 --concurrency 1 4 8
+# OpenAI 대신 로컬 가짜 채팅 모델(FakeRuleChatModel)을 쓰므로 API 키가 필요 없습니다.
+
+import argparse
+import json
+import re
+import statistics
+import time
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from modules.knowledge_extractor import CHUNK_OVERLAP, CHUNK_SIZE, merge_rules, stream_structured_knowledge
+
+_RULE_LINE = re.compile(r"^(?P<name>[^:\n]+): (?P<conditions>[^→\n]+) → (?P<result>[^\n]+)$", re.MULTILINE)
+_TEXT_MARKER = "## 분석할 텍스트:\n"
+
+
+class FakeRuleChatModel(BaseChatModel):
+    """'규칙 이름: 조건1, 조건2 → 결과' 형식의 줄을 규칙으로 돌려주는 가짜 채팅 모델. 글자 수에 비례해 지연됩니다."""
+    base_latency: float = 0.05
+    seconds_per_char: float = 0.00002
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-rule-extractor"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = messages[-1].content
+        text = prompt.split(_TEXT_MARKER, 1)[-1]
+        time.sleep(self.base_latency + self.seconds_per_char * len(text))
+        rules = [{"rule_name": m["name"].strip(),
+                  "conditions": [c.strip() for c in m["conditions"].split(",")],
+                  "result": m["result"].strip()} for m in _RULE_LINE.finditer(text)]
+        content = json.dumps({"rules": rules}, ensure_ascii=False)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+
+def make_document(chapters: int, rules_per_chapter: int = 30):
+    """장마다 고유 규칙 + 모든 장에 되풀이되는 '허자의 출현 응기'(장마다 조건이 하나씩 다름)."""
+    lines, expected = [], {}
+    for c in range(chapters):
+        lines.append(f"## 제{c + 1}장 응기 사례")
+        lines.append("이 장에서는 응기의 시기를 여러 사례로 살펴본다. " * 5)
+        for r in range(rules_per_chapter):
+            name, conditions = f"응기규칙 {c}-{r}", [f"조건 A{r}", f"조건 B{c}"]
+            lines.append(f"{name}: {', '.join(conditions)} → 결과 {c}-{r}")
+            expected[name] = conditions
+        lines.append(f"허자의 출현 응기: 허자 출현, 장별 조건 {c} → 허자가 응기한다")
+        expected.setdefault("허자의 출현 응기", ["허자 출현"]).append(f"장별 조건 {c}")
+        lines.append("")
+    return "\n".join(lines), expected
+
+
+def run(text: str, expected: dict, concurrency: int, chunk_size: int, overlap: int) -> dict:
+    llm = FakeRuleChatModel()
+    start = time.perf_counter()
+    first_result = None
+    reports = []
+    for report in stream_structured_knowledge(text, llm=llm, chunk_size=chunk_size, chunk_overlap=overlap,
+                                              max_concurrency=concurrency):
+        if first_result is None:
+            first_result = time.perf_counter() - start
+        reports.append(report)
+    elapsed = time.perf_counter() - start
+    reports.sort(key=lambda r: r["chunk"])
+    rules = merge_rules([r["rules"] for r in reports])
+    merged = {rule["rule_name"]: rule["conditions"] for rule in rules}
+    found = sum(1 for name, conditions in expected.items() if set(merged.get(name, [])) == set(conditions))
+    latencies = [r["latency"] for r in reports]
+    return {"concurrency": concurrency, "chunks": len(reports), "seconds": elapsed, "first_result": first_result,
+            "latency_p50": statistics.median(latencies), "latency_max": max(latencies),
+            "raw_rules": sum(len(r["rules"]) for r in reports), "merged_rules": len(rules),
+            "recall": found / len(expected)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="긴 문서 맵-리듀스 규칙 추출 (가짜 채팅 모델)")
+    parser.add_argument("--chapters", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--overlap", type=int, default=CHUNK_OVERLAP)
+    args = parser.parse_args()
+
+    text, expected = make_document(args.chapters)
+    print(f"문서 {len(text):,}자, 기대 규칙 {len(expected)}개")
+    print(f"{'workers':>7} {'chunks':>6} {'seconds':>8} {'first':>7} {'p50':>7} {'max':>7} "
+          f"{'raw':>6} {'merged':>7} {'recall':>7}")
+    for concurrency in args.concurrency:
+        r = run(text, expected, concurrency, args.chunk_size, args.overlap)
+        print(f"{r['concurrency']:>7} {r['chunks']:>6} {r['seconds']:>8.2f} {r['first_result']:>7.2f} "
+              f"{r['latency_p50']:>7.3f} {r['latency_max']:>7.3f} {r['raw_rules']:>6} {r['merged_rules']:>7} "
+              f"{r['recall']:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
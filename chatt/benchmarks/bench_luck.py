@@ -0,0 +1,72 @@
+# 파일 경로: benchmarks/bench_luck.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_luck --charts 100000
+# 차트마다 파이썬으로 100년 대운/세운 계열을 만드는 방식과 get_luck_batch(배열 한 번), get_luck_timeline 캐시를 비교합니다.
+
+import argparse
+import time
+from bisect import bisect_right
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.bench_ganji import make_birth_datetimes
+from modules.analyzer_engine import GAPJA, LUCK_YEARS, get_ganji, get_luck_batch, get_luck_timeline
+from modules.solar_terms import load_solar_term_table
+
+
+def python_timeline(birth: datetime, is_male: bool, years: int, terms: list):
+    """비교 기준: 차트 하나씩, 해마다 파이썬 반복문으로 계산합니다."""
+    ganji = get_ganji(birth.year, birth.month, birth.day, birth.hour, birth.minute)
+    year_idx, month_idx = GAPJA.index(ganji["년주"]), GAPJA.index(ganji["월주"])
+    kst = (birth.toordinal() - 719163) * 1440 + birth.hour * 60 + birth.minute
+    term = bisect_right(terms, kst) - 1
+    forward = (year_idx % 2 == 0) == is_male
+    days = abs((terms[term + 1] if forward else terms[term]) - kst) / 1440
+    daeun_su = min(max(int(days / 3 + 0.5), 1), 10)
+    step = 1 if forward else -1
+    daeun_by_year, seun = [], []
+    for k in range(years):
+        seun.append((birth.year + k - 4) % 60)
+        elapsed = k - daeun_su
+        daeun_by_year.append(-1 if elapsed < 0 else (month_idx + step * (elapsed // 10 + 1)) % 60)
+    return daeun_su, daeun_by_year, seun
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대운/세운 계열 벤치마크")
+    parser.add_argument("--charts", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=5_000, help="파이썬 방식은 표본으로 측정 후 환산")
+    parser.add_argument("--years", type=int, default=LUCK_YEARS)
+    args = parser.parse_args()
+
+    dts = make_birth_datetimes(args.charts)
+    genders = np.where(np.arange(args.charts) % 2 == 0, "남", "여")
+    sample = dts[:args.sample].astype(datetime)
+    terms = load_solar_term_table().tolist()
+
+    start = time.perf_counter()
+    expected = [python_timeline(dt, g == "남", args.years, terms) for dt, g in zip(sample, genders)]
+    python_per_chart = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    batch = get_luck_batch(dts, genders, args.years)
+    batch_seconds = time.perf_counter() - start
+
+    same = all(su == batch["대운수"][i] and by_year == batch["연도별대운"][i].tolist() and seun == batch["세운"][i].tolist()
+               for i, (su, by_year, seun) in enumerate(expected))
+
+    get_luck_timeline(sample[0], genders[0], args.years)
+    start = time.perf_counter()
+    for _ in range(10_000):
+        get_luck_timeline(sample[0], genders[0], args.years)
+    cached_us = (time.perf_counter() - start) / 10_000 * 1e6
+
+    print(f"차트 {args.charts:,}개 × {args.years}년")
+    print(f"  python (차트별)      {python_per_chart * args.charts:>8.2f} s  (표본 {args.sample:,}개로 환산)")
+    print(f"  get_luck_batch       {batch_seconds:>8.2f} s  ({args.charts / batch_seconds:,.0f} charts/s)")
+    print(f"  get_luck_timeline    {cached_us:>8.1f} us (캐시 적중)")
+    print(f"  결과 동일(표본): {same}")
+
+
+if __name__ == "__main__":
+    main()
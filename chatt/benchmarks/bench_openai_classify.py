@@ -0,0 +1,67 @@
+# 파일 경로: benchmarks/bench_openai_classify.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_openai_classify --paragraphs 200 --error-rate 0.05
+# 로컬 스텁 서버(benchmarks/stub_openai.py)에 요청하므로 API 키나 네트워크가 필요 없습니다.
+
+import argparse
+import asyncio
+
+from benchmarks.stub_openai import expected_labels, start_stub
+from modules.openai_classify import AsyncOpenAIClassifier
+
+CATEGORIES = ["격국", "십신", "재물", "혼인", "건강", "직업", "상호작용", "기타"]
+
+SCENARIOS = [
+    ("직렬 (기존 방식)", dict(max_concurrency=1, pack_size=1)),
+    ("동시 16", dict(max_concurrency=16, pack_size=1)),
+    ("동시 16, 속도 제한 없음", dict(max_concurrency=16, pack_size=1, requests_per_minute=60_000)),
+    ("동시 16 + 8개 묶음", dict(max_concurrency=16, pack_size=8)),
+    ("동시 16 + 8개 묶음, 다중 라벨", dict(max_concurrency=16, pack_size=8, multi_label=True)),
+]
+
+
+def make_paragraphs(count: int):
+    return [f"<사례 {i}> 己戊丁壬(坤) 未申未子 — 관인상생하나 재성이 인수를 깨니 {i % 7}번째 해석" for i in range(count)]
+
+
+async def _run(base_url: str, paragraphs, options, timeout: float):
+    classifier = AsyncOpenAIClassifier("stub-key", base_url=base_url, timeout=timeout, **options)
+    try:
+        labels = await classifier.classify(paragraphs, CATEGORIES)
+    finally:
+        await classifier.close()
+    return labels, classifier.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비동기 OpenAI 분류 처리량/오류율 (스텁 서버)")
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 응답 지연(초)")
+    parser.add_argument("--max-rps", type=float, default=50.0, help="스텁이 429 없이 받는 초당 요청 수")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="스텁이 429 또는 시간 초과를 내는 비율")
+    parser.add_argument("--timeout", type=float, default=1.0, help="클라이언트 요청 시간 제한(초)")
+    args = parser.parse_args()
+
+    server, _ = start_stub(latency=args.latency, max_rps=args.max_rps, error_rate=args.error_rate,
+                           hang_seconds=args.timeout * 2)
+    paragraphs = make_paragraphs(args.paragraphs)
+    # 서버 한도보다 조금 낮게 분당 요청 수를 맞춥니다. 스텁은 토큰 수를 제한하지 않으므로 토큰 버킷은 사실상 끕니다.
+    defaults = {"requests_per_minute": args.max_rps * 60 * 0.9, "tokens_per_minute": 100_000_000}
+
+    print(f"{'scenario':<28} {'para/s':>8} {'requests':>9} {'retries':>8} {'429':>5} {'timeout':>8} "
+          f"{'failed%':>8} {'accuracy':>9}")
+    try:
+        for name, options in SCENARIOS:
+            options = {**defaults, **options}
+            labels, stats = asyncio.run(_run(server.base_url, paragraphs, options, args.timeout))
+            expected = [expected_labels(p, CATEGORIES, options.get("multi_label", False)) for p in paragraphs]
+            accuracy = sum(a == b for a, b in zip(labels, expected)) / len(paragraphs)
+            failed = stats["failed_requests"] / stats["requests"] if stats["requests"] else 0.0
+            print(f"{name:<28} {stats['paragraphs'] / stats['seconds']:>8.1f} {stats['requests']:>9} "
+                  f"{stats['retries']:>8} {stats['rate_limited']:>5} {stats['timeouts']:>8} "
+                  f"{failed:>8.1%} {accuracy:>9.1%}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
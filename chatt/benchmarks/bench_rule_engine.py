@@ -0,0 +1,98 @@
+# 파일 경로: benchmarks/bench_rule_engine.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_rule_engine --rules 10000
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from modules.rule_engine import RuleEngine
+
+# 참/거짓 플래그와 여러 값을 갖는 범주형 상태(일간, 격국 등)를 섞어 생성된 규칙 집합을 흉내 냅니다.
+FLAG_KEYS = [f"플래그{i}" for i in range(200)]
+CATEGORY_KEYS = {f"범주{i}": [f"값{j}" for j in range(2 + i % 11)] for i in range(100)}
+CUSTOMS = ["is_jaeseong_strong", "is_gwansal_strong", "has_gongmang"]
+
+
+def linear_match(rules: List[dict], custom_functions: Dict, saju_status: dict) -> List[dict]:
+    """컴파일 이전의 RuleEngine.match_rules 와 같은 선형 매칭 (비교 기준)."""
+    matched = []
+    for rule in rules:
+        ok = True
+        for cond in rule["conditions"]:
+            if isinstance(cond, list) and len(cond) == 2:
+                if saju_status.get(cond[0], False) != cond[1]:
+                    ok = False
+                    break
+            elif isinstance(cond, dict) and "custom_condition" in cond:
+                func = custom_functions.get(cond["custom_condition"])
+                if func is None or not func(saju_status):
+                    ok = False
+                    break
+        if ok:
+            matched.append(rule)
+    return matched
+
+
+def make_rules(count: int, rng: random.Random) -> List[dict]:
+    rules = []
+    for i in range(count):
+        conditions = []
+        for _ in range(rng.randint(1, 4)):
+            if rng.random() < 0.5:
+                conditions.append([rng.choice(FLAG_KEYS), rng.random() < 0.7])
+            else:
+                key = rng.choice(list(CATEGORY_KEYS))
+                conditions.append([key, rng.choice(CATEGORY_KEYS[key])])
+        if rng.random() < 0.2:
+            conditions.append({"custom_condition": rng.choice(CUSTOMS + ["missing_function"])})
+        if rng.random() < 0.05:
+            conditions.append("자연어 조건 (매칭에서 무시됨)")
+        rules.append({"rule_name": f"규칙{i}", "conditions": conditions, "result": f"결과{i}"})
+    return rules
+
+
+def make_status(rng: random.Random) -> dict:
+    status = {key: rng.random() < 0.7 for key in rng.sample(FLAG_KEYS, 150)}
+    status.update({key: rng.choice(values) for key, values in CATEGORY_KEYS.items()})
+    status["재성_강도"] = rng.randint(0, 10)
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RuleEngine 선형 매칭 vs 컴파일된 인덱스 매칭")
+    parser.add_argument("--rules", type=int, default=10_000)
+    parser.add_argument("--statuses", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rules = make_rules(args.rules, rng)
+    customs = {
+        "is_jaeseong_strong": lambda s: s.get("재성_강도", 0) >= 5,
+        "is_gwansal_strong": lambda s: s.get("플래그1", False),
+        "has_gongmang": lambda s: s.get("재성_강도", 0) % 2 == 0,
+    }
+    statuses = [make_status(rng) for _ in range(args.statuses)]
+
+    start = time.perf_counter()
+    engine = RuleEngine(rules, customs)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [linear_match(rules, customs, status) for status in statuses]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [engine.match_rules(status) for status in statuses]
+    indexed_time = time.perf_counter() - start
+
+    assert actual == expected, "인덱스 매칭 결과가 선형 매칭과 다릅니다."
+    matches = sum(map(len, actual)) / len(actual)
+    print(f"규칙 {args.rules:,}개, 상태 {args.statuses}개 (상태당 평균 {matches:.1f}개 매칭)")
+    print(f"컴파일:     {compile_time * 1000:8.1f} ms")
+    print(f"선형 매칭:  {linear_time / args.statuses * 1000:8.3f} ms/상태")
+    print(f"인덱스 매칭:{indexed_time / args.statuses * 1000:8.3f} ms/상태  (x{linear_time / indexed_time:.1f})")
+
+
+if __name__ == "__main__":
+    main()
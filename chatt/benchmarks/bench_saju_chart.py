@@ -0,0 +1,90 @@
+# 파일 경로: benchmarks/bench_saju_chart.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_saju_chart --charts 200000
+# 같은 차트들을 (1) get_saju_info 딕셔너리, (2) SajuChart 객체, (3) CHART_DTYPE 구조화 배열로 들고 있을 때의
+# 메모리(백만 개 환산)와 analyze_many 시간을 비교하고, .npy 저장/메모리 매핑 로드를 잽니다.
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+import numpy as np
+
+from modules.analyzer_engine import SajuAnalyzer, get_saju_charts
+from modules.saju_chart import SajuChart, load_charts, pack, save_charts, unpack
+
+RULES = {"수리해석규칙": {"응기": [
+    {"이름": "편관 중첩", "조건": ["is_bad_luck(원국)"], "결과": "-"},
+    {"이름": "대운 子午沖", "조건": ["is_bad_luck(대운)"], "결과": "-"},
+    {"이름": "沖刑", "조건": ["has_interaction(沖)", "has_interaction(刑)"], "결과": "-"},
+    {"이름": "天干合", "조건": ["has_interaction(天干合)"], "결과": "-"},
+]}}
+
+
+def random_births(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("1940-01-01T00:00", "m").astype(np.int64)
+    minutes = rng.integers(0, 70 * 365 * 1440, count) + start
+    return minutes.astype("datetime64[m]"), rng.choice(["남", "여"], count)
+
+
+def measure(build):
+    """build() 가 만든 객체가 차지하는 메모리(바이트)와 그 객체."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SajuChart 압축 표현 벤치마크")
+    parser.add_argument("--charts", type=int, default=200_000)
+    args = parser.parse_args()
+
+    births, genders = random_births(args.charts)
+    start = time.perf_counter()
+    records = get_saju_charts(births, genders, ref_date=date(2025, 6, 1))
+    print(f"get_saju_charts: {args.charts:,}개 {time.perf_counter() - start:.2f} s")
+
+    dict_bytes, infos = measure(lambda: [SajuChart(*row).to_dict() for row in records.tolist()])
+    chart_bytes, charts = measure(lambda: unpack(records))
+    packed = pack(charts)
+    array_bytes = packed.nbytes
+    same = [SajuChart.from_dict(info) for info in infos] == charts and (packed == records).all()
+
+    per_million = 1_000_000 / args.charts / 1024 / 1024
+    print(f"\n{'form':<22} {'bytes/chart':>12} {'MB/1M charts':>13}")
+    for name, used in (("dict (get_saju_info)", dict_bytes), ("SajuChart (__slots__)", chart_bytes),
+                       ("CHART_DTYPE array", array_bytes)):
+        print(f"{name:<22} {used / args.charts:>12.1f} {used * per_million:>13.1f}")
+    print(f"왕복 변환 동일: {same}")
+
+    analyzer = SajuAnalyzer(RULES)
+    print(f"\n{'analyze_many input':<22} {'s':>7}")
+    triggered = {}
+    for name, batch in (("dict", infos), ("SajuChart", charts), ("CHART_DTYPE", records)):
+        start = time.perf_counter()
+        reports = analyzer.analyze_many(batch)
+        triggered[name] = [[rule["이름"] for rule in report["triggered_rules"]] for report in reports]
+        print(f"{name:<22} {time.perf_counter() - start:>7.2f}")
+    print(f"발동 규칙 동일: {triggered['dict'] == triggered['SajuChart'] == triggered['CHART_DTYPE']}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "charts.npy")
+        start = time.perf_counter()
+        save_charts(path, records)
+        save_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        mapped = load_charts(path, mmap=True)
+        load_ms = (time.perf_counter() - start) * 1000
+        print(f"\n.npy: {os.path.getsize(path) / 1024 / 1024:.1f} MB, 저장 {save_ms:.0f} ms, "
+              f"mmap 열기 {load_ms:.1f} ms, 내용 동일: {bool((mapped == records).all())}")
+        del mapped
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# 파일 경로: benchmarks/bench_worker.py
+# 실행: chatt 폴더에서  python -m benchmarks.bench_worker --jobs 200 --workers 1 2 4
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import List
+
+from modules import job_queue
+import worker
+
+STUB_WORK_ROUNDS = 2000  # 문단 하나당 모델 추론을 흉내 내는 CPU 작업량
+
+
+def stub_classify(paragraphs: List[str], categories: List[str], mode: str = "nli") -> List[str]:
+    """transformers 모델 대신 쓰는 결정적 분류기. 문단 해시로 카테고리를 고르며 CPU 를 일정량 사용합니다."""
+    results = []
+    for para in paragraphs:
+        digest = para.encode("utf-8")
+        for _ in range(STUB_WORK_ROUNDS):
+            digest = hashlib.sha256(digest).digest()
+        results.append(categories[digest[0] % len(categories)])
+    return results
+
+
+def make_uploads(directory: str, count: int, paragraphs: int = 40) -> List[str]:
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"upload_{i}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(f"<사례 {i}-{j}> 己戊丁壬(坤) 未申未子 제압방식 {j}" for j in range(paragraphs)))
+        paths.append(path)
+    return paths
+
+
+def enqueue(db_path: str, paths: List[str]):
+    job_queue.setup_database(db_path)
+    categories = json.dumps(["격국", "십신", "재물", "혼인", "건강", "직업", "상호작용", "기타"], ensure_ascii=False)
+    with job_queue.connect(db_path) as con:
+        con.executemany(
+            "INSERT INTO knowledge_jobs (original_filename, saved_filepath, categories, status) VALUES (?, ?, ?, 'pending')",
+            [(os.path.basename(p), p, categories) for p in paths],
+        )
+
+
+def run(jobs: int, workers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "jobs.db")
+        paths = make_uploads(tmp, jobs)
+        enqueue(db_path, paths)
+        start = time.perf_counter()
+        worker.run_pool(workers, db_path, classify=stub_classify, stop_when_idle=True)
+        elapsed = time.perf_counter() - start
+        with job_queue.connect(db_path) as con:
+            counts = dict(con.execute("SELECT status, COUNT(*) FROM knowledge_jobs GROUP BY status").fetchall())
+            claimed_twice = con.execute("SELECT COUNT(*) FROM knowledge_jobs WHERE attempts > 1").fetchone()[0]
+    return {"workers": workers, "seconds": elapsed, "jobs_per_sec": jobs / elapsed,
+            "statuses": counts, "claimed_twice": claimed_twice}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="worker 프로세스 수에 따른 처리량 (스텁 분류기 사용)")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        result = run(args.jobs, workers)
+        print(f"workers={result['workers']:>2}  {result['seconds']:7.2f} s  {result['jobs_per_sec']:7.1f} jobs/s  "
+              f"상태={result['statuses']}  중복 처리={result['claimed_twice']}")
+
+
+if __name__ == "__main__":
+    main()
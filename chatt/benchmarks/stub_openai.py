@@ -0,0 +1,149 @@
+# 파일 경로: benchmarks/stub_openai.py
+# 실행: chatt 폴더에서  python -m benchmarks.stub_openai --port 8765 --latency 0.05 --error-rate 0.05
+# 그 뒤 ai_classify_paragraphs(..., base_url="http://127.0.0.1:8765/v1") 로 시험합니다.
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+_CATEGORIES = re.compile(r"텍스트를 '(.*?)' 카테고리로")
+_NUMBERED = re.compile(r"\n\n\[(\d+)\] ")
+
+
+def expected_labels(paragraph: str, categories: List[str], multi_label: bool = False):
+    """스텁이 돌려주는 결정적 정답. (벤치마크가 정확도를 계산할 때도 씁니다)"""
+    digest = hashlib.sha256(paragraph.encode("utf-8")).digest()
+    first = categories[digest[0] % len(categories)]
+    if not multi_label:
+        return first
+    second = categories[(digest[0] + 1) % len(categories)]
+    return [first, second] if digest[1] % 2 == 0 and second != first else [first]
+
+
+def _answer(prompt: str) -> str:
+    categories = _CATEGORIES.search(prompt).group(1).split(", ")
+    multi_label = "배열로" in prompt
+    parts = _NUMBERED.split(prompt)
+    answers = {parts[i]: expected_labels(parts[i + 1], categories, multi_label) for i in range(1, len(parts), 2)}
+    return json.dumps(answers, ensure_ascii=False)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 연결 재사용 (Content-Length 를 항상 보냅니다)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: dict, headers: dict = None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트가 시간 초과로 먼저 끊은 경우
+
+    def do_POST(self):
+        server: StubOpenAIServer = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        server.count("requests")
+        if not server.admit():
+            server.count("rate_limited")
+            self._send(429, {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                       {"retry-after": "0.5"})
+            return
+        roll = random.random()
+        if roll < server.error_rate / 2:
+            server.count("rate_limited")
+            self._send(429, {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}})
+            return
+        if roll < server.error_rate:
+            server.count("timed_out")
+            time.sleep(server.hang_seconds)  # 클라이언트 시간 초과를 흉내
+        time.sleep(server.latency)
+        content = _answer(body["messages"][-1]["content"])
+        self._send(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+
+class StubOpenAIServer(ThreadingHTTPServer):
+    """
+    /v1/chat/completions 를 흉내 내는 로컬 서버. 프롬프트의 번호 붙은 문단마다 결정적인 라벨을 JSON 으로 답합니다.
+    latency 초 지연, 초당 max_rps 를 넘으면 429, error_rate 비율로 429 또는 hang_seconds 동안 응답 지연.
+    """
+    daemon_threads = True
+    request_queue_size = 128  # 기본값 5 로는 동시 연결이 몰릴 때 SYN 재전송(1초)이 생깁니다.
+
+    def __init__(self, port: int = 0, latency: float = 0.05, max_rps: float = 50.0,
+                 error_rate: float = 0.0, hang_seconds: float = 3.0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.max_rps = max_rps
+        self.error_rate = error_rate
+        self.hang_seconds = hang_seconds
+        self.counters = {"requests": 0, "rate_limited": 0, "timed_out": 0}
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def admit(self) -> bool:
+        """최근 1초 동안 받은 요청이 max_rps 보다 많으면 False."""
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_rps:
+                return False
+            self._recent.append(now)
+            return True
+
+
+def start_stub(**options) -> Tuple[StubOpenAIServer, threading.Thread]:
+    server = StubOpenAIServer(**options)
+    thread = threading.Thread(target=server.serve_forever, name="stub-openai", daemon=True)
+    thread.start()
+    return server, thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI chat completions 스텁 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--max-rps", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server = StubOpenAIServer(args.port, args.latency, args.max_rps, args.error_rate)
+    print(f"스텁 서버: {server.base_url}  (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
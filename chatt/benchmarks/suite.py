@@ -0,0 +1,373 @@
+# 파일 경로: benchmarks/suite.py
+# 실행: chatt 폴더에서
+#   python -m benchmarks.suite run [--quick] [--only ganji rule_engine ...] [--out bench_results.json]
+#   python -m benchmarks.suite run --save-baseline            (현재 결과를 기준선으로 저장)
+#   python -m benchmarks.suite run --baseline benchmarks/baseline.json   (실행 후 바로 비교)
+#   python -m benchmarks.suite compare benchmarks/baseline.json bench_results.json [--threshold 0.2]
+# 분석/수집 경로의 핵심 구간을 고정 시드의 합성 데이터로 재고 결과를 JSON 으로 남깁니다.
+# 데이터 생성기는 개별 벤치마크(bench_ganji, bench_rule_engine, bench_blockify, bench_kb_save, bench_worker)의 것을 씁니다.
+# compare 는 기준선보다 threshold 이상 나빠진 지표가 있으면 0 이 아닌 코드로 끝납니다.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+BASELINE_PATH = os.path.join("benchmarks", "baseline.json")
+RESULTS_PATH = "bench_results.json"
+DEFAULT_THRESHOLD = 0.20  # 기준선보다 20% 넘게 나빠지면 회귀
+MIN_SAMPLE_SECONDS = 0.05  # 표본 하나의 최소 측정 시간
+REF_DATE = date(2025, 1, 1)  # 대운/세운 기준일 (결과가 실행 날짜에 따라 바뀌지 않도록)
+
+# 규모: quick 은 CI 용 (수십 초), full 은 성능 작업용
+SCALES = {
+    "quick": {"rows": 100_000, "scalar_rows": 2_000, "charts": 2_000, "rule_counts": [100, 1_000, 10_000],
+              "statuses": 100, "corpus_mb": 2, "merge_batch": 1_000, "kb_files": [10, 50], "kb_entries": 200,
+              "worker_jobs": 10, "worker_paragraphs": 64, "repeat": 3},
+    "full": {"rows": 1_000_000, "scalar_rows": 20_000, "charts": 20_000, "rule_counts": [100, 1_000, 10_000, 100_000],
+             "statuses": 200, "corpus_mb": 20, "merge_batch": 10_000, "kb_files": [10, 100, 500], "kb_entries": 500,
+             "worker_jobs": 50, "worker_paragraphs": 200, "repeat": 5},
+}
+
+CASES: Dict[str, Callable] = {}
+
+
+def case(name: str):
+    def decorator(func):
+        CASES[name] = func
+        return func
+    return decorator
+
+
+def best_seconds(func: Callable, repeat: int) -> float:
+    """
+    func 한 번의 시간(초). 짧은 구간은 한 표본이 MIN_SAMPLE_SECONDS 를 넘도록 여러 번 묶어 재고,
+    timeit 처럼 표본 중 최솟값을 씁니다. (다른 프로세스 때문에 느려진 표본을 버려 실행 간 흔들림을 줄입니다)
+    """
+    start = time.perf_counter()
+    func()  # 첫 호출 (캐시/지연 import 준비) 은 버리고 묶음 크기만 정합니다.
+    number = max(1, int(MIN_SAMPLE_SECONDS / max(time.perf_counter() - start, 1e-9)))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return min(times)
+
+
+def metric(value: float, unit: str, better: str = "lower") -> dict:
+    return {"value": value, "unit": unit, "better": better}
+
+
+# --------------------------------------------------
+# 측정 구간
+# --------------------------------------------------
+@case("ganji")
+def bench_ganji(scale: dict) -> Dict[str, dict]:
+    from benchmarks.bench_ganji import make_birth_datetimes
+    from modules import analyzer_engine
+    from modules.analyzer_engine import get_ganji, get_ganji_indices_batch, get_saju_charts, get_saju_info
+
+    births = make_birth_datetimes(scale["rows"])
+    scalar = births[:scale["scalar_rows"]].astype(datetime).tolist()
+    genders = np.where(np.arange(len(births)) % 2 == 0, "남", "여")
+
+    def saju_infos():
+        analyzer_engine._luck_timeline.cache_clear()  # 매 반복을 캐시 없이
+        for i, dt in enumerate(scalar):
+            get_saju_info(dt.date(), dt.time(), genders[i], False, REF_DATE)
+
+    n, rows, repeat = len(scalar), len(births), scale["repeat"]
+    return {
+        "get_ganji": metric(best_seconds(lambda: [get_ganji(d.year, d.month, d.day, d.hour, d.minute) for d in scalar], repeat) / n,
+                            "s/chart"),
+        "get_ganji_indices_batch": metric(best_seconds(lambda: get_ganji_indices_batch(births), repeat) / rows, "s/chart"),
+        "get_saju_info": metric(best_seconds(saju_infos, repeat) / n, "s/chart"),
+        "get_saju_charts": metric(best_seconds(lambda: get_saju_charts(births, genders, REF_DATE), repeat) / rows,
+                                  "s/chart"),
+    }
+
+
+@case("analyzer")
+def bench_analyzer(scale: dict) -> Dict[str, dict]:
+    from benchmarks.bench_ganji import make_birth_datetimes
+    from benchmarks.bench_saju_chart import RULES
+    from modules.analyzer_engine import SajuAnalyzer, get_saju_charts
+    from modules.saju_chart import unpack
+
+    births = make_birth_datetimes(scale["charts"], seed=1)
+    records = get_saju_charts(births, np.where(np.arange(len(births)) % 2 == 0, "남", "여"), REF_DATE)
+    infos = [chart.to_dict() for chart in unpack(records)]
+    analyzer = SajuAnalyzer(RULES)
+    n, repeat = len(infos), scale["repeat"]
+    return {
+        "analyze": metric(best_seconds(lambda: [analyzer.analyze(info) for info in infos], repeat) / n, "s/chart"),
+        "analyze_many[dict]": metric(best_seconds(lambda: analyzer.analyze_many(infos), repeat) / n, "s/chart"),
+        "analyze_many[CHART_DTYPE]": metric(best_seconds(lambda: analyzer.analyze_many(records), repeat) / n, "s/chart"),
+    }
+
+
+@case("rule_engine")
+def bench_rule_engine(scale: dict) -> Dict[str, dict]:
+    from benchmarks.bench_rule_engine import make_rules, make_status
+    from modules.rule_engine import RuleEngine
+
+    customs = {
+        "is_jaeseong_strong": lambda s: s.get("재성_강도", 0) >= 5,
+        "is_gwansal_strong": lambda s: s.get("플래그1", False),
+        "has_gongmang": lambda s: s.get("재성_강도", 0) % 2 == 0,
+    }
+    results = {}
+    for count in scale["rule_counts"]:
+        rng = random.Random(0)
+        rules = make_rules(count, rng)
+        statuses = [make_status(rng) for _ in range(scale["statuses"])]
+        results[f"compile[{count}]"] = metric(best_seconds(lambda: RuleEngine(rules, customs), scale["repeat"]), "s")
+        engine = RuleEngine(rules, customs)
+        seconds = best_seconds(lambda: [engine.match_rules(status) for status in statuses], scale["repeat"])
+        results[f"match_rules[{count}]"] = metric(seconds / len(statuses), "s/status")
+    return results
+
+
+@case("blockify")
+def bench_blockify(scale: dict) -> Dict[str, dict]:
+    from benchmarks.bench_blockify import write_corpus
+    from modules import rules_config
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        write_corpus(path, scale["corpus_mb"])
+        megabytes = os.path.getsize(path) / 1024 / 1024
+        seconds = best_seconds(lambda: rules_config.blockify(rules_config.iter_lines(path), path), scale["repeat"])
+        blocks = rules_config.blockify(rules_config.iter_lines(path), path)
+        # 새 묶음: 절반은 이미 있는 블록, 절반은 처음 보는 블록
+        half = min(scale["merge_batch"], len(blocks)) // 2
+        existing, fresh = blocks[:-half], blocks[-half:]
+        new = existing[:half] + fresh
+        fresh_hashes = [(rules_config.block_hash(b),) for b in fresh]
+
+        index = rules_config.BlockIndex(os.path.join(tmp, "block_index.db"))
+        index.rebuild(existing)
+
+        def indexed_merge():
+            rules_config.merge_blocks(existing, new, index=index)
+            index.commit()
+            with index.con:  # 다음 반복도 같은 상태에서 시작하도록 이번에 추가된 해시를 지웁니다.
+                index.con.executemany("DELETE FROM block_hashes WHERE hash = ?", fresh_hashes)
+
+        results = {
+            "blockify": metric(seconds / megabytes, "s/MB"),
+            "merge_blocks[full]": metric(best_seconds(lambda: rules_config.merge_blocks(existing, new), scale["repeat"]),
+                                         "s/batch"),
+            "merge_blocks[indexed]": metric(best_seconds(indexed_merge, scale["repeat"]), "s/batch"),
+        }
+        index.close()
+    return results
+
+
+@case("kb")
+def bench_kb(scale: dict) -> Dict[str, dict]:
+    from benchmarks.bench_kb_save import make_knowledge
+    from modules import db_handler, kb_compiled, kb_storage
+
+    results = {}
+    entry = make_knowledge(1)["문서AI"]["sub_topics"]["항목_0"]
+    cwd = os.getcwd()
+    for files in scale["kb_files"]:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)  # db_handler 는 상대 경로 knowledge/ 를 씁니다.
+            try:
+                os.makedirs(db_handler.KNOWLEDGE_DIR)
+                for i in range(files):
+                    data = {f"주제_{i}": {"sub_topics": {f"항목_{j}": dict(entry) for j in range(scale["kb_entries"])}}}
+                    kb_storage.atomic_write_json(os.path.join(db_handler.KNOWLEDGE_DIR, f"kb_{i:04d}.json"), data)
+                loader = db_handler.get_loader()
+
+                def cold_load():
+                    loader.invalidate()
+                    db_handler.load_kb()
+
+                results[f"load_kb[cold,{files} files]"] = metric(best_seconds(cold_load, scale["repeat"]), "s")
+                results[f"load_kb[warm,{files} files]"] = metric(best_seconds(db_handler.load_kb, scale["repeat"]), "s")
+                for path in kb_compiled.compile_targets([db_handler.KNOWLEDGE_DIR]):
+                    kb_compiled.build_compiled(path)
+                results[f"load_kb[compiled,{files} files]"] = metric(best_seconds(cold_load, scale["repeat"]), "s")
+                counter = iter(range(10 ** 9))
+
+                def save_one():
+                    i = next(counter)
+                    db_handler.save_kb({"문서AI": {"sub_topics": {f"새항목_{i}": {"content": "추가된 문단", "category": "기타"}}}},
+                                       "kb_0000.json", mode="journal")
+
+                results[f"save_kb[journal,{files} files]"] = metric(best_seconds(save_one, scale["repeat"]), "s/save")
+
+                def save_then_load():
+                    save_one()
+                    db_handler.load_kb()
+
+                results[f"save_then_load_kb[{files} files]"] = metric(best_seconds(save_then_load, scale["repeat"]), "s")
+                loader.invalidate()
+            finally:
+                os.chdir(cwd)
+    return results
+
+
+@case("worker")
+def bench_worker(scale: dict) -> Dict[str, dict]:
+    from benchmarks.bench_worker import enqueue, make_uploads, stub_classify
+    from modules import job_metrics, job_queue
+    import worker
+
+    jobs, paragraphs = scale["worker_jobs"], scale["worker_paragraphs"]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "jobs.db")
+        enqueue(db_path, make_uploads(tmp, jobs, paragraphs))
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            worker.run_worker(0, db_path, classify=stub_classify, stop_when_idle=True)
+            seconds = time.perf_counter() - start
+        with job_queue.connect(db_path) as con:
+            completed = job_queue.count_jobs(con, "completed")
+            totals = job_metrics.stage_totals(con)
+    if completed != jobs:
+        raise RuntimeError(f"worker: {jobs}개 중 {completed}개만 완료되었습니다.")
+    total_paragraphs = totals["total"]["count"]
+    results = {"paragraphs_per_sec": metric(total_paragraphs / seconds, "paragraphs/s", better="higher")}
+    for stage in job_metrics.PIPELINE_STAGES:
+        if stage in totals:
+            results[f"stage[{stage}]"] = metric(totals[stage]["seconds"] / total_paragraphs, "s/paragraph")
+    return results
+
+
+# --------------------------------------------------
+# 실행 / 비교
+# --------------------------------------------------
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine(),
+            "cpus": os.cpu_count(), "numpy": np.__version__, "commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds")}
+
+
+def run_suite(scale_name: str, only: List[str] = None) -> dict:
+    scale = SCALES[scale_name]
+    results = {}
+    for name, func in CASES.items():
+        if only and name not in only:
+            continue
+        start = time.perf_counter()
+        for key, value in func(scale).items():
+            results[f"{name}.{key}"] = value
+        print(f"  {name:<12} {time.perf_counter() - start:6.1f} s", file=sys.stderr)
+    return {"environment": environment(), "scale": scale_name, "cases": [name for name in CASES if not only or name in only],
+            "results": results}
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """
+    기준선의 지표를 현재 결과와 비교합니다. change 는 나빠진 비율 (lower 지표: 현재/기준 - 1, higher 지표: 기준/현재 - 1),
+    threshold 를 넘으면 regression. 현재 실행한 구간(cases)인데 지표가 없으면(이름 변경, 삭제) missing 이며 회귀로 봅니다.
+    """
+    cases = current.get("cases")
+    rows = []
+    for key, base in baseline["results"].items():
+        if cases is not None and key.split(".", 1)[0] not in cases:
+            continue  # run --only 로 고른 구간만 비교
+        cur = current["results"].get(key)
+        if cur is None:
+            rows.append({"metric": key, "unit": base["unit"], "baseline": base["value"], "current": None,
+                         "change": None, "regression": True, "improved": False, "missing": True})
+            continue
+        if not base["value"] or not cur["value"]:
+            continue
+        if base["better"] == "higher":
+            change = base["value"] / cur["value"] - 1
+        else:
+            change = cur["value"] / base["value"] - 1
+        rows.append({"metric": key, "unit": base["unit"], "baseline": base["value"], "current": cur["value"],
+                     "change": change, "regression": change > threshold, "improved": change < -threshold,
+                     "missing": False})
+    return rows
+
+
+def print_comparison(rows: List[dict], baseline: dict, current: dict, threshold: float):
+    if baseline.get("scale") != current.get("scale"):
+        print(f"⚠️ 규모가 다릅니다: 기준선 {baseline.get('scale')} / 현재 {current.get('scale')}")
+    if baseline["environment"].get("platform") != current["environment"].get("platform"):
+        print("⚠️ 실행 환경이 다릅니다. 절대 시간 비교는 참고용입니다.")
+    print(f"{'metric':<46} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in rows:
+        if row["missing"]:
+            print(f"{row['metric']:<46} {row['baseline']:>12.4g} {'-':>12} {'-':>8}  <-- 지표 없음")
+            continue
+        flag = "  <-- 회귀" if row["regression"] else ("  (개선)" if row["improved"] else "")
+        print(f"{row['metric']:<46} {row['baseline']:>12.4g} {row['current']:>12.4g} {row['change']:>+8.1%}{flag}")
+    missing = sum(row["missing"] for row in rows)
+    regressions = sum(row["regression"] for row in rows) - missing
+    print(f"\n지표 {len(rows)}개, 회귀 {regressions}개, 없어진 지표 {missing}개 (임계값 {threshold:.0%})")
+
+
+def _load(path: str) -> dict:
+    if not os.path.exists(path):
+        hint = " 먼저 `python -m benchmarks.suite run --save-baseline` 로 기준선을 만드세요." if path == BASELINE_PATH else ""
+        raise SystemExit(f"'{path}' 파일이 없습니다.{hint}")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _dump(data: dict, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="분석/수집 경로 벤치마크 모음")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="벤치마크를 실행하고 결과를 JSON 으로 저장")
+    run_parser.add_argument("--quick", action="store_true", help="작은 규모 (CI 용)")
+    run_parser.add_argument("--only", nargs="+", choices=list(CASES), help="실행할 구간")
+    run_parser.add_argument("--out", default=RESULTS_PATH)
+    run_parser.add_argument("--baseline", help="실행 후 이 기준선과 비교 (회귀가 있으면 종료 코드 1)")
+    run_parser.add_argument("--save-baseline", action="store_true", help=f"결과를 {BASELINE_PATH} 에도 저장")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser = commands.add_parser("compare", help="두 결과 JSON 을 비교 (회귀가 있으면 종료 코드 1)")
+    compare_parser.add_argument("baseline", nargs="?", default=BASELINE_PATH)
+    compare_parser.add_argument("current", nargs="?", default=RESULTS_PATH)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        current = run_suite("quick" if args.quick else "full", args.only)
+        _dump(current, args.out)
+        print(f"결과: {args.out} (지표 {len(current['results'])}개)")
+        if args.save_baseline:
+            _dump(current, BASELINE_PATH)
+            print(f"기준선 저장: {BASELINE_PATH}")
+        if not args.baseline:
+            return 0
+        baseline = _load(args.baseline)
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+    rows = compare(baseline, current, args.threshold)
+    print_comparison(rows, baseline, current, args.threshold)
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
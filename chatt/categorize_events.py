@@ -1,83 +1,202 @@
+import argparse
+import os
+from collections import deque
+from functools import lru_cache
+from multiprocessing import Pool
+from typing import Iterator, Union
+
+import numpy as np
 import pandas as pd
 
-def categorize_description(description: str, rules: dict) -> tuple:
+from modules.keyword_matcher import KeywordRules
+
+UNCATEGORIZED = ('미분류', '미분류', '중립')
+CATEGORY_COLUMNS = ['category1', 'category2', 'outcome']
+CHUNK_SIZE = 200_000  # 한 번에 읽고 분류하는 행 수
+
+# --- 1. 분류 규칙을 이곳에서 직접 수정하거나 추가할 수 있습니다. ---
+# 형식: "키워드": ("대분류", "중분류", "긍정/부정/중립")
+KEYWORD_RULES = {
+    "결혼": ("인간관계", "결혼", "긍정"),
+    "동거": ("인간관계", "연애", "긍정"),
+    "이혼": ("인간관계", "이혼", "부정"),
+    "헤어진다": ("인간관계", "이별", "부정"),
+    "불화": ("인간관계", "불화", "부정"),
+
+    "승진": ("직업", "승진", "긍정"),
+    "관직을 얻는다": ("직업", "취업/임용", "긍정"),
+    "시험합격": ("직업", "시험합격", "긍정"),
+    "창업": ("직업", "창업", "중립"),
+    "사업을 시작": ("직업", "창업", "중립"),
+    "개업": ("직업", "창업", "중립"),
+    "사직": ("직업", "퇴사/사직", "중립"),
+    "직장을 전환": ("직업", "이직", "중립"),
+    "실패": ("직업", "실패", "부정"),
+
+    "발재": ("재물", "재물획득", "긍정"),
+    "돈을 회수": ("재물", "재물획득", "긍정"),
+    "파재": ("재물", "재물손실", "부정"),
+    "돈을 썼다": ("재물", "지출", "중립"),
+    "투자": ("재물", "투자", "중립"),
+
+    "사망": ("건강/가족", "사망", "부정"),
+    "病이 났다": ("건강/가족", "질병", "부정"),
+    "수술": ("건강/가족", "질병", "부정"),
+    "부친": ("건강/가족", "가족사", "중립"),
+    "모친": ("건강/가족", "가족사", "중립"),
+
+    "관재구설": ("사건사고", "소송/구설", "부정"),
+    "감옥": ("사건사고", "수감", "부정")
+}
+
+def compile_keyword_rules(rules: dict) -> KeywordRules:
+    """{"키워드": (대분류, 중분류, 결과)} 규칙을 컴파일합니다. 딕셔너리 순서가 우선순위입니다."""
+    return KeywordRules(rules.items())
+
+@lru_cache(maxsize=8)
+def _compile_cached(items: tuple) -> KeywordRules:
+    return KeywordRules(items)
+
+def categorize_description(description: str, rules: Union[dict, KeywordRules]) -> tuple:
     """
     사건 설명(description)을 읽고, 정의된 규칙에 따라 카테고리를 반환합니다.
+    rules 는 규칙 딕셔너리 또는 compile_keyword_rules 결과입니다. (여러 번 부를 때는 컴파일해서 넘기세요)
     """
     # description이 문자열이 아닌 경우를 대비하여 문자열로 변환
     if not isinstance(description, str):
-        return ('미분류', '미분류', '중립')
+        return UNCATEGORIZED
 
-    for keyword, categories in rules.items():
-        if keyword in description:
-            return categories  # 첫 번째로 일치하는 규칙의 카테고리를 반환
-    
-    # 어떤 키워드와도 일치하지 않으면 '미분류'로 반환
-    return ('미분류', '미분류', '중립')
+    if isinstance(rules, KeywordRules):
+        compiled = rules
+    else:
+        try:
+            compiled = _compile_cached(tuple(rules.items()))
+        except TypeError:  # 값이 리스트 등 해시할 수 없는 경우
+            compiled = compile_keyword_rules(rules)
+    # 설명에 포함된 키워드 중 규칙 순서상 가장 앞선 것의 카테고리 (어떤 키워드와도 일치하지 않으면 '미분류')
+    return compiled.first(description, UNCATEGORIZED)
 
-def main():
-    """메인 실행 함수"""
+def categorize_values(descriptions, rules: KeywordRules) -> np.ndarray:
+    """
+    설명 배열을 (행 수 × 3) 카테고리 배열로 분류합니다.
+    같은 설명은 한 번만 분류하고(pd.factorize), 결과는 numpy 인덱싱으로 펼칩니다.
+    """
+    codes, uniques = pd.factorize(pd.Series(descriptions, dtype=object), use_na_sentinel=True)
+    table = np.empty((len(uniques) + 1, 3), dtype=object)
+    for i, description in enumerate(uniques):
+        table[i] = categorize_description(description, rules)
+    table[-1] = UNCATEGORIZED  # 결측값(code -1)은 마지막 행
+    return table[codes]
 
-    # --- 1. 분류 규칙을 이곳에서 직접 수정하거나 추가할 수 있습니다. ---
-    # 형식: "키워드": ("대분류", "중분류", "긍정/부정/중립")
-    keyword_rules = {
-        "결혼": ("인간관계", "결혼", "긍정"),
-        "동거": ("인간관계", "연애", "긍정"),
-        "이혼": ("인간관계", "이혼", "부정"),
-        "헤어진다": ("인간관계", "이별", "부정"),
-        "불화": ("인간관계", "불화", "부정"),
-
-        "승진": ("직업", "승진", "긍정"),
-        "관직을 얻는다": ("직업", "취업/임용", "긍정"),
-        "시험합격": ("직업", "시험합격", "긍정"),
-        "창업": ("직업", "창업", "중립"),
-        "사업을 시작": ("직업", "창업", "중립"),
-        "개업": ("직업", "창업", "중립"),
-        "사직": ("직업", "퇴사/사직", "중립"),
-        "직장을 전환": ("직업", "이직", "중립"),
-        "실패": ("직업", "실패", "부정"),
-
-        "발재": ("재물", "재물획득", "긍정"),
-        "돈을 회수": ("재물", "재물획득", "긍정"),
-        "파재": ("재물", "재물손실", "부정"),
-        "돈을 썼다": ("재물", "지출", "중립"),
-        "투자": ("재물", "투자", "중립"),
-
-        "사망": ("건강/가족", "사망", "부정"),
-        "病이 났다": ("건강/가족", "질병", "부정"),
-        "수술": ("건강/가족", "질병", "부정"),
-        "부친": ("건강/가족", "가족사", "중립"),
-        "모친": ("건강/가족", "가족사", "중립"),
-
-        "관재구설": ("사건사고", "소송/구설", "부정"),
-        "감옥": ("사건사고", "수감", "부정")
-    }
-
-    input_filename = "life_events.csv"
-    output_filename = "life_events_categorized.csv"
+_worker_rules = None
 
-    try:
-        df = pd.read_csv(input_filename)
-        print(f"'{input_filename}' 파일을 성공적으로 읽었습니다. 총 {len(df)}개의 데이터.")
-    except FileNotFoundError:
-        print(f"오류: '{input_filename}'을 찾을 수 없습니다. 이전 스크립트를 먼저 실행해 데이터를 추출해주세요.")
+def _init_worker(rules: KeywordRules):
+    global _worker_rules
+    _worker_rules = rules
+
+def _categorize_in_worker(descriptions) -> np.ndarray:
+    return categorize_values(descriptions, _worker_rules)
+
+def iter_categorized_chunks(input_filename: str, rules: KeywordRules, chunksize: int = CHUNK_SIZE,
+                            workers: int = 1, dtype=None) -> Iterator[pd.DataFrame]:
+    """
+    CSV 를 chunksize 행씩 읽어 카테고리 열을 붙인 청크를 입력 순서대로 내보냅니다.
+    workers > 1 이면 프로세스 풀에서 분류하되, 처리 중인 청크를 workers * 2 개로 제한해 메모리를 일정하게 유지합니다.
+    dtype 은 read_csv 에 그대로 넘깁니다. (None 이면 청크마다 타입을 추론)
+    """
+    reader = pd.read_csv(input_filename, chunksize=chunksize, dtype=dtype)
+    if workers <= 1:
+        for chunk in reader:
+            chunk[CATEGORY_COLUMNS] = categorize_values(chunk['description'].to_numpy(dtype=object), rules)
+            yield chunk
         return
 
-    # 각 설명에 대해 카테고리를 분류하는 함수를 적용
-    categories = df['description'].apply(lambda x: categorize_description(x, keyword_rules))
+    with Pool(workers, initializer=_init_worker, initargs=(rules,)) as pool:
+        pending = deque()
+        for chunk in reader:
+            # 설명 열만 보내고 결과 배열만 받아, 프로세스 간 복사를 최소화합니다.
+            pending.append((chunk, pool.apply_async(_categorize_in_worker, (chunk['description'].to_numpy(dtype=object),))))
+            if len(pending) >= workers * 2:
+                done, result = pending.popleft()
+                done[CATEGORY_COLUMNS] = result.get()
+                yield done
+        while pending:
+            done, result = pending.popleft()
+            done[CATEGORY_COLUMNS] = result.get()
+            yield done
+
+class _ChunkWriter:
+    """
+    청크를 받는 대로 CSV(이어 쓰기) 또는 Parquet(행 그룹)로 씁니다.
+    Parquet 은 파일 전체가 한 스키마라서 모든 열을 문자열로 씁니다. 청크마다 추론한 타입(예: 첫 청크에서 전부 빈 열은
+    float/null)을 파일 스키마로 삼으면 뒤 청크에 글자가 나올 때 ArrowInvalid 가 나기 때문입니다.
+    """
+
+    def __init__(self, output_filename: str, output_format: str):
+        self.output_filename = output_filename
+        self.output_format = output_format
+        self._parquet = None
+        self._first = True
+
+    def write(self, chunk: pd.DataFrame):
+        if self.output_format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._parquet is None:
+                schema = pa.schema([(str(name), pa.string()) for name in chunk.columns])
+                self._parquet = pq.ParquetWriter(self.output_filename, schema)
+            self._parquet.write_table(pa.Table.from_pandas(chunk, schema=self._parquet.schema, preserve_index=False))
+        else:
+            # BOM(utf-8-sig)은 파일 맨 앞에 한 번만
+            chunk.to_csv(self.output_filename, index=False, header=self._first, mode='w' if self._first else 'a',
+                         encoding='utf-8-sig' if self._first else 'utf-8')
+        self._first = False
 
-    # 데이터프레임에 새로운 열들로 추가
-    df[['category1', 'category2', 'outcome']] = pd.DataFrame(categories.tolist(), index=df.index)
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+def categorize_file(input_filename: str, output_filename: str, chunksize: int = CHUNK_SIZE, workers: int = 1,
+                    output_format: str = None, rules: dict = None) -> int:
+    """입력 CSV 를 청크 단위로 분류해 출력 파일에 이어 씁니다. 반환: 처리한 행 수"""
+    output_format = output_format or ('parquet' if output_filename.endswith('.parquet') else 'csv')
+    compiled = compile_keyword_rules(rules or KEYWORD_RULES)
+    writer = _ChunkWriter(output_filename, output_format)
+    # Parquet 은 입력 열을 문자열 그대로 읽어 씁니다. (_ChunkWriter 참고)
+    dtype = str if output_format == 'parquet' else None
+    rows = 0
+    try:
+        for chunk in iter_categorized_chunks(input_filename, compiled, chunksize, workers, dtype):
+            if rows == 0:
+                print("\n[샘플 결과 미리보기]")
+                print(chunk[['description'] + CATEGORY_COLUMNS].head())
+            writer.write(chunk)
+            rows += len(chunk)
+            print(f"  ... {rows:,}행 처리", end='\r')
+    finally:
+        writer.close()
+    return rows
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="사건 설명을 키워드 규칙으로 분류합니다. (청크 단위 스트리밍)")
+    parser.add_argument("--input", default="life_events.csv", help="입력 CSV (description 열 필요)")
+    parser.add_argument("--output", default="life_events_categorized.csv", help="출력 파일 (.parquet 이면 Parquet)")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="한 번에 처리하는 행 수")
+    parser.add_argument("--workers", type=int, default=1, help="분류 프로세스 수 (1이면 현재 프로세스에서)")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="출력 형식 (기본: 확장자로 판단)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"오류: '{args.input}'을 찾을 수 없습니다. 이전 스크립트를 먼저 실행해 데이터를 추출해주세요.")
+        return
 
-    # 결과 저장
-    df.to_csv(output_filename, index=False, encoding='utf-8-sig')
+    rows = categorize_file(args.input, args.output, args.chunksize, args.workers, args.format)
 
     print("\n" + "="*50)
-    print(f"[성공] 데이터 규칙화가 완료되었습니다.")
-    print(f"결과가 '{output_filename}' 파일로 저장되었습니다.")
+    print(f"[성공] 데이터 규칙화가 완료되었습니다. 총 {rows:,}개의 데이터.")
+    print(f"결과가 '{args.output}' 파일로 저장되었습니다.")
     print("="*50)
-    print("\n[샘플 결과 미리보기]")
-    print(df[['description', 'category1', 'category2', 'outcome']].head())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,59 +1,97 @@
 # 파일 경로: modules/ai_utils.py
+# streamlit 에 의존하지 않는 코어 모듈입니다. (worker/CLI 가 UI 프레임워크 없이 import)
+# transformers·sentence-transformers·openai 같은 무거운 라이브러리는 실제로 쓰는 함수 안에서 import 합니다.
+# Streamlit 페이지에서의 캐싱/스피너는 modules/streamlit_adapters.py 가 담당합니다.
 
-import streamlit as st
-from transformers import pipeline
-from typing import List
+import numpy as np
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from modules.classify_cache import ClassificationCache
+
+OPENAI_MODEL = "gpt-3.5-turbo"
+LOCAL_MODEL = "MoritzLaurer/mDeBERTa-v3-base-mnli-xnli"
+EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+EMBEDDING_BATCH_SIZE = 64
+
+# 로컬 분류 방식. 작업마다 고를 수 있습니다. (jobs.db 의 classifier_mode 열)
+CLASSIFIER_MODES = {
+    "nli": "제로샷 NLI (정확, 문단×카테고리 수만큼 추론)",
+    "embedding": "문장 임베딩 (빠름, 문단당 한 번 추론)",
+}
+DEFAULT_CLASSIFIER_MODE = "nli"
+
+# 임베딩 방식에서 카테고리 이름만으로는 정보가 부족하므로, 기본 카테고리에는 설명 문장을 덧붙여
+# 여러 문장의 평균 벡터(프로토타입)로 비교합니다. 목록에 없는 카테고리는 PROTOTYPE_TEMPLATE 만 씁니다.
+PROTOTYPE_TEMPLATE = "이 글은 {}에 관한 내용이다."
+CATEGORY_PROTOTYPES = {
+    "격국": ["월령과 용신으로 격을 정하고 성격과 파격을 따진다.", "정관격, 편재격, 식신격 같은 격국의 성패"],
+    "십신": ["비견, 겁재, 식신, 상관, 편재, 정재, 편관, 정관, 편인, 정인의 작용", "일간과 다른 글자의 생극 관계"],
+    "재물": ["재성과 돈, 재산, 사업의 득실", "재물운이 들어오고 나가는 시기"],
+    "혼인": ["배우자, 결혼, 이혼과 부부 관계", "남자는 재성, 여자는 관성으로 배우자를 본다."],
+    "건강": ["질병, 사고, 수술과 몸의 약한 곳", "오행의 태과불급으로 보는 건강"],
+    "직업": ["직장, 관직, 승진과 적성에 맞는 일", "관성과 식상으로 보는 사회 활동"],
+    "상호작용": ["천간합, 지지의 육합, 삼합, 충, 형, 파, 해", "글자끼리 합하고 충하는 작용"],
+    "기타": ["그 밖의 일반적인 내용"],
+}
 
 # --------------------------------------------------
 # 방법 1: OpenAI API를 사용하는 분류 함수
 # --------------------------------------------------
-def ai_classify_paragraphs(paragraphs: List[str], api_key: str, categories: List[str]) -> List[str]:
-    """OpenAI API를 사용해 문단들을 분류합니다. (v1.0.0 이상 호환)"""
+def ai_classify_paragraphs(paragraphs: List[str], api_key: str, categories: List[str],
+                           cache: Optional[ClassificationCache] = None, **options) -> List[str]:
+    """OpenAI API를 사용해 문단들을 분류합니다. (v1.0.0 이상 호환)
+    요청은 동시에 보내며(속도 제한·재시도 포함), options 로 pack_size(프롬프트당 문단 수),
+    multi_label, max_concurrency, base_url 등을 바꿀 수 있습니다. (modules/openai_classify.py)
+    cache 를 주면 이미 분류한 문단(같은 카테고리/모델)은 API 를 다시 호출하지 않습니다."""
     if not api_key:
         return ["API 키 필요"] * len(paragraphs)
+    options.setdefault("model", OPENAI_MODEL)
+    if cache is not None:
+        model_id = f"openai:{options['model']}" + (":multi" if options.get("multi_label") else "")
+        return cache.classify(paragraphs, categories, model_id,
+                              lambda paras, cats: ai_classify_paragraphs(paras, api_key, cats, **options))
 
     try:
-        client = openai.OpenAI(api_key=api_key)
+        from modules import openai_classify
     except Exception as e:
         return [f"(OpenAI 모듈 초기화 실패: {e})"] * len(paragraphs)
-
-    results = []
-    for para in paragraphs:
-        prompt = f"다음 텍스트를 '{', '.join(categories)}' 카테고리 중 가장 적합한 것 하나로만 분류해서, 카테고리 이름만 정확하게 답해줘.\n\n텍스트: \"{para}\""
-        try:
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=20,
-                temperature=0
-            )
-            result = response.choices[0].message.content.strip().replace("'", "").replace('"', '')
-            if result not in categories:
-                result = "분류 실패"
-        except Exception as e:
-            error_message = str(e)
-            if "authentication" in error_message.lower():
-                result = "API 키 인증 실패"
-            else:
-                result = "API 호출 오류"
-        results.append(result)
-    return results
+    return openai_classify.classify_paragraphs(paragraphs, api_key, categories, **options)
 
 # --------------------------------------------------
 # 방법 2: 로컬 AI 모델을 사용하는 분류 함수 (추가된 부분)
 # --------------------------------------------------
-@st.cache_resource
+@lru_cache(maxsize=None)
 def load_local_classifier():
     """
-    Hugging Face의 zero-shot-classification 파이프라인을 로드하고 캐싱합니다.
+    Hugging Face의 zero-shot-classification 파이프라인을 로드하고 캐싱합니다. (프로세스당 한 번)
     """
+    from transformers import pipeline
     print(">> 로컬 AI 모델을 최초로 로딩합니다... (시간이 소요될 수 있습니다)")
-    return pipeline("zero-shot-classification", model="MoritzLaurer/mDeBERTa-v3-base-mnli-xnli")
+    return pipeline("zero-shot-classification", model=LOCAL_MODEL)
 
-def local_ai_classify(paragraphs: List[str], categories: List[str]) -> List[str]:
+def load_classifier(mode: str = DEFAULT_CLASSIFIER_MODE):
+    """분류 방식에 맞는 모델을 로드합니다. (worker 가 첫 작업 전에 미리 부를 때 사용)"""
+    return load_embedding_model() if mode == "embedding" else load_local_classifier()
+
+def _model_id(mode: str) -> str:
+    return f"embedding:{EMBEDDING_MODEL}" if mode == "embedding" else f"nli:{LOCAL_MODEL}"
+
+def local_ai_classify(paragraphs: List[str], categories: List[str],
+                      cache: Optional[ClassificationCache] = None,
+                      mode: str = DEFAULT_CLASSIFIER_MODE) -> List[str]:
     """
     캐싱된 로컬 AI 모델과 배치 처리를 사용하여 문단을 빠르게 분류합니다.
+    mode 는 CLASSIFIER_MODES 중 하나입니다. ("nli" 또는 "embedding")
+    cache 를 주면 배치 안의 중복 문단을 합치고, 이미 분류한 문단은 모델에 보내지 않습니다.
     """
+    if mode not in CLASSIFIER_MODES:
+        raise ValueError(f"알 수 없는 분류 방식입니다: {mode}")
+    if cache is not None:
+        return cache.classify(paragraphs, categories, _model_id(mode),
+                              lambda paras, cats: local_ai_classify(paras, cats, mode=mode))
+    if mode == "embedding":
+        return embedding_classify(paragraphs, categories)
     try:
         # 1. 캐싱된 모델을 즉시 불러옵니다.
         classifier = load_local_classifier()
@@ -73,6 +111,45 @@ def local_ai_classify(paragraphs: List[str], categories: List[str]) -> List[str]
         return ["'transformers' 라이브러리가 필요합니다. 'pip install transformers torch sentencepiece'를 실행해주세요."] * len(paragraphs)
     except Exception as e:
         return [f"로컬 AI 오류: {e}"] * len(paragraphs)
+
+# --------------------------------------------------
+# 방법 3: 문장 임베딩 + 코사인 유사도 (빠른 분류)
+# --------------------------------------------------
+@lru_cache(maxsize=None)
+def load_embedding_model():
+    """문장 임베딩 모델을 로드하고 캐싱합니다. (sentence-transformers 는 이 방식을 쓸 때만 필요)"""
+    from sentence_transformers import SentenceTransformer
+    print(">> 문장 임베딩 모델을 최초로 로딩합니다...")
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+@lru_cache(maxsize=64)
+def category_embeddings(categories: Tuple[str, ...]) -> np.ndarray:
+    """카테고리별 프로토타입 벡터 (카테고리 수 × 차원, 단위 벡터). 같은 카테고리 목록이면 다시 계산하지 않습니다."""
+    texts, owners = [], []
+    for i, category in enumerate(categories):
+        prototypes = [PROTOTYPE_TEMPLATE.format(category)] + CATEGORY_PROTOTYPES.get(category.strip(), [])
+        texts.extend(prototypes)
+        owners.extend([i] * len(prototypes))
+    vectors = load_embedding_model().encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    matrix = np.zeros((len(categories), vectors.shape[1]), dtype=np.float32)
+    np.add.at(matrix, owners, vectors)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix
+
+def embedding_classify(paragraphs: List[str], categories: List[str]) -> List[str]:
+    """
+    문단마다 임베딩을 한 번만 계산하고, (문단 × 차원) @ (차원 × 카테고리) 행렬곱 한 번으로
+    코사인 유사도가 가장 높은 카테고리를 고릅니다.
+    """
+    try:
+        vectors = load_embedding_model().encode(paragraphs, batch_size=EMBEDDING_BATCH_SIZE,
+                                                normalize_embeddings=True, convert_to_numpy=True)
+        scores = vectors @ category_embeddings(tuple(categories)).T
+        return [categories[i] for i in scores.argmax(axis=1)]
+    except ImportError:
+        return ["'sentence-transformers' 라이브러리가 필요합니다. 'pip install sentence-transformers'를 실행해주세요."] * len(paragraphs)
+    except Exception as e:
+        return [f"로컬 AI 오류: {e}"] * len(paragraphs)
 # --------------------------------------------------
 # 보조 기능: Gensim을 이용한 텍스트 요약
 # --------------------------------------------------
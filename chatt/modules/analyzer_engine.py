@@ -1,116 +1,452 @@
 # 파일 경로: modules/analyzer_engine.py
 
 from korean_lunar_calendar import KoreanLunarCalendar
-from datetime import datetime, time
-from typing import Dict
+from bisect import bisect_right
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Callable, Dict, List
+import re
+import numpy as np
+
+from modules.ganji_tables import (SIPSIN_BRANCH, SIPSIN_ORDER, SIPSIN_STEM, chart_indices, describe_interactions,
+                                  describe_interactions_batch, interactions_batch)
+from modules.saju_chart import (CHART_DTYPE, DAEUN_COUNT, SajuChart, as_records, chart_arrays, daeun_pillars,
+                                is_compact, unpack)
+from modules.solar_terms import FIRST_YEAR, load_solar_term_table, solar_month_index
 
 # 천간과 지지 리스트 (계산에 필요)
 CHEONGAN = "갑을병정무기경신임계"
 JIJI = "자축인묘진사오미신유술해"
+CHEONGAN_HANJA = "甲乙丙丁戊己庚辛壬癸"
+JIJI_HANJA = "子丑寅卯辰巳午未申酉戌亥"
 JIJI_TIMES = [time(23, 30), time(1, 30), time(3, 30), time(5, 30), time(7, 30), time(9, 30), time(11, 30),
               time(13, 30), time(15, 30), time(17, 30), time(19, 30), time(21, 30)]
 
-def get_ganji(year, month, day, hour):
-    """ 양력 날짜를 기반으로 간지를 계산하는 함수 """
-    # 년주 계산
-    year_gan = CHEONGAN[(year - 4) % 10]
-    year_ji = JIJI[(year - 4) % 12]
-    
-    # 월주 계산 (절기 기준, 여기서는 단순화된 로직 사용)
-    # 실제로는 월별 절입 시간을 기준으로 복잡한 계산이 필요합니다.
-    month_gan = CHEONGAN[((year - 1900) * 12 + month + 1) % 10]
-    month_ji = JIJI[(month + 1) % 12]
-
-    # 일주 계산 (라이브러리 사용)
-    calendar = KoreanLunarCalendar()
-    calendar.setSolarDate(year, month, day)
-    ilju = calendar.getGanjiString()
-    day_gan = ilju[0]
-    day_ji = ilju[1]
-
-    # 시주 계산
-    # 일간에 따른 시간별 천간 배정 (오자시, 五子時)
-    siju_cheongan_start_index = (CHEONGAN.index(day_gan) % 5) * 2
-    
-    current_time = time(hour)
-    time_index = 0
-    # 23:30 이후는 다음 날 자시로 취급
-    if current_time >= JIJI_TIMES[0]:
-        time_index = 0
+# 60갑자 표 (인덱스 i → 천간 i % 10, 지지 i % 12)
+GAPJA = [CHEONGAN[i % 10] + JIJI[i % 12] for i in range(60)]
+GAPJA_ARRAY = np.array(GAPJA)
+
+# 일진 계산용 상수: (date.toordinal() + DAY_CYCLE_OFFSET) % 60 이 그날의 60갑자 인덱스입니다.
+# (2024-02-10 = 갑진일 기준, KoreanLunarCalendar 의 일진과 1000~2050년 전 구간에서 일치)
+DAY_CYCLE_OFFSET = 14
+# numpy datetime64 의 기준일(1970-01-01)의 서수
+_EPOCH_ORDINAL = 719163
+
+# 절기표 첫 구간(FIRST_YEAR 년 인월)의 60갑자 인덱스. 월간은 년간으로 정해집니다. (오호둔, 五虎遁)
+_FIRST_MONTH_GAN = ((FIRST_YEAR - 4) % 10 % 5 * 2 + 2) % 10
+_FIRST_MONTH_IDX = (36 * _FIRST_MONTH_GAN + 25 * 2) % 60
+
+# 음력→양력 변환 캐시 크기 (같은 음력 생일이 반복될 때 재계산하지 않도록 LRU 로 유지)
+LUNAR_CACHE_SIZE = 4096
+
+# 대운/세운
+LUCK_YEARS = 100          # 연도별 대운/세운 계열의 길이 (출생 연도부터)
+DAYS_PER_DAEUN_YEAR = 3   # 출생 시각에서 절입 시각까지 3일이 대운 1년
+LUCK_CACHE_SIZE = 4096    # 차트별 연도별 계열 캐시 크기
+MALE_GENDERS = {"남", "남자", "남성", "男", "乾", "m", "male"}
+FEMALE_GENDERS = {"여", "여자", "여성", "女", "坤", "f", "female"}
+
+# 시지 구간 경계(분 단위). JIJI_TIMES[1:] 에 대한 선형 탐색을 이분 탐색으로 대체합니다.
+_JIJI_BOUND_LIST = [t.hour * 60 + t.minute for t in JIJI_TIMES[1:]]
+_JIJI_BOUNDS = np.array(_JIJI_BOUND_LIST)
+
+
+def _hour_branch_index(hour):
+    """시(hour)를 시지 인덱스로 변환합니다. 스칼라와 numpy 배열 모두 지원합니다."""
+    # 경계를 지난 개수 + 1 이 시지 인덱스이고, 마지막 경계(21:30) 이후는 자시(0)로 돌아갑니다.
+    if np.ndim(hour) == 0:
+        passed = bisect_right(_JIJI_BOUND_LIST, hour * 60)
     else:
-        for i in range(1, len(JIJI_TIMES)):
-            if current_time < JIJI_TIMES[i]:
-                time_index = i
-                break
-    
-    hour_gan = CHEONGAN[(siju_cheongan_start_index + time_index) % 10]
-    hour_ji = JIJI[time_index]
-    
+        passed = np.searchsorted(_JIJI_BOUNDS, np.asarray(hour) * 60, side='right')
+    return (passed + 1) % 12
+
+
+def _ganji_indices(ordinal, minute_of_day):
+    """
+    일서수와 그날 0시부터의 분(minute_of_day)으로 네 기둥의 60갑자 인덱스를 계산합니다. (스칼라·배열 공용)
+    절기표 범위(solar_terms.FIRST_YEAR 입춘 ~ LAST_YEAR 소한) 밖이면 ValueError.
+    """
+    # 년주·월주: 절기표에서 몇 번째 절기 구간인지 찾습니다. (입춘이 해의 시작, 각 절이 달의 시작)
+    # 절입 시각은 분 단위이므로 분까지 씁니다.
+    kst_minutes = (ordinal - _EPOCH_ORDINAL) * 1440 + minute_of_day
+    solar_month = solar_month_index(kst_minutes)
+    year_idx = (FIRST_YEAR - 4 + solar_month // 12) % 60
+    month_idx = (_FIRST_MONTH_IDX + solar_month) % 60
+
+    # 일주 (60갑자 일진 순환표)
+    day_idx = (ordinal + DAY_CYCLE_OFFSET) % 60
+
+    # 시주: 일간에 따른 시간별 천간 배정 (오자시, 五子時)
+    # 천간과 지지를 따로 구한 뒤 60갑자 인덱스로 합칩니다. (중국인의 나머지 정리)
+    # 시지는 예전처럼 '시' 단위로 정합니다.
+    time_index = _hour_branch_index(minute_of_day // 60)
+    hour_gan = ((day_idx % 10) % 5 * 2 + time_index) % 10
+    hour_idx = (36 * hour_gan + 25 * time_index) % 60
+
+    return year_idx, month_idx, day_idx, hour_idx
+
+
+def get_ganji(year, month, day, hour, minute=0):
+    """ 양력 날짜를 기반으로 간지를 계산하는 함수 (절기표 범위 1800년 입춘 ~ 2200년 소한) """
+    ordinal = datetime(year, month, day).toordinal()
+    year_idx, month_idx, day_idx, hour_idx = _ganji_indices(ordinal, hour * 60 + minute)
     return {
-        "년주": year_gan + year_ji,
-        "월주": month_gan + month_ji,
-        "일주": day_gan + day_ji,
-        "시주": hour_gan + hour_ji
+        "년주": GAPJA[year_idx],
+        "월주": GAPJA[month_idx],
+        "일주": GAPJA[day_idx],
+        "시주": GAPJA[hour_idx]
     }
 
-def get_saju_info(birth_date, birth_time, gender, is_lunar):
-    """ 생년월일시와 성별 등을 받아 사주 원국, 십신, 대운 등의 정보를 계산합니다. """
+
+def get_ganji_batch(birth_datetimes) -> Dict[str, np.ndarray]:
+    """
+    양력 생년월일시 배열(numpy datetime64 배열, pandas Series/DatetimeIndex, datetime 리스트)을 받아
+    네 기둥을 한 번에 계산합니다. 결과는 get_ganji 와 같은 키를 가진 문자열 배열 딕셔너리입니다.
+    (pandas.DataFrame(결과) 로 바로 표로 만들 수 있습니다.)
+    """
+    indices = get_ganji_indices_batch(birth_datetimes)
+    return {key: GAPJA_ARRAY[idx] for key, idx in indices.items()}
+
+
+def get_ganji_indices_batch(birth_datetimes) -> Dict[str, np.ndarray]:
+    """get_ganji_batch 와 같지만 문자열 대신 60갑자 인덱스(0~59) 배열을 반환합니다. (분 단위까지 사용)"""
+    dts = np.asarray(birth_datetimes, dtype='datetime64[m]')
+    days = dts.astype('datetime64[D]')
+    ordinal = days.astype(np.int64) + _EPOCH_ORDINAL
+    minute_of_day = (dts - days).astype(np.int64)
+
+    year_idx, month_idx, day_idx, hour_idx = _ganji_indices(ordinal, minute_of_day)
+    return {"년주": year_idx, "월주": month_idx, "일주": day_idx, "시주": hour_idx}
+
+@lru_cache(maxsize=LUNAR_CACHE_SIZE)
+def lunar_to_solar(year: int, month: int, day: int, is_intercalation: bool = False) -> datetime:
+    """음력 날짜를 양력 날짜로 변환합니다. 최근 LUNAR_CACHE_SIZE 개 결과를 캐싱합니다."""
     calendar = KoreanLunarCalendar()
+    calendar.setLunarDate(year, month, day, is_intercalation)
+    return datetime.fromisoformat(calendar.SolarIsoFormat())
+
+
+def _is_male(gender) -> bool:
+    key = str(gender).strip().lower()
+    if key in MALE_GENDERS:
+        return True
+    if key in FEMALE_GENDERS:
+        return False
+    raise ValueError(f"성별을 알 수 없습니다: {gender!r} (남/여)")
+
+
+def _luck_indices(kst_minutes, year_idx, month_idx, birth_year, is_male, years: int = LUCK_YEARS):
+    """
+    대운/세운 계산의 공통 부분 (스칼라·배열 공용, 배열은 차트 축이 앞).
+    양남음녀는 순행(다음 절까지), 음남양녀는 역행(지난 절부터)이고, 그 사이 날 수 / 3 이 대운 시작 나이입니다.
+    """
+    table = load_solar_term_table()
+    solar_month = solar_month_index(kst_minutes)
+    forward = (np.asarray(year_idx) % 2 == 0) == np.asarray(is_male)  # 60갑자 인덱스가 짝수면 양년
+    boundary = np.where(forward, table[solar_month + 1], table[solar_month]).astype(np.int64)
+    start_age = np.abs(boundary - kst_minutes) / 1440 / DAYS_PER_DAEUN_YEAR
+    daeun_su = np.clip(np.floor(start_age + 0.5), 1, 10).astype(np.int64)  # 반올림, 1~10
+    step = np.where(forward, 1, -1)
+
+    # 대운 n 번째(1부터) = 월주에서 n 칸 (순행 +, 역행 -)
+    nth = np.arange(1, DAEUN_COUNT + 1)
+    daeun = (np.expand_dims(month_idx, -1) + np.expand_dims(step, -1) * nth) % 60
+
+    # 연도별: 출생 연도 + 대운수 해부터 10년마다 다음 대운. 세운은 그해 입춘 이후의 년주 (연도 - 4) % 60.
+    year_axis = np.expand_dims(birth_year, -1) + np.arange(years)
+    elapsed = year_axis - np.expand_dims(birth_year + daeun_su, -1)
+    daeun_by_year = np.where(elapsed >= 0,
+                             (np.expand_dims(month_idx, -1) + np.expand_dims(step, -1) * (elapsed // 10 + 1)) % 60, -1)
+    seun_by_year = (year_axis - 4) % 60
+    return {"순행": forward, "시작나이": start_age, "대운수": daeun_su, "대운": daeun,
+            "연도": year_axis, "연도별대운": daeun_by_year, "세운": seun_by_year}
+
+
+def get_luck_batch(birth_datetimes, genders, years: int = LUCK_YEARS) -> Dict[str, np.ndarray]:
+    """
+    여러 차트의 대운/세운을 한 번에 계산합니다. birth_datetimes 는 get_ganji_indices_batch 와 같은 양력 생년월일시 배열,
+    genders 는 차트별 성별(또는 하나). 간지는 60갑자 인덱스이고 (GAPJA_ARRAY[idx] 로 문자열), 대운이 시작되기 전 해는 -1.
+      순행 (n,) / 시작나이 (n,) / 대운수 (n,) / 대운 (n, DAEUN_COUNT)
+      연도 (n, years) / 연도별대운 (n, years) / 세운 (n, years)
+    """
+    dts = np.asarray(birth_datetimes, dtype='datetime64[m]')
+    days = dts.astype('datetime64[D]')
+    ordinal = days.astype(np.int64) + _EPOCH_ORDINAL
+    minute_of_day = (dts - days).astype(np.int64)
+    year_idx, month_idx, _, _ = _ganji_indices(ordinal, minute_of_day)
+    # 월주와 같은 기준(분 단위)으로 절입까지의 거리를 잽니다.
+    kst_minutes = (ordinal - _EPOCH_ORDINAL) * 1440 + minute_of_day
+    labels, inverse = np.unique(np.atleast_1d(genders).astype(str), return_inverse=True)
+    is_male = np.broadcast_to(np.array([_is_male(g) for g in labels])[inverse.reshape(-1)], dts.shape)
+    birth_year = days.astype('datetime64[Y]').astype(np.int64) + 1970
+    return _luck_indices(kst_minutes, year_idx, month_idx, birth_year, is_male, years)
+
+
+@lru_cache(maxsize=LUCK_CACHE_SIZE)
+def _luck_timeline(birth: datetime, is_male: bool, years: int) -> Dict[str, np.ndarray]:
+    result = get_luck_batch([birth], ["남" if is_male else "여"], years)
+    timeline = {key: value[0] for key, value in result.items()}
+    for value in timeline.values():
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)  # 캐시를 공유하므로 읽기 전용
+    return timeline
+
+
+def get_luck_timeline(birth: datetime, gender, years: int = LUCK_YEARS) -> Dict[str, np.ndarray]:
+    """
+    차트 하나의 대운/세운 계열 (get_luck_batch 의 한 행). 같은 출생 시각·성별은 캐시에서 돌려줍니다.
+    birth 는 양력 생년월일시이며 분 단위까지만 씁니다.
+    """
+    birth = datetime(birth.year, birth.month, birth.day, birth.hour, birth.minute)
+    return _luck_timeline(birth, _is_male(gender), years)
+
+
+def get_saju_info(birth_date, birth_time, gender, is_lunar, ref_date: date = None, compact: bool = False):
+    """
+    생년월일시와 성별 등을 받아 사주 원국, 십신, 대운 등의 정보를 계산합니다.
+    대운/세운은 ref_date(기본: 오늘) 기준이며, 첫 대운 전이면 대운은 빈 딕셔너리입니다.
+    compact=True 면 딕셔너리 대신 같은 내용을 정수로 담은 SajuChart 를 돌려줍니다. (to_dict() 로 같은 딕셔너리)
+    년주·월주는 출생 시각(분 단위)과 절입 시각으로 정하므로, 양력 출생일과 ref_date 는 절기표 범위
+    (solar_terms.FIRST_YEAR 입춘 ~ LAST_YEAR 소한, 1800~2200년) 안이어야 합니다. 밖이면 ValueError.
+    """
     target_year, target_month, target_day = birth_date.year, birth_date.month, birth_date.day
 
-    # 음력이면 양력으로 변환
+    # 음력이면 양력으로 변환 (일진은 60갑자 순환표로 구하므로 양력 입력에는 달력 객체가 필요 없습니다)
     if is_lunar:
-        calendar.setLunarDate(target_year, target_month, target_day, False)
-        solar_date = calendar.SolarIsoFormat()
-        dt = datetime.fromisoformat(solar_date)
+        dt = lunar_to_solar(target_year, target_month, target_day, False)
         target_year, target_month, target_day = dt.year, dt.month, dt.day
-        
-    # 양력 날짜로 간지 계산
-    ganji = get_ganji(target_year, target_month, target_day, birth_time.hour)
-    
-    # 십신, 대운 등은 아직 가상 데이터 사용
-    return {
-        "원국": ganji,
-        "일간": ganji["일주"][0],
-        "십신": ['편재', '편관', '정관', '정인'], # 이 부분도 나중에 계산 로직 추가 필요
-        "대운": {'천간': '癸', '지지': '子'},     # 이 부분도 나중에 계산 로직 추가 필요
-        "세운": {'천간': '甲', '지지': '寅'}      # 이 부분도 나중에 계산 로직 추가 필요
-    }
+
+    # 양력 날짜로 네 기둥의 60갑자 인덱스 계산
+    minute_of_day = birth_time.hour * 60 + birth_time.minute
+    pillars = _ganji_indices(date(target_year, target_month, target_day).toordinal(), minute_of_day)
+
+    # 대운/세운: 대운은 연 단위(출생 연도 + 대운수 해부터 10년씩), 세운은 ref_date 의 년주(입춘 기준)
+    ref_date = ref_date or date.today()
+    timeline = get_luck_timeline(datetime(target_year, target_month, target_day, birth_time.hour, birth_time.minute),
+                                 gender)
+    daeun_su = int(timeline["대운수"])
+    elapsed = ref_date.year - target_year - daeun_su
+    chart = SajuChart(*(int(idx) for idx in pillars), daeun_su=daeun_su, forward=bool(timeline["순행"]),
+                      daeun_nth=elapsed // 10 + 1 if elapsed >= 0 else 0,
+                      seun=int(_ganji_indices(ref_date.toordinal(), 12 * 60)[0]), seun_year=ref_date.year)
+    # 십신/지장간십신/대운목록은 SajuChart 가 네 기둥과 대운 정보에서 다시 계산합니다.
+    return chart if compact else chart.to_dict()
+
+
+def get_saju_charts(birth_datetimes, genders, ref_date: date = None) -> np.ndarray:
+    """
+    get_saju_info(..., compact=True) 의 배치판. 양력 생년월일시 배열과 성별로 CHART_DTYPE 구조화 배열을 만듭니다.
+    문자열을 만들지 않으므로 대량 차트를 분석(analyze_many)하거나 .npy 로 저장할 때 씁니다.
+    """
+    ref_date = ref_date or date.today()
+    pillars = get_ganji_indices_batch(birth_datetimes)
+    luck = get_luck_batch(birth_datetimes, genders, years=1)
+    elapsed = ref_date.year - luck["연도"][:, 0] - luck["대운수"]
+    records = np.empty(len(elapsed), dtype=CHART_DTYPE)
+    for field, key in (("year", "년주"), ("month", "월주"), ("day", "일주"), ("hour", "시주")):
+        records[field] = pillars[key]
+    records["daeun_su"], records["forward"] = luck["대운수"], luck["순행"]
+    records["daeun_nth"] = np.where(elapsed >= 0, elapsed // 10 + 1, 0)
+    records["seun"], records["seun_year"] = _ganji_indices(ref_date.toordinal(), 12 * 60)[0], ref_date.year
+    return records
+
+
+# --------------------------------------------------
+# 조건식 등록부: "함수명(인자)" 형식의 규칙 조건을 지식 베이스 로드 시점에 한 번 파싱해 호출 가능한 객체로 만듭니다.
+# --------------------------------------------------
+_CONDITION_PATTERN = re.compile(r"^\s*(\w+)\s*\(\s*([^()]*?)\s*\)\s*$")
+
+# 함수명 → (단일 판정 함수, 열 단위 판정 함수)
+CONDITION_REGISTRY: Dict[str, tuple] = {}
+
+
+def register_condition(name: str, many: Callable = None):
+    """
+    규칙 조건 함수를 등록하는 데코레이터.
+    func(saju_info, 인자) -> bool 이고, many(saju_infos, 인자) -> bool 배열을 주면 배치 평가 때 열 단위로 사용합니다.
+    """
+    def decorator(func):
+        CONDITION_REGISTRY[name] = (func, many)
+        return func
+    return decorator
+
+
+class CompiledCondition:
+    """파싱이 끝난 규칙 조건 하나. 단일 차트(__call__)와 차트 묶음(evaluate_many) 평가를 지원합니다."""
+    __slots__ = ("source", "func", "many", "arg")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.func, self.many, self.arg = None, None, None
+        match = _CONDITION_PATTERN.match(source) if isinstance(source, str) else None
+        if match and match.group(1) in CONDITION_REGISTRY:
+            self.func, self.many = CONDITION_REGISTRY[match.group(1)]
+            self.arg = match.group(2)
+
+    def __call__(self, saju_info: dict) -> bool:
+        # 등록되지 않은 조건은 항상 거짓입니다.
+        return self.func is not None and bool(self.func(saju_info, self.arg))
+
+    def evaluate_many(self, saju_infos: List[dict]) -> np.ndarray:
+        """saju_infos: 딕셔너리/SajuChart 목록 또는 CHART_DTYPE 구조화 배열."""
+        if self.func is None:
+            return np.zeros(len(saju_infos), dtype=bool)
+        if self.many is not None:
+            return np.asarray(self.many(saju_infos, self.arg), dtype=bool)
+        if isinstance(saju_infos, np.ndarray):
+            saju_infos = unpack(saju_infos)
+        return np.fromiter((bool(self.func(info, self.arg)) for info in saju_infos), dtype=bool, count=len(saju_infos))
+
+
+@lru_cache(maxsize=None)
+def compile_condition(condition: str) -> CompiledCondition:
+    """같은 조건 문자열은 한 번만 파싱해 공유합니다."""
+    return CompiledCondition(condition)
+
+
+def _jiji_index(char) -> int:
+    """한글(자) 또는 한자(子) 지지를 0~11 인덱스로 바꿉니다. 알 수 없으면 -1."""
+    if not char:
+        return -1
+    index = JIJI.find(char)
+    return index if index >= 0 else JIJI_HANJA.find(char)
+
+
+def _is_bad_luck_many(saju_infos: List[dict], target: str) -> np.ndarray:
+    if len(saju_infos) and is_compact(saju_infos):
+        return _is_bad_luck_records(as_records(saju_infos), target)
+    if target == "원국":
+        counts = np.fromiter((info.get('십신', []).count('편관') for info in saju_infos), dtype=np.int64,
+                             count=len(saju_infos))
+        return counts >= 2
+    if target == "대운":
+        daeun_jiji = np.fromiter((_jiji_index(info.get('대운', {}).get('지지')) for info in saju_infos),
+                                 dtype=np.int64, count=len(saju_infos))
+        ilji_jiji = np.fromiter((_jiji_index(info.get('원국', {}).get('일주', '  ')[1]) for info in saju_infos),
+                                dtype=np.int64, count=len(saju_infos))
+        return (daeun_jiji == 0) & (ilji_jiji == 6)  # 대운 子 + 일지 午 → 子午沖
+    return np.zeros(len(saju_infos), dtype=bool)
+
+
+_PYEONGWAN = SIPSIN_ORDER.index("편관")
+
+
+def _is_bad_luck_records(records: np.ndarray, target: str) -> np.ndarray:
+    """_is_bad_luck_many 의 정수 경로: 십신 이름 대신 조회표 인덱스로 셉니다."""
+    if target == "원국":
+        stems, branches = chart_arrays(records)
+        day = stems[:, 1:2]
+        # 십신 목록과 같은 일곱 글자 (일간 제외, 지지는 본기)
+        sipsin = np.concatenate([SIPSIN_STEM[day, stems[:, [0, 2, 3]]], SIPSIN_BRANCH[day, branches]], axis=1)
+        return (sipsin == _PYEONGWAN).sum(axis=1) >= 2
+    if target == "대운":
+        daeun = daeun_pillars(records)
+        return (daeun >= 0) & (daeun % 12 == 0) & (records["day"] % 12 == 6)
+    return np.zeros(len(records), dtype=bool)
+
+
+@register_condition("is_bad_luck", many=_is_bad_luck_many)
+def is_bad_luck(saju_info: dict, target: str) -> bool:
+    if target == "원국":
+        return saju_info.get('십신', []).count('편관') >= 2
+    if target == "대운":
+        daeun_jiji = _jiji_index(saju_info.get('대운', {}).get('지지'))
+        ilji_jiji = _jiji_index(saju_info.get('원국', {}).get('일주', '  ')[1])
+        return daeun_jiji == 0 and ilji_jiji == 6
+    return False
+
+
+def _chart_indices(saju_info) -> tuple:
+    """saju_info 또는 SajuChart → (천간 4개, 지지 4개) 인덱스 (시일월년). 원국이 없거나 시주를 모르면 그 글자는 -1."""
+    return saju_info.indices() if isinstance(saju_info, SajuChart) else chart_indices(saju_info)
+
+
+def _chart_arrays(saju_infos: List[dict]):
+    """saju_info 목록(또는 SajuChart 목록/구조화 배열) → (n, 4) 천간/지지 인덱스 배열 (시일월년)."""
+    if is_compact(saju_infos):
+        return chart_arrays(as_records(saju_infos))
+    indices = [_chart_indices(info) for info in saju_infos]
+    stems = np.array([s for s, _ in indices], dtype=np.int64).reshape(-1, 4)
+    branches = np.array([b for _, b in indices], dtype=np.int64).reshape(-1, 4)
+    return stems, branches
+
+
+def _has_interaction_many(saju_infos: List[dict], name: str) -> np.ndarray:
+    if not len(saju_infos):
+        return np.zeros(0, dtype=bool)
+    result = interactions_batch(*_chart_arrays(saju_infos))
+    return result.get(name, np.zeros(len(saju_infos), dtype=bool))
+
+
+@register_condition("has_interaction", many=_has_interaction_many)
+def has_interaction(saju_info: dict, name: str) -> bool:
+    """원국 안에 관계(六合, 三合, 沖, 刑, 破, 穿, 墓, 天干合 ...)가 있는지. 예: has_interaction(沖)"""
+    # 차트 하나는 배열을 만들지 않고 describe_interactions 의 관계 이름으로 봅니다. (interactions_batch 와 이름이 같음)
+    return name in describe_interactions(*_chart_indices(saju_info))
 
 
 class SajuAnalyzer:
-    # (SajuAnalyzer 클래스 내의 다른 로직은 이전과 동일하게 유지)
     def __init__(self, knowledge_base: dict):
         self.kb = knowledge_base
-        self.saju_info = {}
-
-    def _check_condition(self, condition: str) -> bool:
-        if condition == "is_bad_luck(원국)":
-            return self.saju_info.get('십신', []).count('편관') >= 2
-        if condition == "is_bad_luck(대운)":
-            daeun_jiji = self.saju_info.get('대운', {}).get('지지')
-            ilji_jiji = self.saju_info.get('원국',{}).get('일주','  ')[1]
-            return daeun_jiji == '子' and ilji_jiji == '午'
-        return False
+        self.compile_rules()
+
+    def compile_rules(self):
+        """수리해석규칙/응기 규칙의 조건식을 미리 파싱합니다. self.kb 를 바꾼 뒤에는 다시 호출해야 합니다."""
+        self._suam_rules = [
+            (rule, [compile_condition(cond) for cond in rule["조건"]])
+            for rule in self.kb.get("수리해석규칙", {}).get("응기", [])
+        ]
+
+    def _check_condition(self, condition: str, saju_info: dict) -> bool:
+        return compile_condition(condition)(saju_info)
 
     def analyze(self, saju_info: dict) -> dict:
-        self.saju_info = saju_info
-        analysis_report = {"saju_info": saju_info, "triggered_rules": [], "interpretation_text": []}
+        triggered = [rule for rule, conditions in self._suam_rules if all(cond(saju_info) for cond in conditions)]
+        return self._build_report(saju_info, triggered)
+
+    def analyze_many(self, charts: List[dict]) -> List[dict]:
+        """
+        여러 차트를 한 번에 분석합니다. 규칙에 쓰인 조건식마다 전체 차트에 대한 참/거짓 열을 한 번씩 계산한 뒤
+        규칙별로 열들을 AND 하여 발동 여부를 구합니다. 인스턴스 상태를 바꾸지 않으므로 여러 스레드에서 호출해도 됩니다.
+        charts 가 CHART_DTYPE 구조화 배열이면 조건은 배열 그대로 평가하고, 보고서의 saju_info 는 SajuChart 입니다.
+        """
+        batch = charts if isinstance(charts, np.ndarray) and charts.dtype == CHART_DTYPE else list(charts)
+        charts = unpack(batch) if batch is charts else batch
+        columns = {}
+        rule_masks = []
+        for rule, conditions in self._suam_rules:
+            mask = np.ones(len(charts), dtype=bool)
+            for cond in conditions:
+                if cond.source not in columns:
+                    columns[cond.source] = cond.evaluate_many(batch)
+                mask &= columns[cond.source]
+            rule_masks.append(mask)
+
+        # 보고서의 합충형파해묘도 차트마다 따로 찾지 않고 배치 한 번의 관계 비트에서 풀어 씁니다.
+        interactions = describe_interactions_batch(*_chart_arrays(batch)) if len(charts) else []
+        reports = []
+        for i, saju_info in enumerate(charts):
+            triggered = [rule for (rule, _), mask in zip(self._suam_rules, rule_masks) if mask[i]]
+            reports.append(self._build_report(saju_info, triggered, interactions[i]))
+        return reports
+
+    def _build_report(self, saju_info: dict, triggered_suam_rules: List[dict], interactions: Dict = None) -> dict:
+        if interactions is None:
+            interactions = self._check_interactions(saju_info)
+        analysis_report = {"saju_info": saju_info, "triggered_rules": [], "interpretation_text": [],
+                           "interactions": interactions}
         
         # 격국 분석
         gyukguk_result = self._find_gyukguk(saju_info)
         if gyukguk_result:
             analysis_report["triggered_rules"].append(gyukguk_result)
-            analysis_report["interpretation_text"].append(f"## 🧧 격국 분석\n- **{gyukguk_result['이름']}**: {gyukguk_result['정의']}")
+            analysis_report["interpretation_text"].append(f"## 🧧 격국 분석\n- **{gyukguk_result['이름']}**: {gyukguk_result.get('정의', '')}")
         
         # 규칙 분석
-        suam_rules = self.kb.get("수리해석규칙", {})
         triggered_suam_interpretations = []
-        for rule in suam_rules.get("응기", []):
-            all_conditions_met = all(self._check_condition(cond) for cond in rule["조건"])
-            if all_conditions_met:
-                triggered_suam_interpretations.append(f"- **{rule['이름']}**: {rule['결과']}")
-                analysis_report["triggered_rules"].append(rule)
+        for rule in triggered_suam_rules:
+            triggered_suam_interpretations.append(f"- **{rule['이름']}**: {rule['결과']}")
+            analysis_report["triggered_rules"].append(rule)
         
         if triggered_suam_interpretations:
             analysis_report["interpretation_text"].append("\n## 🔮 수리 관법 적용")
@@ -127,5 +463,7 @@ class SajuAnalyzer:
         return {}
 
     def _check_interactions(self, saju_info: Dict) -> Dict:
-        # 이 함수는 analyze 메소드 내에서 현재 직접 호출되지 않으므로, 필요시 로직을 추가/수정해야 합니다.
-        return {}
\ No newline at end of file
+        """원국의 합충형파해묘. {"沖": ["일지-시지 子午"], "三合": ["申子辰"], ...} (있는 관계만)"""
+        if not isinstance(saju_info, SajuChart) and "원국" not in saju_info:
+            return {}
+        return describe_interactions(*_chart_indices(saju_info))
\ No newline at end of file
@@ -0,0 +1,388 @@
+# 파일 경로: modules/case_index.py
+
+import hashlib
+import heapq
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from modules.keyword_matcher import KeywordRules
+from modules.kb_storage import journal_path, read_knowledge_file
+from modules.rules_config import CASE_HEADER
+
+CASE_INDEX_PATH = "case_index.db"
+KB_PATH = "knowledge_base.json"
+
+# 팔자 8글자의 위치 (사례 원문 표기 순서: 시일월년, 천간 줄 다음 지지 줄)
+PILLAR_POSITIONS = ("시간", "일간", "월간", "년간", "시지", "일지", "월지", "년지")
+STEM_LINE = re.compile(r"^([甲乙丙丁戊己庚辛壬癸?]{4})(?![甲乙丙丁戊己庚辛壬癸])")
+BRANCH_LINE = re.compile(r"^([子丑寅卯辰巳午未申酉戌亥?]{4})(?![子丑寅卯辰巳午未申酉戌亥])")
+UNKNOWN_CHAR = "?"  # 원문에서 읽을 수 없는 글자 (색인하지 않음)
+
+# 태그: 표기 → 대표 태그. 한글/한자 표기를 하나로 모읍니다.
+TAG_ALIASES = {
+    "傷官": "傷官", "상관": "傷官", "食神": "食神", "식신": "食神", "食傷": "食傷",
+    "正官": "正官", "정관": "正官", "偏官": "偏官", "편관": "偏官",
+    "正財": "正財", "偏財": "偏財", "財星": "財星", "官星": "官星", "印星": "印星",
+    "比肩": "比肩", "劫財": "劫財",
+    "穿": "穿", "沖": "沖", "合": "合", "刑": "刑", "破": "破", "害": "害",
+    "入墓": "入墓", "입묘": "入墓", "墓庫": "墓庫", "伏吟": "伏吟",
+    "空亡": "공망", "공망": "공망", "虛透": "허투", "허투": "허투",
+    "귀격": "귀격", "적포": "적포", "제압": "제압",
+}
+GYEOK_NAME = re.compile(r"[一-鿿]{2,6}格")  # 土金傷官格, 食神生財格 ...
+TOKEN_RUN = re.compile(r"[가-힣]+|[一-鿿⼀-⿕]+|[A-Za-z0-9]+")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TAG_RULES = KeywordRules(TAG_ALIASES.items())
+
+
+class Case(NamedTuple):
+    """지식 항목 하나에서 잘라낸 사례(또는 사례 머리말 앞의 해설) 조각."""
+    entry: str          # "주제/항목키"
+    seq: int            # 항목 안에서의 순번
+    kind: str           # "사례" 또는 "해설"
+    title: str
+    charts: Tuple[str, ...]  # 시간일간월간년간시지일지월지년지 8글자 ('?' 는 미상)
+    tags: Tuple[str, ...]
+    text: str
+
+
+# 1. 사례 파싱
+def _lines(content: str) -> List[str]:
+    return [line.strip() for line in content.splitlines() if line.strip()]
+
+
+def extract_charts(lines: List[str]) -> Tuple[str, ...]:
+    """천간 4글자 줄 바로 다음에 지지 4글자 줄이 오면 팔자 하나로 봅니다. (쌍둥이 사례처럼 여러 개일 수 있음)"""
+    charts = []
+    for line, following in zip(lines, lines[1:]):
+        stems = STEM_LINE.match(line)
+        if stems:
+            branches = BRANCH_LINE.match(following)
+            if branches:
+                charts.append(stems.group(1) + branches.group(1))
+    return tuple(charts)
+
+
+def extract_tags(text: str) -> Tuple[str, ...]:
+    tags = set(_TAG_RULES.all([text]))
+    tags.update(GYEOK_NAME.findall(text))
+    return tuple(sorted(tags))
+
+
+def parse_cases(entry: str, content: str) -> List[Case]:
+    """항목 본문을 <사례 N> 머리말 기준으로 나눕니다. 머리말 앞부분은 '해설' 조각이 됩니다."""
+    segments: List[List[str]] = []
+    for line in _lines(content):
+        if CASE_HEADER.match(line) or not segments:
+            segments.append([])
+        segments[-1].append(line)
+    cases = []
+    for seq, lines in enumerate(segments):
+        text = "\n".join(lines)
+        kind = "사례" if CASE_HEADER.match(lines[0]) else "해설"
+        cases.append(Case(entry, seq, kind, lines[0], extract_charts(lines), extract_tags(text), text))
+    return cases
+
+
+def iter_entries(knowledge: dict) -> Iterator[Tuple[str, str]]:
+    """지식 딕셔너리의 (항목 키, 본문) 을 내보냅니다. {주제: {"sub_topics": {키: {"content": ...}}}} 형식."""
+    for topic, value in (knowledge or {}).items():
+        if not isinstance(value, dict):
+            continue
+        for key, item in (value.get("sub_topics") or {}).items():
+            content = item.get("content") if isinstance(item, dict) else item
+            if isinstance(content, str) and content.strip():
+                yield f"{topic}/{key}", content
+
+
+def iter_cases(knowledge: dict) -> Iterator[Case]:
+    for entry, content in iter_entries(knowledge):
+        yield from parse_cases(entry, content)
+
+
+# 2. 토큰화
+def document_tokens(text: str) -> List[str]:
+    """한글/한자 연속 구간은 한 글자와 두 글자(bigram) 모두, 영문/숫자는 단어 단위(소문자)로."""
+    tokens = []
+    for run in TOKEN_RUN.findall(text):
+        if run.isascii():
+            tokens.append(run.lower())
+        else:
+            tokens.extend(run)
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def query_tokens(text: str) -> List[str]:
+    """검색어는 bigram 으로 (한 글자 구간은 그 글자로) 나눕니다. 순서를 유지하고 중복은 뺍니다."""
+    tokens = []
+    for run in TOKEN_RUN.findall(text):
+        if run.isascii():
+            tokens.append(run.lower())
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return list(dict.fromkeys(tokens))
+
+
+def _pillar_postings(charts: Iterable[str]) -> Set[Tuple[int, str]]:
+    return {(pos, char) for chart in charts for pos, char in enumerate(chart) if char != UNKNOWN_CHAR}
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# 3. 색인
+class CaseIndex:
+    """
+    사례 역색인 (SQLite). 팔자 위치별 글자, 태그, 본문 토큰 → 사례 번호 목록을 디스크에 보관합니다.
+    항목별 내용 해시를 함께 저장해, update() 는 바뀐 항목만 다시 색인합니다.
+    DB 는 처음 조회/갱신할 때 엽니다.
+
+    find(query) 문법 (공백으로 구분된 조건은 모두 만족, '|' 는 또는, 앞의 '-' 는 제외):
+      일간:戊  월지:未         팔자 위치별 글자
+      팔자:己戊丁壬未申未子     8글자 (또는 천간 4글자), '?' 는 아무 글자
+      #傷官  #공망            태그
+      회계                    본문에 포함된 문자열
+    """
+
+    def __init__(self, path: str = CASE_INDEX_PATH):
+        self.path = path
+        self._con: Optional[sqlite3.Connection] = None
+        self._stats: Optional[Tuple[int, float]] = None
+        self._lengths: Optional[Dict[int, int]] = None  # 사례 번호 → 토큰 수 (BM25 길이 정규화)
+
+    @property
+    def con(self) -> sqlite3.Connection:
+        if self._con is None:
+            self._con = sqlite3.connect(self.path, check_same_thread=False)
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (entry TEXT PRIMARY KEY, hash TEXT NOT NULL) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS cases (
+                    id INTEGER PRIMARY KEY, entry TEXT NOT NULL, seq INTEGER NOT NULL, kind TEXT NOT NULL,
+                    title TEXT NOT NULL, charts TEXT NOT NULL, tags TEXT NOT NULL, length INTEGER NOT NULL,
+                    text TEXT NOT NULL);
+                CREATE INDEX IF NOT EXISTS idx_cases_entry ON cases (entry);
+                CREATE TABLE IF NOT EXISTS pillar_postings (
+                    pos INTEGER, char TEXT, case_id INTEGER, PRIMARY KEY (pos, char, case_id)) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS tag_postings (
+                    tag TEXT, case_id INTEGER, PRIMARY KEY (tag, case_id)) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS term_postings (
+                    term TEXT, case_id INTEGER, tf INTEGER NOT NULL, PRIMARY KEY (term, case_id)) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+            """)
+        return self._con
+
+    def __len__(self) -> int:
+        return self.con.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+    def close(self):
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+
+    # --- 갱신 ---
+    def update(self, knowledge: dict) -> Dict[str, int]:
+        """지식 딕셔너리와 색인을 맞춥니다. 반환: {"added", "updated", "removed", "unchanged"} 항목 수"""
+        con = self.con
+        known = dict(con.execute("SELECT entry, hash FROM entries"))
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        term_rows: List[Tuple[str, int, int]] = []
+        with con:
+            for entry, content in iter_entries(knowledge):
+                digest = _content_hash(content)
+                old = known.pop(entry, None)
+                if old == digest:
+                    counts["unchanged"] += 1
+                    continue
+                if old is not None:
+                    self._remove_entry(entry)
+                for case in parse_cases(entry, content):
+                    self._add_case(case, term_rows)
+                con.execute("INSERT OR REPLACE INTO entries (entry, hash) VALUES (?, ?)", (entry, digest))
+                counts["updated" if old is not None else "added"] += 1
+            for entry in known:  # 지식에서 사라진 항목
+                self._remove_entry(entry)
+                con.execute("DELETE FROM entries WHERE entry = ?", (entry,))
+                counts["removed"] += 1
+            # 본문 토큰 게시는 모아서 (term, case_id) 순으로 넣습니다. B-tree 에 차례로 붙어 무작위 삽입보다 훨씬 빠릅니다.
+            term_rows.sort()
+            con.executemany("INSERT INTO term_postings VALUES (?, ?, ?)", term_rows)
+        if counts["added"] or counts["updated"] or counts["removed"]:
+            self._stats = None
+            self._lengths = None
+        return counts
+
+    def update_from_file(self, kb_path: str = KB_PATH) -> Optional[Dict[str, int]]:
+        """지식 파일(+저널)이 마지막 색인 이후 바뀌었을 때만 읽어서 갱신합니다. 바뀌지 않았으면 None."""
+        signature = repr([(s.st_mtime_ns, s.st_size) if s else None
+                          for s in (_stat(kb_path), _stat(journal_path(kb_path)))])
+        row = self.con.execute("SELECT value FROM meta WHERE key = ?", (kb_path,)).fetchone()
+        if row and row[0] == signature:
+            return None
+        knowledge, _ = read_knowledge_file(kb_path)
+        counts = self.update(knowledge or {})
+        with self.con:
+            self.con.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (kb_path, signature))
+        return counts
+
+    def _add_case(self, case: Case, term_rows: List[Tuple[str, int, int]]):
+        tokens = Counter(document_tokens(case.text))
+        cur = self.con.execute(
+            "INSERT INTO cases (entry, seq, kind, title, charts, tags, length, text) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (case.entry, case.seq, case.kind, case.title, " ".join(case.charts), " ".join(case.tags),
+             sum(tokens.values()), case.text))
+        case_id = cur.lastrowid
+        self.con.executemany("INSERT INTO pillar_postings VALUES (?, ?, ?)",
+                             [(pos, char, case_id) for pos, char in _pillar_postings(case.charts)])
+        self.con.executemany("INSERT INTO tag_postings VALUES (?, ?)", [(tag, case_id) for tag in case.tags])
+        term_rows.extend((term, case_id, tf) for term, tf in tokens.items())
+
+    def _remove_entry(self, entry: str):
+        # 게시 목록은 (키, 사례 번호) 순으로만 정렬돼 있으므로, 저장된 본문에서 키를 다시 만들어 지웁니다.
+        rows = self.con.execute("SELECT id, charts, tags, text FROM cases WHERE entry = ?", (entry,)).fetchall()
+        for case_id, charts, tags, text in rows:
+            self.con.executemany("DELETE FROM pillar_postings WHERE pos = ? AND char = ? AND case_id = ?",
+                                 [(pos, char, case_id) for pos, char in _pillar_postings(charts.split())])
+            self.con.executemany("DELETE FROM tag_postings WHERE tag = ? AND case_id = ?",
+                                 [(tag, case_id) for tag in tags.split()])
+            self.con.executemany("DELETE FROM term_postings WHERE term = ? AND case_id = ?",
+                                 [(term, case_id) for term in set(document_tokens(text))])
+        self.con.execute("DELETE FROM cases WHERE entry = ?", (entry,))
+
+    # --- 조회 ---
+    def _ids(self, sql: str, params) -> Set[int]:
+        return {row[0] for row in self.con.execute(sql, params)}
+
+    def _all_ids(self) -> Set[int]:
+        return self._ids("SELECT id FROM cases", ())
+
+    def _pillar_ids(self, pos: int, char: str) -> Set[int]:
+        return self._ids("SELECT case_id FROM pillar_postings WHERE pos = ? AND char = ?", (pos, char))
+
+    def _atom_ids(self, atom: str, within: Optional[Set[int]] = None) -> Set[int]:
+        if atom.startswith("#"):
+            tag = TAG_ALIASES.get(atom[1:], atom[1:])
+            return self._ids("SELECT case_id FROM tag_postings WHERE tag = ?", (tag,))
+        field, sep, value = atom.partition(":")
+        if sep and field == "팔자":
+            ids = None
+            for pos, char in enumerate(value):
+                if char not in (UNKNOWN_CHAR, "."):
+                    ids = self._pillar_ids(pos, char) if ids is None else ids & self._pillar_ids(pos, char)
+            return self._all_ids() if ids is None else ids
+        if sep and field in PILLAR_POSITIONS:
+            return self._pillar_ids(PILLAR_POSITIONS.index(field), value)
+        # 본문 문자열: bigram 게시 목록의 교집합을 후보로 잡고, 실제 포함 여부를 본문으로 확인합니다.
+        tokens = query_tokens(atom)
+        ids = within
+        for token in tokens:
+            postings = self._ids("SELECT case_id FROM term_postings WHERE term = ?", (token,))
+            ids = postings if ids is None else ids & postings
+            if not ids:
+                return set()
+        if not tokens:
+            return set()
+        if tokens == [atom] and not atom.isascii():
+            return ids  # 한두 글자 한글/한자: 게시 목록이 곧 정답
+        return {case_id for case_id, text in self._texts(ids) if atom in text}
+
+    @staticmethod
+    def _is_structural(atom: str) -> bool:
+        field, sep, _ = atom.partition(":")
+        return atom.startswith("#") or bool(sep and (field == "팔자" or field in PILLAR_POSITIONS))
+
+    def _texts(self, ids: Iterable[int]) -> List[Tuple[int, str]]:
+        ids = list(ids)
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows += self.con.execute(f"SELECT id, text FROM cases WHERE id IN ({','.join('?' * len(chunk))})",
+                                     chunk).fetchall()
+        return rows
+
+    def find(self, query: str) -> List[int]:
+        """불리언 조회. 조건을 모두 만족하는 사례 번호를 오름차순으로 반환합니다."""
+        include, exclude = [], []
+        for clause in query.split():
+            negated = clause.startswith("-") and len(clause) > 1
+            atoms = [atom for atom in clause[1 if negated else 0:].split("|") if atom]
+            (exclude if negated else include).append(atoms)
+        # 팔자/태그 조건을 먼저, 그중 대안이 적은 것부터 (보통 더 좁음). 본문 조건은 좁혀진 후보 안에서만 확인합니다.
+        include.sort(key=lambda atoms: (not all(map(self._is_structural, atoms)), len(atoms)))
+        result: Optional[Set[int]] = None
+        for atoms in include:
+            ids = set().union(*(self._atom_ids(atom, result) for atom in atoms))
+            result = ids if result is None else result & ids
+            if not result:
+                return []
+        if result is None:
+            result = self._all_ids()
+        for atoms in exclude:
+            for atom in atoms:
+                result -= self._atom_ids(atom, result)
+        return sorted(result)
+
+    def _collection_stats(self) -> Tuple[int, float]:
+        if self._stats is None:
+            self._lengths = dict(self.con.execute("SELECT id, length FROM cases"))
+            count = len(self._lengths)
+            self._stats = (count, sum(self._lengths.values()) / count if count else 0.0)
+        return self._stats
+
+    def search(self, text: str, k: int = 10, where: str = None) -> List[Tuple[int, float]]:
+        """BM25 순위 검색. 검색어 토큰 중 하나라도 포함한 사례를 점수순으로 k 개. where 는 find 조건으로 범위 제한."""
+        count, avg_length = self._collection_stats()
+        allowed = set(self.find(where)) if where else None
+        if not count or allowed == set():
+            return []
+        lengths = self._lengths
+        scores: Dict[int, float] = {}
+        for token in query_tokens(text):
+            postings = self.con.execute("SELECT case_id, tf FROM term_postings WHERE term = ?", (token,)).fetchall()
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for case_id, tf in postings:
+                if allowed is not None and case_id not in allowed:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[case_id] / avg_length)
+                scores[case_id] = scores.get(case_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def get(self, ids: Iterable[int]) -> List[Case]:
+        """사례 번호 → Case (요청한 순서대로)."""
+        ids = list(ids)
+        rows = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for row in self.con.execute(
+                    "SELECT id, entry, seq, kind, title, charts, tags, text FROM cases "
+                    f"WHERE id IN ({','.join('?' * len(chunk))})", chunk):
+                rows[row[0]] = Case(row[1], row[2], row[3], row[4], tuple(row[5].split()), tuple(row[6].split()),
+                                    row[7])
+        return [rows[i] for i in ids if i in rows]
+
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def open_case_index(kb_path: str = KB_PATH, index_path: str = CASE_INDEX_PATH) -> CaseIndex:
+    """지식 파일에 맞춰 갱신된 색인을 엽니다. (바뀐 항목만 다시 색인)"""
+    index = CaseIndex(index_path)
+    index.update_from_file(kb_path)
+    return index
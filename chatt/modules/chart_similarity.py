@@ -0,0 +1,178 @@
+# 파일 경로: modules/chart_similarity.py
+
+import json
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.case_index import Case, iter_cases
+from modules.ganji_tables import (BRANCH_ELEMENT, SIPSIN_BRANCH, SIPSIN_STEM, STEM_ELEMENT, ChartLike,
+                                  chart_indices)
+
+# 관계별 칸 번호 (쌍의 어느 글자로 찾아도 같은 칸)
+STEM_COMBINE_SLOT = np.arange(10) % 5                            # 甲己 乙庚 丙辛 丁壬 戊癸: i 와 i+5
+BRANCH_COMBINE_SLOT = np.array([0, 0, 1, 2, 3, 4, 5, 5, 4, 3, 2, 1])  # 六合: 子丑 寅亥 卯戌 辰酉 巳申 午未 (합이 12k+1)
+BRANCH_CLASH_SLOT = np.arange(12) % 6                            # 沖: i 와 i+6
+BRANCH_HARM_SLOT = np.array([0, 1, 2, 3, 3, 2, 1, 0, 4, 5, 5, 4])     # 穿(害): 子未 丑午 寅巳 卯辰 申亥 酉戌
+BRANCH_HARM_PARTNER = (7 - np.arange(12)) % 12
+ELEMENT_LEVELS = 5  # 오행별 글자 수 0, 1, 2, 3, 4 이상
+
+# 특징 벡터 구성: (이름, 폭, 가중치). 모든 칸은 0/1 이고, 유사도는 가중치를 곱한 내적입니다.
+FEATURE_LAYOUT: Tuple[Tuple[str, int, float], ...] = (
+    ("일간", 10, 4.0),
+    ("천간위치", 40, 1.0),   # 시일월년 × 10
+    ("지지위치", 48, 1.0),   # 시일월년 × 12
+    ("천간", 10, 0.5),
+    ("지지", 12, 1.0),
+    ("오행", 5 * ELEMENT_LEVELS, 0.5),
+    ("십신", 10, 1.0),       # 비견 겁재 식신 상관 편재 정재 편관 정관 편인 정인
+    ("천간합", 5, 1.0),
+    ("六合", 6, 1.0),
+    ("沖", 6, 1.5),
+    ("穿", 6, 1.5),
+)
+FEATURE_OFFSETS = {}
+FEATURE_WIDTH = 0
+for _name, _width, _ in FEATURE_LAYOUT:
+    FEATURE_OFFSETS[_name] = FEATURE_WIDTH
+    FEATURE_WIDTH += _width
+FEATURE_WEIGHTS = np.concatenate([np.full(width, weight, dtype=np.float32) for _, width, weight in FEATURE_LAYOUT])
+
+LIBRARY_PATH = "chart_library"  # chart_library.npy (특징 행렬) + chart_library.json (사례 정보)
+
+def encode_charts(stems, branches) -> np.ndarray:
+    """
+    (n, 4) 천간/지지 인덱스 배열을 (n, FEATURE_WIDTH) float32 특징 행렬로 만듭니다. 차트별 반복문 없이 계산합니다.
+    -1(미상) 글자는 어떤 칸도 켜지 않습니다.
+    """
+    stems = np.asarray(stems, dtype=np.int64).reshape(-1, 4)
+    branches = np.asarray(branches, dtype=np.int64).reshape(-1, 4)
+    n = len(stems)
+    out = np.zeros((n, FEATURE_WIDTH), dtype=np.float32)
+    rows = np.arange(n)[:, None]
+    stem_known, branch_known = stems >= 0, branches >= 0
+    s, b = np.where(stem_known, stems, 0), np.where(branch_known, branches, 0)
+
+    def set_bits(name, columns, mask):
+        columns = np.broadcast_to(columns, mask.shape)
+        out[np.broadcast_to(rows, mask.shape)[mask], FEATURE_OFFSETS[name] + columns[mask]] = 1.0
+
+    day = s[:, 1]
+    set_bits("일간", day[:, None], stem_known[:, 1:2])
+    set_bits("천간위치", np.arange(4) * 10 + s, stem_known)
+    set_bits("지지위치", np.arange(4) * 12 + b, branch_known)
+    set_bits("천간", s, stem_known)
+    set_bits("지지", b, branch_known)
+
+    elements = np.concatenate([np.where(stem_known, STEM_ELEMENT[s], -1),
+                               np.where(branch_known, BRANCH_ELEMENT[b], -1)], axis=1)
+    counts = np.stack([(elements == e).sum(axis=1) for e in range(5)], axis=1)
+    out[rows, FEATURE_OFFSETS["오행"] + np.arange(5) * ELEMENT_LEVELS + np.minimum(counts, ELEMENT_LEVELS - 1)] = 1.0
+
+    # 십신: 일간 자신은 빼고, 지지는 본기 기준 (ganji_tables 조회표)
+    others = [0, 2, 3]
+    sipsin = np.concatenate([SIPSIN_STEM[day[:, None], s[:, others]], SIPSIN_BRANCH[day[:, None], b]], axis=1)
+    other_known = np.concatenate([stem_known[:, others], branch_known], axis=1) & stem_known[:, 1:2]
+    set_bits("십신", sipsin.astype(np.int64), other_known)
+
+    # 합충: 원국 네 기둥 사이의 글자 쌍
+    for i in range(4):
+        for j in range(i + 1, 4):
+            si, sj, bi, bj = s[:, i], s[:, j], b[:, i], b[:, j]
+            stems_known = stem_known[:, i] & stem_known[:, j]
+            branches_known = branch_known[:, i] & branch_known[:, j]
+            set_bits("천간합", STEM_COMBINE_SLOT[si][:, None], (stems_known & ((si - sj) % 10 == 5))[:, None])
+            set_bits("六合", BRANCH_COMBINE_SLOT[bi][:, None], (branches_known & ((bi + bj) % 12 == 1))[:, None])
+            set_bits("沖", BRANCH_CLASH_SLOT[bi][:, None], (branches_known & ((bi - bj) % 12 == 6))[:, None])
+            set_bits("穿", BRANCH_HARM_SLOT[bi][:, None], (branches_known & (BRANCH_HARM_PARTNER[bi] == bj))[:, None])
+    return out
+
+
+def encode_chart(chart: ChartLike) -> np.ndarray:
+    stems, branches = chart_indices(chart)
+    return encode_charts([stems], [branches])[0]
+
+
+class SimilarCase(NamedTuple):
+    score: float   # 0~1 (질의 차트 자신과의 유사도를 1 로 정규화)
+    row: int
+    entry: str
+    seq: int
+    title: str
+    chart: str
+
+
+class ChartLibrary:
+    """
+    사례 팔자들의 특징 행렬 (행 = 팔자 하나). 질의 차트와의 가중 내적을 행렬-벡터 곱 한 번으로 구해 상위 k 개를 고릅니다.
+    save() 로 .npy/.json 에 저장하고 load(mmap=True) 로 행렬을 메모리 매핑해 열 수 있습니다.
+    """
+
+    def __init__(self, matrix: np.ndarray, entries: List[str], seqs: List[int], titles: List[str], charts: List[str]):
+        self.matrix = matrix
+        self.entries, self.seqs, self.titles, self.charts = entries, seqs, titles, charts
+
+    def __len__(self) -> int:
+        return len(self.charts)
+
+    @classmethod
+    def from_cases(cls, cases: Iterable[Case]) -> "ChartLibrary":
+        """사례 목록(case_index.parse_cases / CaseIndex.get 결과)으로 만듭니다. 팔자가 여러 개인 사례는 팔자마다 한 행."""
+        entries, seqs, titles, charts = [], [], [], []
+        for case in cases:
+            for chart in case.charts:
+                entries.append(case.entry)
+                seqs.append(case.seq)
+                titles.append(case.title)
+                charts.append(chart)
+        indices = [chart_indices(chart) for chart in charts]
+        matrix = encode_charts([s for s, _ in indices] or np.empty((0, 4)), [b for _, b in indices] or np.empty((0, 4)))
+        return cls(matrix, entries, seqs, titles, charts)
+
+    @classmethod
+    def from_knowledge(cls, knowledge: dict) -> "ChartLibrary":
+        return cls.from_cases(iter_cases(knowledge))
+
+    def save(self, path: str = LIBRARY_PATH):
+        np.save(path + ".npy", np.ascontiguousarray(self.matrix, dtype=np.float32))
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump({"layout": [list(item) for item in FEATURE_LAYOUT], "entries": self.entries, "seqs": self.seqs,
+                       "titles": self.titles, "charts": self.charts}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str = LIBRARY_PATH, mmap: bool = True) -> Optional["ChartLibrary"]:
+        """저장된 라이브러리를 엽니다. 특징 구성이 지금 코드와 다르면 None (다시 만들어야 함)."""
+        with open(path + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        if [tuple(item) for item in meta["layout"]] != list(FEATURE_LAYOUT):
+            return None
+        matrix = np.load(path + ".npy", mmap_mode="r" if mmap else None)
+        return cls(matrix, meta["entries"], meta["seqs"], meta["titles"], meta["charts"])
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        """(m, FEATURE_WIDTH) 질의 특징 → (m, n) 유사도. 질의 자신과의 점수로 나눠 0~1 로 맞춥니다."""
+        weighted = np.atleast_2d(queries) * FEATURE_WEIGHTS
+        self_scores = (weighted * np.atleast_2d(queries)).sum(axis=1, keepdims=True)
+        return (weighted @ self.matrix.T) / np.maximum(self_scores, 1e-9)
+
+    def top_k_many(self, charts: Sequence[ChartLike], k: int = 10) -> List[List[SimilarCase]]:
+        """여러 차트를 한 번에 조회합니다. (행렬 곱 한 번)"""
+        indices = [chart_indices(chart) for chart in charts]
+        queries = encode_charts([s for s, _ in indices], [b for _, b in indices])
+        if not len(self) or not len(queries):
+            return [[] for _ in indices]
+        scores = self.scores(queries)
+        k = min(k, len(self))
+        results = []
+        for row_scores in scores:
+            # k 번째 점수 이상인 행을 모두 모은 뒤 (동점 포함) 점수 내림차순, 같으면 행 순서로 k 개
+            kth = -np.partition(-row_scores, k - 1)[k - 1]
+            top = np.flatnonzero(row_scores >= kth)
+            top = top[np.lexsort((top, -row_scores[top]))][:k]
+            results.append([SimilarCase(float(row_scores[i]), int(i), self.entries[i], self.seqs[i], self.titles[i],
+                                        self.charts[i]) for i in top])
+        return results
+
+    def top_k(self, chart: ChartLike, k: int = 10) -> List[SimilarCase]:
+        """차트(사례 표기 8글자 또는 get_saju_info 결과)와 구조가 가장 비슷한 사례 k 개."""
+        return self.top_k_many([chart], k)[0]
@@ -0,0 +1,155 @@
+# 파일 경로: modules/classify_cache.py
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Callable, Dict, List, Sequence
+
+CACHE_DB_PATH = "classify_cache.db"  # jobs.db 옆에 둡니다.
+MAX_ENTRIES = 200_000                # 이보다 많아지면 가장 오래 안 쓴 항목부터 지웁니다. (LRU)
+EVICT_FRACTION = 0.05                # 넘치면 MAX_ENTRIES 의 이 비율만큼 더 지워, 지우는 횟수를 줄입니다.
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_paragraph(text: str) -> str:
+    """판본마다 다른 줄바꿈/공백/유니코드 조합형 차이를 없앱니다."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(paragraph: str, categories: Sequence[str], model_id: str) -> str:
+    """hash(정규화된 문단, 정렬된 카테고리 집합, 모델 id)"""
+    payload = "\x1f".join([normalize_paragraph(paragraph), "\x1e".join(sorted(set(categories))), model_id])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ClassificationCache:
+    """
+    문단 분류 결과를 SQLite 에 저장하는 내용 주소(content-addressed) 캐시.
+    classify() 는 배치 안의 중복 문단을 먼저 합치고, 캐시에 없는 문단만 모델에 보냅니다.
+    """
+
+    def __init__(self, db_path: str = CACHE_DB_PATH, max_entries: int = MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute('''
+            CREATE TABLE IF NOT EXISTS classify_cache (
+                key TEXT PRIMARY KEY,
+                label TEXT NOT NULL,
+                last_used REAL NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        self._con.execute("CREATE INDEX IF NOT EXISTS idx_classify_cache_last_used ON classify_cache (last_used)")
+        # 항목 수를 따로 들고 다녀 넣을 때마다 전체를 세지 않습니다. (없을 때 한 번만 셈)
+        self._con.execute(
+            "CREATE TABLE IF NOT EXISTS classify_cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._con.execute("INSERT OR IGNORE INTO classify_cache_meta (name, value) "
+                          "SELECT 'entries', COUNT(*) FROM classify_cache")
+        self._con.commit()
+        self._totals = {"hits": 0, "misses": 0, "batch_duplicates": 0, "inference_seconds": 0.0}
+        self.last_stats: Dict[str, float] = {}
+
+    def classify(self, paragraphs: List[str], categories: List[str], model_id: str,
+                 classify_fn: Callable[[List[str], List[str]], List]) -> List:
+        """캐시를 거쳐 분류합니다. classify_fn(문단들, 카테고리) 는 캐시에 없는 고유 문단에만 호출됩니다."""
+        keys = [cache_key(p, categories, model_id) for p in paragraphs]
+        unique: Dict[str, str] = {}
+        for key, para in zip(keys, paragraphs):
+            unique.setdefault(key, para)
+
+        labels = self._get_many(list(unique))
+        missing = [key for key in unique if key not in labels]
+        inference_seconds = 0.0
+        if missing:
+            start = time.perf_counter()
+            results = classify_fn([unique[key] for key in missing], categories)
+            inference_seconds = time.perf_counter() - start
+            fresh = dict(zip(missing, results))
+            labels.update(fresh)
+            # 오류 메시지 같은, 카테고리에 없는 결과는 저장하지 않습니다.
+            self._put_many({key: label for key, label in fresh.items() if self._is_valid(label, categories)})
+
+        hits = len(unique) - len(missing)
+        per_paragraph = inference_seconds / len(missing) if missing else 0.0
+        self.last_stats = {
+            "paragraphs": len(paragraphs),
+            "hits": hits,
+            "misses": len(missing),
+            "batch_duplicates": len(paragraphs) - len(unique),
+            "inference_seconds": inference_seconds,
+            # 캐시 적중 + 배치 내 중복 문단만큼 모델 시간을 아꼈다고 추정합니다.
+            "estimated_saved_seconds": per_paragraph * (len(paragraphs) - len(missing)),
+        }
+        with self._lock:
+            self._totals["hits"] += hits
+            self._totals["misses"] += len(missing)
+            self._totals["batch_duplicates"] += len(paragraphs) - len(unique)
+            self._totals["inference_seconds"] += inference_seconds
+        return [labels[key] for key in keys]
+
+    def stats(self) -> Dict[str, float]:
+        """이 객체를 만든 뒤 누적된 적중/실패 통계와 현재 캐시 크기. (크기는 다른 worker 가 넣은 항목까지 셉니다)"""
+        with self._lock:
+            totals = dict(self._totals)
+            totals["entries"] = self._entries()
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_rate"] = totals["hits"] / lookups if lookups else 0.0
+        return totals
+
+    def close(self):
+        self._con.close()
+
+    @staticmethod
+    def _is_valid(label, categories: List[str]) -> bool:
+        if isinstance(label, list):
+            return all(item in categories for item in label)
+        return label in categories
+
+    def _entries(self) -> int:
+        return self._con.execute("SELECT value FROM classify_cache_meta WHERE name = 'entries'").fetchone()[0]
+
+    def _get_many(self, keys: List[str]) -> Dict[str, object]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._con.execute(
+                    f"SELECT key, label FROM classify_cache WHERE key IN ({placeholders})", batch).fetchall()
+                found.update((key, json.loads(label)) for key, label in rows)
+            if found:
+                now = time.time()
+                self._con.executemany("UPDATE classify_cache SET last_used = ? WHERE key = ?",
+                                      [(now, key) for key in found])
+                self._con.commit()
+        return found
+
+    def _put_many(self, labels: Dict[str, object]):
+        if not labels:
+            return
+        now = time.time()
+        with self._lock:
+            # 여러 worker 프로세스가 같은 캐시를 쓰므로 항목 수는 DB 의 classify_cache_meta 에 두고,
+            # 쓰기 잠금(IMMEDIATE)을 잡은 트랜잭션 안에서 실제로 넣고 지운 행 수만큼 고칩니다.
+            self._con.execute("BEGIN IMMEDIATE")
+            try:
+                entries = self._entries() + self._con.executemany(
+                    "INSERT OR IGNORE INTO classify_cache (key, label, last_used) VALUES (?, ?, ?)",
+                    [(key, json.dumps(label, ensure_ascii=False), now) for key, label in labels.items()]).rowcount
+                if entries > self.max_entries:
+                    excess = entries - self.max_entries + int(self.max_entries * EVICT_FRACTION)
+                    entries -= self._con.execute(
+                        "DELETE FROM classify_cache WHERE key IN "
+                        "(SELECT key FROM classify_cache ORDER BY last_used LIMIT ?)", (excess,)).rowcount
+                self._con.execute("UPDATE classify_cache_meta SET value = ? WHERE name = 'entries'", (entries,))
+                self._con.commit()
+            except BaseException:
+                self._con.rollback()
+                raise
@@ -1,38 +1,33 @@
 # 파일 경로: modules/db_handler.py
 
-import json
 import os
-import streamlit as st
+
+from modules import kb_storage
+from modules.kb_loader import KnowledgeLoader
 
 KNOWLEDGE_DIR = "knowledge" # 지식 파일들이 있는 폴더 경로
+SAVE_MODE = os.environ.get("KB_SAVE_MODE", "journal") # "journal" 또는 "rewrite"
+COMPACT_THRESHOLD_BYTES = 1024 * 1024 # 저널이 이보다 커지면 백그라운드 압축
+
+# 파일별 (mtime, size) 캐시를 가진 로더. streamlit 캐시와 무관하게 바뀐 파일만 다시 읽습니다.
+_loader = KnowledgeLoader(KNOWLEDGE_DIR)
+
+def get_loader() -> KnowledgeLoader:
+    """핫 리로드(start_polling/on_change)가 필요한 프로세스에서 공유 로더를 가져옵니다."""
+    return _loader
 
-@st.cache_data
 def load_kb(): # 👈 이름을 다시 load_kb로 통일했습니다.
-    """'knowledge' 폴더 안의 모든 .json 파일을 읽어 하나의 딕셔너리로 통합합니다."""
-    print(f">> '{KNOWLEDGE_DIR}' 폴더에서 모든 지식 파일을 로드합니다...")
-    
-    combined_knowledge = {}
-    if not os.path.exists(KNOWLEDGE_DIR):
-        os.makedirs(KNOWLEDGE_DIR)
-        return {}
-        
-    for filename in os.listdir(KNOWLEDGE_DIR):
-        if filename.endswith('.json'):
-            file_path = os.path.join(KNOWLEDGE_DIR, filename)
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    # 파일이 비어있는 경우를 대비
-                    content = f.read()
-                    if content:
-                        data = json.loads(content)
-                        combined_knowledge.update(data)
-            except (json.JSONDecodeError, FileNotFoundError):
-                print(f"경고: '{filename}' 파일을 읽는 데 실패했습니다.")
-                continue
-    return combined_knowledge
+    """'knowledge' 폴더 안의 모든 .json 파일을 읽어 하나의 딕셔너리로 통합합니다. (바뀐 파일만 다시 파싱)"""
+    return _loader.load()
 
-def save_kb(data_to_save: dict, target_filename: str): # 👈 저장 함수 이름도 간단하게 통일했습니다.
-    """새로운 지식 데이터를 지정된 파일에 병합하여 저장합니다."""
+def save_kb(data_to_save: dict, target_filename: str, mode: str = None): # 👈 저장 함수 이름도 간단하게 통일했습니다.
+    """
+    새로운 지식 데이터를 지정된 파일에 병합하여 저장합니다.
+    - "journal" (기본): 파일 옆의 저널(.json.journal)에 한 줄 덧붙이고 fsync. 파일 크기와 무관하게 빠릅니다.
+      저널이 COMPACT_THRESHOLD_BYTES 를 넘으면 백그라운드에서 정식 .json 으로 압축합니다.
+    - "rewrite": 저장 즉시 정식 .json 을 임시 파일 + rename 으로 원자적으로 다시 씁니다.
+    """
+    mode = mode or SAVE_MODE
     if not os.path.exists(KNOWLEDGE_DIR):
         os.makedirs(KNOWLEDGE_DIR)
 
@@ -40,25 +35,22 @@ def save_kb(data_to_save: dict, target_filename: str): # 👈 저장 함수 이
         target_filename += '.json'
     
     file_path = os.path.join(KNOWLEDGE_DIR, target_filename)
-    
-    existing_data = {}
-    if os.path.exists(file_path):
-        with open(file_path, 'r', encoding='utf-8') as f:
-            try:
-                existing_data = json.load(f)
-            except json.JSONDecodeError:
-                existing_data = {}
-    
-    # 기존 데이터에 새로운 데이터를 병합
-    for category, content in data_to_save.items():
-        if category not in existing_data:
-            existing_data[category] = content
-        elif isinstance(existing_data.get(category), dict):
-            existing_data[category].update(content)
-        elif isinstance(existing_data.get(category), list):
-            existing_data[category].extend(content)
 
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(existing_data, f, ensure_ascii=False, indent=2)
+    # 기존 데이터와의 병합은 읽을 때(또는 압축할 때) 이루어집니다.
+    kb_storage.append_journal(file_path, data_to_save)
+    if mode == "rewrite":
+        kb_storage.compact(file_path)
+    elif os.path.getsize(kb_storage.journal_path(file_path)) > COMPACT_THRESHOLD_BYTES:
+        kb_storage.compact_in_background(file_path)
 
-    st.cache_data.clear()
\ No newline at end of file
+def compact_kb(target_filename: str = None):
+    """저널을 정식 .json 파일에 합칩니다. 파일명을 주지 않으면 저널이 있는 모든 파일을 압축합니다."""
+    if target_filename:
+        if not target_filename.endswith('.json'):
+            target_filename += '.json'
+        targets = [target_filename]
+    else:
+        targets = [name[:-len(kb_storage.JOURNAL_SUFFIX)] for name in os.listdir(KNOWLEDGE_DIR)
+                   if name.endswith('.json' + kb_storage.JOURNAL_SUFFIX)]
+    for filename in targets:
+        kb_storage.compact(os.path.join(KNOWLEDGE_DIR, filename))
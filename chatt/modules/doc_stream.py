@@ -0,0 +1,87 @@
+# 파일 경로: modules/doc_stream.py
+
+import codecs
+import re
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+TXT_BLOCK_SIZE = 1024 * 1024  # txt 파일을 읽는 단위 (바이트)
+
+# 빈 줄(공백만 있는 줄 포함)이 문단 구분자입니다.
+PARAGRAPH_SEPARATOR = re.compile(r'\n\s*\n')
+
+
+def _detect_txt_encoding(filepath: str) -> str:
+    """파일 전체를 메모리에 올리지 않고 utf-8 로 읽히는지 확인합니다. 아니면 cp949."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with open(filepath, 'rb') as f:
+            while block := f.read(TXT_BLOCK_SIZE):
+                decoder.decode(block)
+        decoder.decode(b'', final=True)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def iter_text_pieces(filepath: str) -> Iterator[str]:
+    """
+    문서의 텍스트를 조각(PDF 는 페이지, DOCX 는 문단, TXT 는 블록) 단위로 내보냅니다.
+    조각들을 이어 붙이면 전체 텍스트와 같습니다. 지원하지 않는 형식이면 아무것도 내보내지 않습니다.
+    """
+    # PDF/DOCX 파서는 해당 형식을 읽을 때만 import 합니다. (txt 만 처리하는 worker 의 시작 시간 단축)
+    if filepath.endswith('.pdf'):
+        from PyPDF2 import PdfReader
+        with open(filepath, 'rb') as f:
+            for page in PdfReader(f).pages:
+                yield page.extract_text() or ""
+    elif filepath.endswith('.docx'):
+        import docx
+        for i, para in enumerate(docx.Document(filepath).paragraphs):
+            yield para.text if i == 0 else "\n" + para.text
+    elif filepath.endswith('.txt'):
+        encoding = _detect_txt_encoding(filepath)
+        decoder = codecs.getincrementaldecoder(encoding)(errors='ignore')
+        with open(filepath, 'rb') as f:
+            while block := f.read(TXT_BLOCK_SIZE):
+                yield decoder.decode(block)
+        yield decoder.decode(b'', final=True)
+
+
+def iter_paragraphs(pieces: Iterable[str]) -> Iterator[str]:
+    """
+    텍스트 조각 스트림을 문단 단위로 나눕니다. re.split(r'\\n\\s*\\n', 전체텍스트) 후 strip 한 결과와 같으며,
+    조각 경계에 걸친 구분자도 올바르게 처리합니다. 메모리에는 마지막 미완성 문단만 남습니다.
+    """
+    buffer = ""
+    for piece in pieces:
+        # 이전 버퍼는 끝의 공백 부분만 다시 훑습니다. 그 앞에는 구분자가 없음을 이미 확인했고,
+        # 조각 경계에 걸친 구분자는 공백으로만 이뤄지므로 이 공백 부분 안에서 시작합니다.
+        scan_from = len(buffer)
+        while scan_from and buffer[scan_from - 1].isspace():
+            scan_from -= 1
+        buffer += piece
+        start = 0
+        for match in PARAGRAPH_SEPARATOR.finditer(buffer, scan_from):
+            if match.end() == len(buffer):
+                break  # 구분자가 다음 조각까지 이어질 수 있으므로 보류
+            para = buffer[start:match.start()].strip()
+            if para:
+                yield para
+            start = match.end()
+        buffer = buffer[start:]
+    para = buffer.strip()
+    if para:
+        yield para
+
+
+def iter_document_paragraphs(filepath: str, skip: int = 0) -> Iterator[str]:
+    """문서의 문단을 앞에서부터 내보냅니다. skip 개는 건너뜁니다. (재시작 시 이어서 처리)"""
+    return islice(iter_paragraphs(iter_text_pieces(filepath)), skip, None)
+
+
+def chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """size 개씩 묶어 내보냅니다."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -0,0 +1,271 @@
+# 파일 경로: modules/ganji_tables.py
+
+import ast
+import os
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+# 천간/지지의 오행·음양, 십신 이름은 지식 파일(knowledge/ohaeng.json)에서 읽습니다.
+# 이 파일은 JSON 이 아니라 파이썬 리터럴 대입문이므로 ast 로 값만 꺼냅니다. (코드를 실행하지 않음)
+OHAENG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "knowledge", "ohaeng.json")
+
+CHEONGAN = "갑을병정무기경신임계"
+JIJI = "자축인묘진사오미신유술해"
+CHEONGAN_HANJA = "甲乙丙丁戊己庚辛壬癸"
+JIJI_HANJA = "子丑寅卯辰巳午未申酉戌亥"
+SIPSIN_ORDER = ("비견", "겁재", "식신", "상관", "편재", "정재", "편관", "정관", "편인", "정인")
+POSITIONS = ("시", "일", "월", "년")  # 차트 배열의 기둥 순서 (사례 표기와 같은 시일월년)
+PILLAR_KEYS = ("시주", "일주", "월주", "년주")  # 원국 딕셔너리의 키, 같은 순서
+
+
+def load_ohaeng(path: str = OHAENG_PATH) -> Dict[str, object]:
+    """ohaeng.json 의 최상위 대입문(NAME = 리터럴)을 {NAME: 값} 으로 읽습니다."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    values = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            values[node.targets[0].id] = ast.literal_eval(node.value)
+    return values
+
+
+_OHAENG = load_ohaeng()
+ELEMENTS = tuple(_OHAENG["OHANG_RELATIONS"])  # 목 화 토 금 수
+STEM_ELEMENT = np.array([ELEMENTS.index(_OHAENG["CHEONGAN"][c]["오행"]) for c in CHEONGAN_HANJA], dtype=np.int8)
+STEM_YANG = np.array([_OHAENG["CHEONGAN"][c]["음양"] == "양" for c in CHEONGAN_HANJA])
+BRANCH_ELEMENT = np.array([ELEMENTS.index(_OHAENG["JIJI"][c]["오행"]) for c in JIJI_HANJA], dtype=np.int8)
+BRANCH_YANG = np.array([_OHAENG["JIJI"][c]["음양"] == "양" for c in JIJI_HANJA])
+
+# 지장간 (여기, 중기, 정기 순. 없는 칸은 -1). 마지막 유효 칸이 본기(정기)입니다.
+HIDDEN_STEMS = np.array([
+    [8, -1, 9],   # 子: 壬 癸
+    [9, 7, 5],    # 丑: 癸 辛 己
+    [4, 2, 0],    # 寅: 戊 丙 甲
+    [0, -1, 1],   # 卯: 甲 乙
+    [1, 9, 4],    # 辰: 乙 癸 戊
+    [4, 6, 2],    # 巳: 戊 庚 丙
+    [2, 5, 3],    # 午: 丙 己 丁
+    [3, 1, 5],    # 未: 丁 乙 己
+    [4, 8, 6],    # 申: 戊 壬 庚
+    [6, -1, 7],   # 酉: 庚 辛
+    [7, 3, 4],    # 戌: 辛 丁 戊
+    [4, 0, 8],    # 亥: 戊 甲 壬
+], dtype=np.int8)
+
+
+def _relation(day_element: int, other_element: int) -> str:
+    """일간 오행에서 본 상대 오행의 관계 (OHANG_RELATIONS 의 생/극으로 판단)."""
+    relations = _OHAENG["OHANG_RELATIONS"]
+    me, other = ELEMENTS[day_element], ELEMENTS[other_element]
+    if me == other:
+        return "비견"
+    if relations[me]["생"] == other:
+        return "식상"
+    if relations[me]["극"] == other:
+        return "재성"
+    if relations[other]["극"] == me:
+        return "관성"
+    return "인성"
+
+
+def _sipsin_index(day_element: int, day_yang: bool, element: int, yang: bool) -> int:
+    # SIPSIN_NAMES 의 '양' 은 일간과 음양이 같은 경우(비견·식신·편재·편관·편인)입니다.
+    name = _OHAENG["SIPSIN_NAMES"][(_relation(day_element, element), "양" if day_yang == yang else "음")]
+    return SIPSIN_ORDER.index(name)
+
+
+# 십신 조회표: [일간, 천간] / [일간, 지지(본기)] / [일간, 지지, 지장간 칸] (-1 은 지장간 없음)
+SIPSIN_STEM = np.array([[_sipsin_index(STEM_ELEMENT[d], STEM_YANG[d], STEM_ELEMENT[s], STEM_YANG[s])
+                         for s in range(10)] for d in range(10)], dtype=np.int8)
+# 지지는 본기(정기) 천간으로 봅니다. 子午巳亥는 지지 자체의 음양과 본기의 음양이 반대입니다. (子: 양수, 본기 癸)
+SIPSIN_BRANCH = SIPSIN_STEM[:, HIDDEN_STEMS[:, 2]]
+SIPSIN_HIDDEN = np.where(HIDDEN_STEMS[None, :, :] >= 0, SIPSIN_STEM[:, np.maximum(HIDDEN_STEMS, 0)], -1).astype(np.int8)
+
+# --- 합충형파해묘: 관계마다 비트 하나 ---
+INTERACTIONS = ("六合", "半合", "沖", "刑", "破", "穿", "墓")
+BIT = {name: 1 << i for i, name in enumerate(INTERACTIONS)}
+TRIPLES = {  # 세 지지가 모두 있을 때 (12비트 지지 집합 마스크로 검사)
+    "三合": ("申子辰", "亥卯未", "寅午戌", "巳酉丑"),
+    "三刑": ("寅巳申", "丑戌未"),
+}
+STEM_INTERACTIONS = ("天干合", "天干沖")
+TOMB_BRANCH = {0: 7, 1: 10, 2: 4, 3: 1, 4: 4}  # 오행 → 묘고: 木未 火戌 土辰 金丑 水辰
+
+
+def _pairs(names: str) -> List[Tuple[int, int]]:
+    return [(JIJI_HANJA.index(a), JIJI_HANJA.index(b)) for a, b in names.split()]
+
+
+def _build_pair_table() -> np.ndarray:
+    table = np.zeros((12, 12), dtype=np.uint16)
+
+    def mark(name, pairs):
+        for a, b in pairs:
+            table[a, b] |= BIT[name]
+            table[b, a] |= BIT[name]
+
+    mark("六合", _pairs("子丑 寅亥 卯戌 辰酉 巳申 午未"))
+    mark("半合", [(a, b) for triple in TRIPLES["三合"] for a, b in _pairs(f"{triple[:2]} {triple[1:]}")])
+    mark("沖", [(i, i + 6) for i in range(6)])
+    mark("刑", _pairs("寅巳 巳申 寅申 丑戌 戌未 丑未 子卯 辰辰 午午 酉酉 亥亥"))
+    mark("破", _pairs("子酉 卯午 巳申 寅亥 丑辰 戌未"))
+    mark("穿", _pairs("子未 丑午 寅巳 卯辰 申亥 酉戌"))
+    # 墓: 묘고(辰戌丑未)가 아닌 지지가 자기 오행의 묘고를 만나는 경우 (寅未, 子辰 ...)
+    mark("墓", [(b, TOMB_BRANCH[BRANCH_ELEMENT[b]]) for b in range(12) if b not in (1, 4, 7, 10)])
+    return table
+
+
+PAIR_TABLE = _build_pair_table()
+TRIPLE_MASKS = {name: np.array([sum(1 << JIJI_HANJA.index(c) for c in triple) for triple in triples], dtype=np.uint16)
+                for name, triples in TRIPLES.items()}
+STEM_PAIR_TABLE = np.zeros((10, 10), dtype=np.uint8)
+for _a in range(10):
+    STEM_PAIR_TABLE[_a, (_a + 5) % 10] |= 1    # 天干合: 甲己 乙庚 丙辛 丁壬 戊癸
+for _a in range(4):
+    STEM_PAIR_TABLE[_a, _a + 6] |= 2           # 天干沖: 甲庚 乙辛 丙壬 丁癸
+    STEM_PAIR_TABLE[_a + 6, _a] |= 2
+# 천간 入墓: 천간 오행의 묘고 지지
+STEM_TOMB = np.array([TOMB_BRANCH[e] for e in STEM_ELEMENT], dtype=np.int8)
+
+POSITION_PAIRS = tuple((i, j) for i in range(4) for j in range(i + 1, 4))
+# 차트 하나씩 볼 때(describe_interactions)는 numpy 스칼라 인덱싱보다 리스트가 빠릅니다.
+_PAIR_LIST, _STEM_PAIR_LIST, _STEM_TOMB_LIST = PAIR_TABLE.tolist(), STEM_PAIR_TABLE.tolist(), STEM_TOMB.tolist()
+
+
+ChartLike = Union[str, dict, Tuple[Sequence[int], Sequence[int]]]
+
+
+def _find(hangul: str, hanja: str, char: str) -> int:
+    index = hangul.find(char)
+    return index if index >= 0 else hanja.find(char)
+
+
+def chart_indices(chart: ChartLike) -> Tuple[List[int], List[int]]:
+    """
+    차트를 (천간 4개, 지지 4개) 인덱스로 바꿉니다. 순서는 시일월년, 모르는 글자는 -1.
+    chart: 사례 표기 8글자('己戊丁壬未申未子'), get_saju_info 결과(dict), 또는 (천간, 지지) 인덱스.
+    """
+    if isinstance(chart, dict):
+        pillars = chart.get("원국", chart)
+        chart = "".join(pillars.get(key, "??")[0] for key in PILLAR_KEYS) + \
+                "".join(pillars.get(key, "??")[1] for key in PILLAR_KEYS)
+    if isinstance(chart, str):
+        stems = [_find(CHEONGAN, CHEONGAN_HANJA, c) for c in chart[:4]]
+        branches = [_find(JIJI, JIJI_HANJA, c) for c in chart[4:8]]
+        return stems + [-1] * (4 - len(stems)), branches + [-1] * (4 - len(branches))
+    stems, branches = chart
+    return list(stems), list(branches)
+
+
+def sipsin_batch(stems, branches) -> Dict[str, np.ndarray]:
+    """
+    (n, 4) 천간/지지 인덱스 → 십신 인덱스 (SIPSIN_ORDER 기준). 모르는 글자(-1)나 일간을 모르는 차트의 칸은 -1.
+      천간 (n, 4) (일간 자리는 비견) / 지지 (n, 4) 본기 / 지장간 (n, 4, 3) (-1 은 빈 칸)
+    """
+    stems, branches = np.asarray(stems), np.asarray(branches)
+    day = stems[:, 1:2]
+    # -1 로 조회표를 인덱싱하면 마지막 칸(癸/亥)이 되므로 0 으로 바꿔 찾은 뒤 지웁니다.
+    day_known, stem_known, branch_known = day >= 0, stems >= 0, branches >= 0
+    d, s, b = np.maximum(day, 0), np.maximum(stems, 0), np.maximum(branches, 0)
+    return {"천간": np.where(day_known & stem_known, SIPSIN_STEM[d, s], -1).astype(np.int8),
+            "지지": np.where(day_known & branch_known, SIPSIN_BRANCH[d, b], -1).astype(np.int8),
+            "지장간": np.where((day_known & branch_known)[:, :, None],
+                             SIPSIN_HIDDEN[d[:, :, None], b[:, :, None], np.arange(3)], -1).astype(np.int8)}
+
+
+def interactions_batch(stems, branches) -> Dict[str, np.ndarray]:
+    """
+    (n, 4) 천간/지지 인덱스 → 관계별 결과. 조회표를 인덱싱만 하므로 분기 없이 차트 수에 비례합니다.
+    모르는 글자(-1, 예: 시주 미상)는 어떤 관계에도 들지 않습니다.
+      pair_bits (n, 6) uint16: POSITION_PAIRS 순서의 지지 쌍별 비트 (BIT 참고)
+      stem_bits (n, 6) uint8: 천간 쌍별 비트 (1 天干合, 2 天干沖)
+      branch_set (n,) uint16: 있는 지지의 12비트 집합
+      stem_tomb (n, 4, 4) bool: [천간 자리, 지지 자리] 천간이 그 지지에 入墓
+      관계 이름 → (n,) bool: INTERACTIONS, 三合, 三刑, 天干合, 天干沖, 天干入墓
+    """
+    stems, branches = np.asarray(stems), np.asarray(branches)
+    stem_known, branch_known = stems >= 0, branches >= 0
+    s, b = np.maximum(stems, 0), np.maximum(branches, 0)  # -1 은 0 으로 찾은 뒤 아래에서 지웁니다.
+    i, j = np.array(POSITION_PAIRS).T
+    pair_bits = np.where(branch_known[:, i] & branch_known[:, j], PAIR_TABLE[b[:, i], b[:, j]], 0).astype(np.uint16)
+    stem_bits = np.where(stem_known[:, i] & stem_known[:, j], STEM_PAIR_TABLE[s[:, i], s[:, j]], 0).astype(np.uint8)
+    any_bits = np.bitwise_or.reduce(pair_bits, axis=1)
+    branch_set = np.bitwise_or.reduce(np.where(branch_known, np.left_shift(1, b), 0).astype(np.uint16), axis=1)
+    stem_tomb = ((STEM_TOMB[s][:, :, None] == b[:, None, :])
+                 & stem_known[:, :, None] & branch_known[:, None, :])
+    result = {"pair_bits": pair_bits, "stem_bits": stem_bits, "branch_set": branch_set, "stem_tomb": stem_tomb}
+    for name in INTERACTIONS:
+        result[name] = (any_bits & BIT[name]) != 0
+    for name, masks in TRIPLE_MASKS.items():
+        result[name] = ((branch_set[:, None] & masks) == masks).any(axis=1)
+    stem_any = np.bitwise_or.reduce(stem_bits, axis=1)
+    result["天干合"] = (stem_any & 1) != 0
+    result["天干沖"] = (stem_any & 2) != 0
+    result["天干入墓"] = stem_tomb.any(axis=(1, 2))
+    return result
+
+
+def describe_interactions_batch(stems, branches, result: Dict[str, np.ndarray] = None) -> List[Dict[str, List[str]]]:
+    """
+    차트마다 describe_interactions 와 같은 결과의 목록. 관계는 interactions_batch 결과(result, 이미 계산했으면 넘기세요)의
+    비트에서 읽고, 관계가 하나라도 있는 차트만 글자로 풀어 씁니다.
+    """
+    stems, branches = np.asarray(stems), np.asarray(branches)
+    if result is None:
+        result = interactions_batch(stems, branches)
+    triple_hits = {name: (result["branch_set"][:, None] & masks) == masks for name, masks in TRIPLE_MASKS.items()}
+    has_any = (result["pair_bits"].any(axis=1) | result["stem_bits"].any(axis=1) | result["天干入墓"]
+               | np.logical_or.reduce([hits.any(axis=1) for hits in triple_hits.values()]))
+    described: List[Dict[str, List[str]]] = [{} for _ in range(len(stems))]
+    for k in np.flatnonzero(has_any).tolist():
+        found = described[k]
+        chart_stems, chart_branches = stems[k].tolist(), branches[k].tolist()
+        for (i, j), bits, stem_bits in zip(POSITION_PAIRS, result["pair_bits"][k].tolist(), result["stem_bits"][k].tolist()):
+            for name in INTERACTIONS:
+                if bits & BIT[name]:
+                    found.setdefault(name, []).append(
+                        f"{POSITIONS[i]}지-{POSITIONS[j]}지 {JIJI_HANJA[chart_branches[i]]}{JIJI_HANJA[chart_branches[j]]}")
+            for bit, name in zip((1, 2), STEM_INTERACTIONS):
+                if stem_bits & bit:
+                    found.setdefault(name, []).append(
+                        f"{POSITIONS[i]}간-{POSITIONS[j]}간 {CHEONGAN_HANJA[chart_stems[i]]}{CHEONGAN_HANJA[chart_stems[j]]}")
+        for name, hits in triple_hits.items():
+            for triple, hit in zip(TRIPLES[name], hits[k].tolist()):
+                if hit:
+                    found.setdefault(name, []).append(triple)
+        for i, j in zip(*np.nonzero(result["stem_tomb"][k])):
+            found.setdefault("天干入墓", []).append(
+                f"{POSITIONS[i]}간-{POSITIONS[j]}지 {CHEONGAN_HANJA[chart_stems[i]]}{JIJI_HANJA[chart_branches[j]]}")
+    return described
+
+
+def describe_interactions(stems: List[int], branches: List[int]) -> Dict[str, List[str]]:
+    """
+    차트 하나의 관계를 사람이 읽는 형태로: {"沖": ["일지-시지 子午"], "三合": ["申子辰"], ...} (있는 것만)
+    모르는 글자(-1)가 낀 관계는 건너뜁니다. 여러 차트는 describe_interactions_batch 를 쓰세요.
+    """
+    found: Dict[str, List[str]] = {}
+    for i, j in POSITION_PAIRS:
+        if branches[i] >= 0 and branches[j] >= 0:
+            bits = _PAIR_LIST[branches[i]][branches[j]]
+            for name in INTERACTIONS:
+                if bits & BIT[name]:
+                    found.setdefault(name, []).append(
+                        f"{POSITIONS[i]}지-{POSITIONS[j]}지 {JIJI_HANJA[branches[i]]}{JIJI_HANJA[branches[j]]}")
+        if stems[i] >= 0 and stems[j] >= 0:
+            for bit, name in zip((1, 2), STEM_INTERACTIONS):
+                if _STEM_PAIR_LIST[stems[i]][stems[j]] & bit:
+                    found.setdefault(name, []).append(
+                        f"{POSITIONS[i]}간-{POSITIONS[j]}간 {CHEONGAN_HANJA[stems[i]]}{CHEONGAN_HANJA[stems[j]]}")
+    present = {branch for branch in branches if branch >= 0}
+    for name, triples in TRIPLES.items():
+        for triple in triples:
+            if all(JIJI_HANJA.index(c) in present for c in triple):
+                found.setdefault(name, []).append(triple)
+    for i, stem in enumerate(stems):
+        for j, branch in enumerate(branches):
+            if stem >= 0 and branch >= 0 and _STEM_TOMB_LIST[stem] == branch:
+                found.setdefault("天干入墓", []).append(
+                    f"{POSITIONS[i]}간-{POSITIONS[j]}지 {CHEONGAN_HANJA[stem]}{JIJI_HANJA[branch]}")
+    return found
@@ -0,0 +1,205 @@
+# 파일 경로: modules/job_metrics.py
+
+import cProfile
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+# 처리 단계 (job_spans.stage). 시간은 배타 시간입니다: split 시간에는 그 안에서 부른 extract 시간이 빠져 있습니다.
+PIPELINE_STAGES = ("extract", "split", "classify", "db_write")
+# 작업 단위 값: total(작업 처리 전체, count=문단 수), queue_wait(등록~첫 임대), model_load(worker 의 모델 로드)
+JOB_STAGES = ("total", "queue_wait", "model_load")
+ONCE_STAGES = ("queue_wait",)  # 재시도해도 처음 값만 남깁니다. (나머지는 시도마다 더함)
+
+# 프로파일링 (opt-in). 작업 ID 목록("12,15") 또는 "*" 이면 그 작업을 처리하는 동안 프로파일을 남깁니다.
+PROFILE_ENV = "JOB_PROFILE"
+PROFILE_DIR_ENV = "JOB_PROFILE_DIR"
+PROFILER_ENV = "JOB_PROFILER"        # "cprofile"(기본, .prof) 또는 "pyinstrument"(.html)
+DEFAULT_PROFILE_DIR = "profiles"
+# 작업을 마칠 때마다 Prometheus 텍스트 파일을 갱신할 경로 (node_exporter textfile collector 용)
+METRICS_FILE_ENV = "JOB_METRICS_FILE"
+METRIC_PREFIX = "ingest"
+
+
+class StageTimer:
+    """
+    작업 하나의 단계별 시간(초)과 처리 개수. span 은 중첩될 수 있고, 안쪽 단계의 시간은 바깥 단계에서 뺍니다.
+    save() 로 jobs.db 의 job_spans 에 더합니다.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self._stack = []  # [시작 시각, 안쪽 span 시간]
+
+    @contextmanager
+    def span(self, stage: str, count: int = 0):
+        frame = [time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            self.seconds[stage] += elapsed - frame[1]
+            self.counts[stage] += count
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+    def add(self, stage: str, seconds: float, count: int = 0):
+        self.seconds[stage] += seconds
+        self.counts[stage] += count
+
+    def iterate(self, stage: str, items: Iterable) -> Iterator:
+        """items 에서 다음 값을 꺼내는 시간을 stage 로 잽니다. (지연 생성기의 추출/분할 단계용)"""
+        iterator = iter(items)
+        while True:
+            with self.span(stage):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            self.counts[stage] += 1
+            yield item
+
+    def save(self, con: sqlite3.Connection, job_id: int, worker_id: str = ""):
+        now = time.time()
+        rows = [(job_id, stage, seconds, self.counts[stage], worker_id, now) for stage, seconds in self.seconds.items()]
+        with con:
+            con.executemany(
+                "INSERT INTO job_spans (job_id, stage, seconds, count, worker, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_id, stage) DO UPDATE SET seconds = seconds + excluded.seconds, "
+                "count = count + excluded.count, worker = excluded.worker, updated_at = excluded.updated_at",
+                [row for row in rows if row[1] not in ONCE_STAGES],
+            )
+            con.executemany(
+                "INSERT OR IGNORE INTO job_spans (job_id, stage, seconds, count, worker, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [row for row in rows if row[1] in ONCE_STAGES],
+            )
+
+
+def queue_wait_seconds(con: sqlite3.Connection, job_id: int) -> Optional[float]:
+    """작업이 등록된 뒤 지금(임대 시점)까지 기다린 시간. 등록 시각이 없으면 None."""
+    row = con.execute("SELECT (julianday('now') - julianday(created_at)) * 86400 FROM knowledge_jobs WHERE id = ?",
+                      (job_id,)).fetchone()
+    return max(0.0, row[0]) if row and row[0] is not None else None
+
+
+def job_summaries(con: sqlite3.Connection, job_ids: Sequence[int]) -> List[dict]:
+    """
+    작업별 요약 (job_ids 순서). {"job_id", "paragraphs", "paragraphs_per_sec", "total", "queue_wait", "model_load",
+    "extract", "split", "classify", "db_write"} — 기록이 없는 단계는 None.
+    """
+    if not job_ids:
+        return []
+    placeholders = ",".join("?" * len(job_ids))
+    spans = defaultdict(dict)
+    for job_id, stage, seconds, count in con.execute(
+            f"SELECT job_id, stage, seconds, count FROM job_spans WHERE job_id IN ({placeholders})", list(job_ids)):
+        spans[job_id][stage] = (seconds, count)
+    summaries = []
+    for job_id in job_ids:
+        stages = spans.get(job_id, {})
+        total, paragraphs = stages.get("total", (None, 0))
+        summary = {"job_id": job_id, "paragraphs": paragraphs,
+                   "paragraphs_per_sec": paragraphs / total if total else None}
+        for stage in JOB_STAGES + PIPELINE_STAGES:
+            summary[stage] = stages[stage][0] if stage in stages else None
+        summaries.append(summary)
+    return summaries
+
+
+def stage_totals(con: sqlite3.Connection) -> Dict[str, dict]:
+    """단계별 전체 합계 {stage: {"seconds", "count", "jobs"}}."""
+    return {stage: {"seconds": seconds, "count": count, "jobs": jobs}
+            for stage, seconds, count, jobs in con.execute(
+                "SELECT stage, SUM(seconds), SUM(count), COUNT(*) FROM job_spans GROUP BY stage")}
+
+
+def render_prometheus(con: sqlite3.Connection) -> str:
+    """Prometheus 텍스트 형식(exposition format 0.0.4)의 지표."""
+    totals = stage_totals(con)
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, samples):
+        lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+        for labels, value in samples:
+            label_text = "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}" if labels else ""
+            lines.append(f"{METRIC_PREFIX}_{name}{label_text} {value:g}")
+
+    metric("stage_seconds_total", "counter", "Exclusive time spent per pipeline stage",
+           [({"stage": s}, totals.get(s, {}).get("seconds") or 0.0) for s in PIPELINE_STAGES])
+    metric("stage_items_total", "counter", "Items handled per pipeline stage (pieces, paragraphs, rows)",
+           [({"stage": s}, totals.get(s, {}).get("count") or 0) for s in PIPELINE_STAGES])
+    total = totals.get("total", {})
+    metric("paragraphs_total", "counter", "Paragraphs processed", [({}, total.get("count") or 0)])
+    metric("processing_seconds_total", "counter", "Wall time spent processing jobs", [({}, total.get("seconds") or 0.0)])
+    metric("paragraphs_per_second", "gauge", "Overall throughput (paragraphs / processing seconds)",
+           [({}, (total.get("count") or 0) / total["seconds"] if total.get("seconds") else 0.0)])
+    for stage, help_text in (("queue_wait", "Time jobs waited in the queue before being claimed"),
+                             ("model_load", "Classifier model load time per worker")):
+        values = totals.get(stage, {})
+        name = f"{METRIC_PREFIX}_{stage}_seconds"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} summary",
+                  f"{name}_sum {values.get('seconds') or 0.0:g}", f"{name}_count {values.get('jobs') or 0}"]
+    metric("jobs", "gauge", "Jobs by status",
+           [({"status": status}, count) for status, count in
+            con.execute("SELECT status, COUNT(*) FROM knowledge_jobs GROUP BY status ORDER BY status")])
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(con: sqlite3.Connection, path: str):
+    """지표 파일을 임시 파일 + rename 으로 통째로 바꿉니다. (수집기가 반쯤 쓴 파일을 읽지 않도록)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_prometheus(con))
+    os.replace(tmp_path, path)
+
+
+def _profile_targets() -> Optional[set]:
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if not value:
+        return set()
+    return None if value == "*" else {item.strip() for item in value.split(",")}
+
+
+@contextmanager
+def profile_job(job_id: int):
+    """
+    PROFILE_ENV 에 job_id 가 있으면 블록을 프로파일해 PROFILE_DIR_ENV 폴더에 남기고 경로를 내줍니다. 아니면 None.
+    pyinstrument 는 설치되어 있을 때만 씁니다. (없으면 cProfile)
+    """
+    targets = _profile_targets()
+    if targets is not None and str(job_id) not in targets:
+        yield None
+        return
+    directory = os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+    os.makedirs(directory, exist_ok=True)
+    if os.environ.get(PROFILER_ENV, "cprofile") == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️ pyinstrument 가 없어 cProfile 로 프로파일합니다. ('pip install pyinstrument')")
+        else:
+            path = os.path.join(directory, f"job_{job_id}.html")
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield path
+            finally:
+                profiler.stop()
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+            return
+    path = os.path.join(directory, f"job_{job_id}.prof")
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)  # python -m pstats 또는 snakeviz 로 열기
@@ -0,0 +1,295 @@
+# 파일 경로: modules/job_queue.py
+
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DB_PATH = "jobs.db"
+LEASE_SECONDS = 300   # 작업을 가져간 worker 가 이 시간 안에 임대를 갱신하지 않으면 다른 worker 가 다시 가져갑니다.
+MAX_ATTEMPTS = 3      # 임대가 이만큼 만료된 작업(worker 를 계속 죽이는 작업)은 실패 처리합니다.
+
+# 문단별 검토 상태 (job_paragraphs.status)
+REVIEW_STATUSES = ("대기", "승인", "반려")
+DEFAULT_REVIEW_STATUS = "대기"
+# 페이지에서 수정할 수 있는 문단 열
+EDITABLE_COLUMNS = ("category", "tag", "review", "status")
+
+# 기존 jobs.db 에 없던 열: (이름, 정의)
+_MIGRATIONS = [
+    ("claimed_by", "TEXT"),
+    ("lease_expires_at", "REAL"),
+    ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+    ("chunk_size", "INTEGER"),                      # 작업을 처음 시작할 때 정한 청크 크기 (재시작해도 유지)
+    ("chunks_done", "INTEGER NOT NULL DEFAULT 0"),  # 커밋된 청크 수
+    ("progress", "INTEGER NOT NULL DEFAULT 0"),     # 분류가 끝난 문단 수
+    ("classifier_mode", "TEXT NOT NULL DEFAULT 'nli'"),  # 로컬 분류 방식 (ai_utils.CLASSIFIER_MODES)
+]
+
+
+def connect(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """WAL 모드와 잠금 대기 시간이 설정된 연결을 엽니다. (WAL 에서는 읽기가 쓰기를 막지 않습니다)"""
+    con = sqlite3.connect(db_path, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+
+def setup_database(db_path: str = DB_PATH):
+    """jobs.db 데이터베이스와 테이블을 생성하고, 예전 스키마면 필요한 열을 추가합니다."""
+    with connect(db_path) as con:
+        cur = con.cursor()
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS knowledge_jobs (
+                id INTEGER PRIMARY KEY,
+                original_filename TEXT NOT NULL,
+                saved_filepath TEXT NOT NULL,
+                categories TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                result_json TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        existing = {row[1] for row in cur.execute("PRAGMA table_info(knowledge_jobs)")}
+        for column, definition in _MIGRATIONS:
+            if column not in existing:
+                cur.execute(f"ALTER TABLE knowledge_jobs ADD COLUMN {column} {definition}")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_knowledge_jobs_status ON knowledge_jobs (status, id)")
+        # 문단별 분류 결과와 검토 상태. 청크를 커밋할 때마다 행이 추가되므로 작업이 중단돼도 커밋된 문단까지는 남고,
+        # 페이지는 필요한 구간만 (job_id, ordinal) 순서로 읽고 바뀐 행만 고쳐 씁니다.
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS job_paragraphs (
+                job_id INTEGER NOT NULL,
+                ordinal INTEGER NOT NULL,
+                paragraph TEXT NOT NULL,
+                category TEXT NOT NULL,
+                tag TEXT NOT NULL DEFAULT '',
+                review TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL DEFAULT '대기',
+                PRIMARY KEY (job_id, ordinal)
+            ) WITHOUT ROWID
+        ''')
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_job_paragraphs_status ON job_paragraphs (job_id, status, ordinal)")
+        # 작업별 단계 시간 (modules/job_metrics.py). 재시도한 작업은 시도마다 더해집니다.
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS job_spans (
+                job_id INTEGER NOT NULL,
+                stage TEXT NOT NULL,
+                seconds REAL NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                updated_at REAL,
+                PRIMARY KEY (job_id, stage)
+            ) WITHOUT ROWID
+        ''')
+        _migrate_results(cur)
+        con.commit()
+
+
+def _insert_paragraphs(cur, job_id: int, start: int, paragraphs: List[str], categories: List[str]):
+    cur.executemany(
+        "INSERT OR REPLACE INTO job_paragraphs (job_id, ordinal, paragraph, category) VALUES (?, ?, ?, ?)",
+        [(job_id, start + i, para, str(category)) for i, (para, category) in enumerate(zip(paragraphs, categories))],
+    )
+
+
+def _migrate_results(cur):
+    """예전 저장 형식(job_chunks 테이블, 완료 작업의 result_json 통째 JSON)을 job_paragraphs 로 옮깁니다."""
+    if cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_chunks'").fetchone():
+        offsets = {}
+        rows = cur.execute("SELECT job_id, paragraphs, categories FROM job_chunks ORDER BY job_id, chunk_index").fetchall()
+        for job_id, para_json, cat_json in rows:
+            paragraphs = json.loads(para_json)
+            _insert_paragraphs(cur, job_id, offsets.get(job_id, 0), paragraphs, json.loads(cat_json))
+            offsets[job_id] = offsets.get(job_id, 0) + len(paragraphs)
+        cur.execute("DROP TABLE job_chunks")
+    legacy = cur.execute(
+        "SELECT id, result_json FROM knowledge_jobs WHERE status IN ('completed', 'archived') AND result_json IS NOT NULL "
+        "AND NOT EXISTS (SELECT 1 FROM job_paragraphs WHERE job_id = knowledge_jobs.id)"
+    ).fetchall()
+    for job_id, result_json in legacy:
+        try:
+            result = json.loads(result_json)
+        except ValueError:
+            continue
+        if isinstance(result, dict) and "paragraphs" in result:
+            _insert_paragraphs(cur, job_id, 0, result["paragraphs"], result.get("categories", []))
+            cur.execute("UPDATE knowledge_jobs SET result_json = NULL WHERE id = ?", (job_id,))
+
+
+def worker_name(index: int = 0) -> str:
+    return f"{os.uname().nodename if hasattr(os, 'uname') else 'local'}:{os.getpid()}:{index}"
+
+
+def claim_job(con: sqlite3.Connection, worker_id: str,
+              lease_seconds: float = LEASE_SECONDS) -> Optional[Tuple[int, str, str, str]]:
+    """
+    대기 중인 작업(또는 임대가 만료된 실행 중 작업) 하나를 UPDATE ... RETURNING 한 문장으로 가져옵니다.
+    한 문장이므로 여러 worker 가 동시에 호출해도 같은 작업을 두 번 가져가지 않습니다.
+    반환: (job_id, saved_filepath, categories_json, classifier_mode) 또는 None
+    """
+    now = time.time()
+    # 죽은 worker 가 여러 번 남긴 작업은 더 시도하지 않습니다.
+    con.execute(
+        "UPDATE knowledge_jobs SET status = 'failed', result_json = '작업자 임대가 반복해서 만료되었습니다.' "
+        "WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?",
+        (now, MAX_ATTEMPTS),
+    )
+    row = con.execute(
+        """
+        UPDATE knowledge_jobs
+           SET status = 'running', claimed_by = ?, lease_expires_at = ?, attempts = attempts + 1
+         WHERE id = (SELECT id FROM knowledge_jobs
+                      WHERE status = 'pending' OR (status = 'running' AND lease_expires_at < ?)
+                      ORDER BY id LIMIT 1)
+        RETURNING id, saved_filepath, categories, classifier_mode
+        """,
+        (worker_id, now + lease_seconds, now),
+    ).fetchone()
+    con.commit()
+    return row
+
+
+def renew_lease(con: sqlite3.Connection, job_id: int, worker_id: str,
+                lease_seconds: float = LEASE_SECONDS) -> bool:
+    """작업 임대를 연장합니다. 이미 다른 worker 에게 넘어갔으면 False."""
+    cur = con.execute(
+        "UPDATE knowledge_jobs SET lease_expires_at = ? WHERE id = ? AND claimed_by = ? AND status = 'running'",
+        (time.time() + lease_seconds, job_id, worker_id),
+    )
+    con.commit()
+    return cur.rowcount == 1
+
+
+def finish_job(con: sqlite3.Connection, job_id: int, worker_id: str, status: str, result_json: str) -> bool:
+    """작업 결과를 기록합니다. 임대를 잃은 worker 의 늦은 결과는 버립니다."""
+    cur = con.execute(
+        "UPDATE knowledge_jobs SET status = ?, result_json = ?, lease_expires_at = NULL "
+        "WHERE id = ? AND claimed_by = ? AND status = 'running'",
+        (status, result_json, job_id, worker_id),
+    )
+    con.commit()
+    return cur.rowcount == 1
+
+
+def start_progress(con: sqlite3.Connection, job_id: int, chunk_size: int) -> Tuple[int, int]:
+    """
+    작업의 (커밋된 청크 수, 청크 크기) 를 반환합니다. 처음 시작하는 작업이면 chunk_size 를 기록합니다.
+    이어서 처리할 때는 처음 정한 청크 크기를 그대로 써야 문단 위치가 맞습니다.
+    """
+    con.execute("UPDATE knowledge_jobs SET chunk_size = ? WHERE id = ? AND chunk_size IS NULL", (chunk_size, job_id))
+    con.commit()
+    return con.execute("SELECT chunks_done, chunk_size FROM knowledge_jobs WHERE id = ?", (job_id,)).fetchone()
+
+
+def save_chunk(con: sqlite3.Connection, job_id: int, worker_id: str, chunk_index: int,
+               paragraphs: List[str], categories: List[str], lease_seconds: float = LEASE_SECONDS) -> bool:
+    """
+    청크 결과와 진행 상황을 한 트랜잭션으로 커밋하고 임대를 연장합니다.
+    임대를 잃었거나 이미 커밋된 청크면 아무것도 쓰지 않고 False.
+    """
+    with con:
+        row = con.execute(
+            "UPDATE knowledge_jobs SET chunks_done = ?, progress = progress + ?, lease_expires_at = ? "
+            "WHERE id = ? AND claimed_by = ? AND status = 'running' AND chunks_done = ? RETURNING progress",
+            (chunk_index + 1, len(paragraphs), time.time() + lease_seconds, job_id, worker_id, chunk_index),
+        ).fetchone()
+        if row is None:
+            return False
+        # 문단 번호는 이 청크 앞까지 커밋된 문단 수부터 이어집니다.
+        _insert_paragraphs(con, job_id, row[0] - len(paragraphs), paragraphs, categories)
+    return True
+
+
+def count_jobs(con: sqlite3.Connection, status: Optional[str] = None) -> int:
+    if status is None:
+        return con.execute("SELECT COUNT(*) FROM knowledge_jobs").fetchone()[0]
+    return con.execute("SELECT COUNT(*) FROM knowledge_jobs WHERE status = ?", (status,)).fetchone()[0]
+
+
+def list_jobs(con: sqlite3.Connection, limit: int, offset: int = 0, status: Optional[str] = None) -> List[tuple]:
+    """최근 작업부터 한 페이지. (id, status, original_filename, classifier_mode, progress, created_at)"""
+    columns = "id, status, original_filename, classifier_mode, progress, created_at"
+    if status is None:
+        return con.execute(f"SELECT {columns} FROM knowledge_jobs ORDER BY id DESC LIMIT ? OFFSET ?",
+                           (limit, offset)).fetchall()
+    return con.execute(f"SELECT {columns} FROM knowledge_jobs WHERE status = ? ORDER BY id DESC LIMIT ? OFFSET ?",
+                       (status, limit, offset)).fetchall()
+
+
+def count_paragraphs(con: sqlite3.Connection, job_id: int, status: Optional[str] = None) -> int:
+    if status is None:
+        return con.execute("SELECT COUNT(*) FROM job_paragraphs WHERE job_id = ?", (job_id,)).fetchone()[0]
+    return con.execute("SELECT COUNT(*) FROM job_paragraphs WHERE job_id = ? AND status = ?",
+                       (job_id, status)).fetchone()[0]
+
+
+def load_paragraphs(con: sqlite3.Connection, job_id: int, limit: int, after: int = -1,
+                    status: Optional[str] = None) -> List[tuple]:
+    """
+    작업의 문단을 ordinal 순서로 한 페이지 읽습니다. after 는 앞 페이지의 마지막 ordinal 입니다.
+    (OFFSET 대신 키 기준으로 넘기므로 뒤쪽 페이지도 색인에서 바로 찾습니다.)
+    반환: [(ordinal, paragraph, category, tag, review, status), ...]
+    """
+    columns = "ordinal, paragraph, category, tag, review, status"
+    if status is None:
+        return con.execute(f"SELECT {columns} FROM job_paragraphs WHERE job_id = ? AND ordinal > ? "
+                           "ORDER BY ordinal LIMIT ?", (job_id, after, limit)).fetchall()
+    return con.execute(f"SELECT {columns} FROM job_paragraphs WHERE job_id = ? AND status = ? AND ordinal > ? "
+                       "ORDER BY ordinal LIMIT ?", (job_id, status, after, limit)).fetchall()
+
+
+def page_start(con: sqlite3.Connection, job_id: int, page: int, page_size: int, status: Optional[str] = None) -> int:
+    """page 번째(0부터) 페이지의 after 값 (그 앞 페이지의 마지막 ordinal, 첫 페이지는 -1)."""
+    if page <= 0:
+        return -1
+    where, params = ("job_id = ?", (job_id,)) if status is None else ("job_id = ? AND status = ?", (job_id, status))
+    row = con.execute(f"SELECT ordinal FROM job_paragraphs WHERE {where} ORDER BY ordinal LIMIT 1 OFFSET ?",
+                      (*params, page * page_size - 1)).fetchone()
+    return row[0] if row else -1
+
+
+def update_paragraphs(con: sqlite3.Connection, job_id: int, changes: Dict[int, dict]) -> int:
+    """
+    {ordinal: {열: 값}} 로 바뀐 문단만 고쳐 씁니다. 열은 EDITABLE_COLUMNS 중 하나여야 합니다.
+    같은 열 조합끼리 executemany 한 번으로 묶어 한 트랜잭션에 씁니다. 반환: 고친 행 수
+    """
+    groups: Dict[tuple, list] = {}
+    for ordinal, values in changes.items():
+        unknown = set(values) - set(EDITABLE_COLUMNS)
+        if unknown:
+            raise ValueError(f"수정할 수 없는 열입니다: {sorted(unknown)}")
+        if values.get("status", DEFAULT_REVIEW_STATUS) not in REVIEW_STATUSES:
+            raise ValueError(f"알 수 없는 검토 상태입니다: {values['status']}")
+        columns = tuple(sorted(values))
+        if columns:
+            groups.setdefault(columns, []).append((*(values[c] for c in columns), job_id, int(ordinal)))
+    updated = 0
+    with con:
+        for columns, rows in groups.items():
+            assignments = ", ".join(f"{c} = ?" for c in columns)
+            cur = con.executemany(f"UPDATE job_paragraphs SET {assignments} WHERE job_id = ? AND ordinal = ?", rows)
+            updated += cur.rowcount
+    return updated
+
+
+def iter_paragraphs(con: sqlite3.Connection, job_id: int, status: Optional[str] = None,
+                    batch_size: int = 1000) -> Iterator[tuple]:
+    """작업의 문단 전체(또는 status 인 것만)를 batch_size 행씩 읽어 내보냅니다."""
+    after = -1
+    while True:
+        rows = load_paragraphs(con, job_id, batch_size, after, status)
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        after = rows[-1][0]
+
+
+def load_job_result(con: sqlite3.Connection, job_id: int) -> dict:
+    """완료된 작업의 {"paragraphs": [...], "categories": [...]} 를 job_paragraphs 에서 모읍니다."""
+    paragraphs, categories = [], []
+    for _, paragraph, category, *_ in iter_paragraphs(con, job_id):
+        paragraphs.append(paragraph)
+        categories.append(category)
+    return {"paragraphs": paragraphs, "categories": categories}
@@ -0,0 +1,312 @@
+# 파일 경로: modules/kb_compiled.py
+
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+from collections.abc import ItemsView, ValuesView
+from typing import Iterable, List, Optional
+
+# 지식 .json 의 컴파일본(.json.kbc). `python -m modules.kb_compiled` 로 명시적으로 만들고,
+# 원본 .json 이 바뀌면(크기/수정 시각, 애매하면 sha256) 쓰지 않고 JSON 을 읽습니다.
+#   [MAGIC][헤더 길이 <I][헤더 JSON][골격 marshal][영역]
+# 골격은 원본의 dict/list 구조 그대로(규칙표는 marshal 로 바로 복원)이고, 두 가지만 영역으로 옮겨 참조로 바꿉니다.
+#   - ARENA_MIN_BYTES 이상인 dict 값 문자열 → (offset, length): UTF-8 조각
+#   - marshal 크기가 SUBTREE_MIN_BYTES 이상인 dict/list → (offset, length, 0): 따로 marshal 한 하위 골격
+# 영역은 mmap 으로 열고, 참조는 그 값을 처음 꺼낼 때 풉니다. 그래서 사례 본문이 늘어도 열기와 규칙표 읽기 비용은 그대로입니다.
+COMPILED_SUFFIX = ".kbc"
+MAGIC = b"KBC1"
+FORMAT_VERSION = 1
+ARENA_MIN_BYTES = 128
+SUBTREE_MIN_BYTES = 64 * 1024
+DEFAULT_TARGETS = ("knowledge", "knowledge_base.json")
+
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def compiled_path(file_path: str) -> str:
+    return file_path + COMPILED_SUFFIX
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _Arena:
+    __slots__ = ("buffer", "base")
+
+    def __init__(self, buffer, base: int):
+        self.buffer = buffer  # mmap (파일이 바뀌어도 연 시점의 내용을 유지)
+        self.base = base
+
+    def get(self, ref: tuple):
+        start = self.base + ref[0]
+        chunk = self.buffer[start:start + ref[1]]
+        return chunk.decode("utf-8") if len(ref) == 2 else _resolve(self, marshal.loads(chunk))
+
+
+def _resolve(arena: _Arena, value):
+    kind = type(value)
+    if kind is tuple:
+        return arena.get(value)
+    if kind is dict:
+        return CompiledDict(arena, value)
+    if kind is list:
+        return [_resolve(arena, item) for item in value]
+    return value
+
+
+class CompiledDict(dict):
+    """
+    컴파일본에서 연 dict. 값은 꺼낼 때 바꿔 넣습니다: 안쪽 dict 는 CompiledDict 로, 참조는 영역에서 잘라 풀어서.
+    dict 의 하위 클래스라 기존 코드(isinstance, .get, .items, json.dumps, dict.update)가 그대로 받습니다.
+    KnowledgeLoader 의 결과처럼 읽기 전용으로 다룹니다.
+    """
+
+    __slots__ = ("_arena",)
+
+    def __init__(self, arena: _Arena, raw: dict):
+        dict.__init__(self, raw)
+        self._arena = arena
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        kind = type(value)
+        if kind is tuple and len(value) == 2:  # 가장 흔한 경우(본문)는 함수 호출 없이 바로 풉니다.
+            arena = self._arena
+            start = arena.base + value[0]
+            value = arena.buffer[start:start + value[1]].decode("utf-8")
+        elif kind is tuple or kind is dict or kind is list:
+            value = _resolve(self._arena, value)
+        else:
+            return value
+        dict.__setitem__(self, key, value)  # 한 번 바꾼 값은 그대로 둡니다.
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    # 직접 정의해야 dict.update / dict(...) / {**d} 가 C 의 빠른 복사(원시 값 복사) 대신 __getitem__ 을 씁니다.
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+        value = self[key]
+        dict.__delitem__(self, key)
+        return value
+
+    def popitem(self):
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            dict.__setitem__(self, key, default)
+        return self[key]
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    def __or__(self, other):
+        return dict(self) | other
+
+    def __eq__(self, other):
+        return isinstance(other, dict) and len(self) == len(other) and all(
+            key in other and self[key] == other[key] for key in self)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(to_plain(self))
+
+    def __reduce__(self):
+        return dict, (to_plain(self),)
+
+
+def to_plain(value):
+    """CompiledDict 를 일반 dict/list/str 로 모두 풀어냅니다. (원본 JSON 을 json.load 한 결과와 같음)"""
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    return value
+
+
+# --------------------------------------------------
+# 만들기
+# --------------------------------------------------
+def _split(value, arena: List[bytes], offset: List[int]):
+    """골격을 만들면서 긴 dict 값 문자열과 큰 하위 구조를 arena 로 옮깁니다. (list 안의 문자열은 그대로 둡니다)"""
+    if isinstance(value, dict):
+        out = {}
+        for key, item in value.items():
+            if isinstance(item, str) and len(item) * 4 >= ARENA_MIN_BYTES:
+                data = item.encode("utf-8")
+                if len(data) >= ARENA_MIN_BYTES:
+                    out[key] = _append(arena, offset, data)
+                    continue
+            out[key] = _split(item, arena, offset)
+    elif isinstance(value, list):
+        out = [_split(item, arena, offset) for item in value]
+    else:
+        return value
+    data = marshal.dumps(out)
+    return _append(arena, offset, data, 0) if len(data) >= SUBTREE_MIN_BYTES else out
+
+
+def _append(arena: List[bytes], offset: List[int], data: bytes, *kind) -> tuple:
+    ref = (offset[0], len(data), *kind)
+    arena.append(data)
+    offset[0] += len(data)
+    return ref
+
+
+def build_compiled(file_path: str) -> str:
+    """file_path(.json) 의 컴파일본을 만들어 경로를 반환합니다. 임시 파일 + rename 으로 교체합니다."""
+    stat = os.stat(file_path)
+    with open(file_path, "rb") as f:
+        source = f.read()
+    data = json.loads(source.decode("utf-8")) if source else None
+    arena: List[bytes] = []
+    skeleton = marshal.dumps(_split(data, arena, [0]))
+    header = json.dumps({
+        "version": FORMAT_VERSION, "marshal": marshal.version, "python": list(sys.version_info[:2]),
+        "source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha256": hashlib.sha256(source).hexdigest(), "skeleton_length": len(skeleton),
+    }).encode("utf-8")
+
+    path = compiled_path(file_path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + _HEADER_LENGTH.pack(len(header)) + header + skeleton)
+        f.writelines(arena)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def _read_header(buffer) -> Optional[dict]:
+    if buffer[:len(MAGIC)] != MAGIC:
+        return None
+    start = len(MAGIC) + _HEADER_LENGTH.size
+    (length,) = _HEADER_LENGTH.unpack(buffer[len(MAGIC):start])
+    header = json.loads(bytes(buffer[start:start + length]))
+    header["skeleton_offset"] = start + length
+    return header
+
+
+def _is_fresh(file_path: str, header: dict, verify: bool) -> bool:
+    if (header.get("version") != FORMAT_VERSION or header.get("marshal") != marshal.version
+            or header.get("python") != list(sys.version_info[:2])):
+        return False
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return False
+    if stat.st_size != header["source_size"]:
+        return False
+    if stat.st_mtime_ns == header["source_mtime_ns"] and not verify:
+        return True
+    # 시각만 바뀐 경우(복사, checkout 등)는 내용 해시로 판단합니다.
+    return _sha256(file_path) == header["source_sha256"]
+
+
+# --------------------------------------------------
+# 열기
+# --------------------------------------------------
+_MISSING = object()
+
+
+def _open(file_path: str, verify: bool):
+    try:
+        with open(compiled_path(file_path), "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):  # ValueError: 빈 파일
+        return _MISSING
+    try:
+        header = _read_header(buffer)
+    except (struct.error, ValueError):
+        header = None
+    if header is None or not _is_fresh(file_path, header, verify):
+        buffer.close()
+        return _MISSING
+    skeleton_end = header["skeleton_offset"] + header["skeleton_length"]
+    raw = marshal.loads(buffer[header["skeleton_offset"]:skeleton_end])
+    return _resolve(_Arena(buffer, skeleton_end), raw)
+
+
+def load_compiled(file_path: str, verify: bool = False):
+    """
+    file_path(.json) 의 최신 컴파일본을 엽니다. 없거나, 원본과 맞지 않거나, 형식이 다르면 None (JSON 을 읽으면 됨).
+    verify=True 면 수정 시각이 같아도 sha256 을 비교합니다.
+    """
+    compiled = _open(file_path, verify)
+    return None if compiled is _MISSING else compiled
+
+
+def compile_targets(targets: Iterable[str] = DEFAULT_TARGETS) -> List[str]:
+    """폴더면 그 안의 .json 전부, 파일이면 그 파일. 실제로 있는 .json 경로 목록."""
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            paths.extend(os.path.join(target, name) for name in sorted(os.listdir(target)) if name.endswith(".json"))
+        elif os.path.isfile(target):
+            paths.append(target)
+    return paths
+
+
+def check_round_trip(file_path: str) -> bool:
+    """컴파일본을 모두 풀어낸 결과가 원본 JSON 과 같은지 (키 순서, int/float/bool 구분까지) 확인합니다."""
+    compiled = _open(file_path, verify=True)
+    if compiled is _MISSING:
+        return False
+    with open(file_path, "rb") as f:
+        source = f.read()
+    expected = json.loads(source.decode("utf-8")) if source else None
+    return json.dumps(to_plain(compiled), ensure_ascii=False) == json.dumps(expected, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="지식 .json 의 컴파일본(.kbc)을 만듭니다.")
+    parser.add_argument("targets", nargs="*", default=list(DEFAULT_TARGETS), help="폴더 또는 .json 파일")
+    parser.add_argument("--check", action="store_true", help="만들지 않고 최신 여부와 왕복 일치만 확인")
+    args = parser.parse_args()
+
+    failures = 0
+    for path in compile_targets(args.targets):
+        if not args.check:
+            try:
+                build_compiled(path)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"SKIP  {path} (JSON 이 아님: {e})")  # 로더도 이 파일은 건너뜁니다.
+                continue
+        if not os.path.exists(compiled_path(path)):
+            print(f"NONE  {path} (컴파일본 없음: JSON 을 읽습니다)")
+            continue
+        ok = check_round_trip(path)
+        failures += not ok
+        print(f"{'OK   ' if ok else 'STALE'} {path} → {compiled_path(path)} ({os.path.getsize(compiled_path(path)):,} bytes)")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,173 @@
+# 파일 경로: modules/kb_loader.py
+
+import copy
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from modules.kb_storage import (COMPACTING_SUFFIX, JOURNAL_SUFFIX, merge_knowledge, read_journal,
+                                read_knowledge_file)
+
+# 파일 서명: 스냅샷/저널/압축 중 저널 각각의 (수정 시각 ns, 크기, inode). 하나라도 바뀌면 다시 읽습니다.
+StatSignature = Optional[Tuple[int, int, int]]
+FileSignature = Tuple[StatSignature, StatSignature, StatSignature]
+
+
+class _FileState:
+    __slots__ = ("signature", "data", "journal_offset")
+
+    def __init__(self, signature: FileSignature, data: Optional[dict], journal_offset: int):
+        self.signature = signature
+        self.data = data
+        self.journal_offset = journal_offset
+
+
+class KnowledgeLoader:
+    """
+    지식 폴더의 .json 파일들을 읽어 하나의 딕셔너리로 통합합니다. (streamlit 없이 동작)
+    파일별 파싱 결과를 (경로, mtime, size) 기준으로 캐싱해, 바뀐 파일만 다시 읽고 통합 결과를 다시 만듭니다.
+    저널(.json.journal)이 있는 파일은 스냅샷에 저널을 병합해 보여주며, 저널만 늘어난 경우 새 줄만 읽습니다.
+    반환되는 딕셔너리는 여러 호출자가 공유하므로 읽기 전용으로 다뤄야 합니다.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._files: Dict[str, _FileState] = {}  # 파일명 → 상태
+        self._order: List[str] = []
+        self._merged: Optional[dict] = None
+        self.version = 0  # 통합 결과가 바뀔 때마다 1 증가 (캐시 키용)
+        self._lock = threading.RLock()
+        self._callbacks: List[Callable[[dict], None]] = []
+        self._stop_event: Optional[threading.Event] = None
+        self._poll_thread: Optional[threading.Thread] = None
+
+    def load(self) -> dict:
+        """바뀐 파일이 있으면 반영한 통합 지식을 반환합니다."""
+        self.refresh()
+        return self._merged
+
+    def load_versioned(self) -> Tuple[int, dict]:
+        """(version, 통합 지식). 두 값이 같은 시점의 것임을 보장합니다."""
+        with self._lock:
+            self.refresh()
+            return self.version, self._merged
+
+    def refresh(self) -> bool:
+        """폴더를 다시 살펴 바뀐 파일만 파싱합니다. 통합 결과가 바뀌었으면 True."""
+        with self._lock:
+            if not os.path.exists(self.directory):
+                os.makedirs(self.directory)
+            signatures = self._scan()
+            changed = self._merged is None or list(signatures) != self._order
+            for filename, signature in signatures.items():
+                cached = self._files.get(filename)
+                if cached is None or cached.signature != signature:
+                    self._files[filename] = self._update(filename, signature, cached)
+                    changed = True
+            for filename in set(self._files) - set(signatures):
+                del self._files[filename]
+            if changed:
+                self._order = list(signatures)
+                self._merged = self._merge()
+                self.version += 1
+                merged = self._merged
+        if changed:
+            for callback in list(self._callbacks):
+                callback(merged)
+        return changed
+
+    def invalidate(self, filename: str = None):
+        """파일(또는 전체)의 캐시를 버립니다. 같은 크기로 같은 시각에 덮어쓴 경우를 대비한 용도입니다."""
+        with self._lock:
+            if filename is None:
+                self._files.clear()
+            else:
+                self._files.pop(os.path.basename(filename), None)
+
+    def _scan(self) -> Dict[str, FileSignature]:
+        names = []
+        stats = {}
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            stats[entry.name] = entry.stat()
+            if entry.name.endswith('.json'):
+                names.append(entry.name)
+            elif entry.name.endswith('.json' + JOURNAL_SUFFIX):
+                # 아직 스냅샷 없이 저널만 있는 파일
+                base = entry.name[:-len(JOURNAL_SUFFIX)]
+                if not os.path.exists(os.path.join(self.directory, base)):
+                    names.append(base)
+
+        def signature_of(name) -> StatSignature:
+            stat = stats.get(name)
+            return (stat.st_mtime_ns, stat.st_size, stat.st_ino) if stat else None
+
+        return {
+            name: (signature_of(name), signature_of(name + JOURNAL_SUFFIX), signature_of(name + COMPACTING_SUFFIX))
+            for name in names
+        }
+
+    def _update(self, filename: str, signature: FileSignature, cached: Optional[_FileState]) -> _FileState:
+        file_path = os.path.join(self.directory, filename)
+        journal = signature[1]
+        if (cached is not None and cached.data is not None and journal is not None
+                and cached.signature[0] == signature[0] and cached.signature[2] == signature[2]
+                and cached.signature[1] is not None and cached.signature[1][2] == journal[2]
+                and journal[1] >= cached.journal_offset):
+            # 스냅샷은 그대로이고 저널 끝에 줄만 추가된 경우: 새 줄만 읽어 병합합니다.
+            # 이미 반환한 통합 결과가 cached.data 의 값을 공유하므로, 바뀌는 최상위 항목만 복사해 병합합니다.
+            entries, offset = read_journal(file_path + JOURNAL_SUFFIX, cached.journal_offset)
+            data = dict(cached.data)
+            for entry in entries:
+                for category in entry.keys() & cached.data.keys():
+                    if data[category] is cached.data[category]:
+                        data[category] = copy.copy(data[category])
+                merge_knowledge(data, entry)
+            return _FileState(signature, data, offset)
+        try:
+            data, offset = read_knowledge_file(file_path)
+        except (json.JSONDecodeError, FileNotFoundError):
+            print(f"경고: '{filename}' 파일을 읽는 데 실패했습니다.")
+            data, offset = None, 0
+        return _FileState(signature, data, offset)
+
+    def _merge(self) -> dict:
+        combined_knowledge = {}
+        for filename in self._order:
+            data = self._files[filename].data
+            if data:
+                combined_knowledge.update(data)
+        return combined_knowledge
+
+    # --------------------------------------------------
+    # 핫 리로드: 오래 도는 프로세스(worker 등)가 재시작 없이 수정된 지식을 반영합니다.
+    # --------------------------------------------------
+    def on_change(self, callback: Callable[[dict], None]):
+        """통합 지식이 바뀔 때마다 callback(새 지식)을 호출하도록 등록합니다."""
+        self._callbacks.append(callback)
+
+    def start_polling(self, interval: float = 2.0):
+        """백그라운드 스레드에서 interval 초마다 refresh() 를 호출합니다."""
+        if self._poll_thread and self._poll_thread.is_alive():
+            return
+        self._stop_event = threading.Event()
+        stop_event = self._stop_event
+
+        def poll():
+            while not stop_event.wait(interval):
+                try:
+                    self.refresh()
+                except OSError as e:
+                    print(f"경고: 지식 폴더 확인 실패: {e}")
+
+        self._poll_thread = threading.Thread(target=poll, name="kb-poller", daemon=True)
+        self._poll_thread.start()
+
+    def stop_polling(self):
+        if self._stop_event:
+            self._stop_event.set()
+        if self._poll_thread:
+            self._poll_thread.join()
+        self._poll_thread = None
@@ -0,0 +1,279 @@
+# 파일 경로: modules/kb_storage.py
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+from modules.kb_compiled import load_compiled
+
+try:
+    import fcntl
+except ImportError:  # Windows: 같은 프로세스 안에서만 잠급니다.
+    fcntl = None
+
+# 지식 파일 하나는 "스냅샷(정식 .json) + 저널(.json.journal, JSON Lines)" 로 구성됩니다.
+# 저장은 저널에 한 줄을 덧붙이는 것으로 끝나고, 압축(compaction) 때 스냅샷에 합쳐집니다.
+JOURNAL_SUFFIX = ".journal"
+COMPACTING_SUFFIX = ".journal.compacting"  # 압축 중인 저널 (압축이 끝나면 삭제)
+COMPACTED_SUFFIX = ".journal.compacted"    # 압축 중인 저널을 이미 합친 스냅샷의 (inode, 크기)
+JOURNAL_LOCK_SUFFIX = ".journal.lock"      # 저널 쓰기/이름 바꾸기용 flock 파일
+LOCK_SUFFIX = ".lock"                      # 압축 작업 잠금
+STALE_LOCK_SECONDS = 600
+
+_local_lock = threading.Lock()
+
+
+def merge_knowledge(existing: dict, new: dict) -> dict:
+    """새 지식을 기존 지식에 병합합니다. (기존 dict 를 직접 수정해 반환)"""
+    for category, content in new.items():
+        if category not in existing:
+            existing[category] = content
+        elif isinstance(existing.get(category), dict):
+            existing[category].update(content)
+        elif isinstance(existing.get(category), list):
+            existing[category].extend(content)
+    return existing
+
+
+def journal_path(file_path: str) -> str:
+    return file_path + JOURNAL_SUFFIX
+
+
+def compacting_path(file_path: str) -> str:
+    return file_path + COMPACTING_SUFFIX
+
+
+def compacted_marker_path(file_path: str) -> str:
+    return file_path + COMPACTED_SUFFIX
+
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def _fsync_dir(directory: str):
+    # 디렉터리 fsync 는 POSIX 에서만 가능합니다. (rename 결과를 디스크에 확정)
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+@contextmanager
+def _journal_lock(file_path: str):
+    """
+    저널에 쓰기와 저널 이름 바꾸기(압축 시작)를 여러 프로세스 사이에서 하나씩 하게 합니다. (.journal.lock 에 flock)
+    같은 프로세스의 스레드도 각자 파일을 열어 잠그므로 서로 기다립니다.
+    """
+    if fcntl is None:
+        with _local_lock:
+            yield
+        return
+    fd = os.open(file_path + JOURNAL_LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # 닫으면 잠금도 풀립니다.
+
+
+def append_journal(file_path: str, data: dict):
+    """저널 끝에 한 줄을 덧붙이고 fsync 합니다. 파일 크기와 무관하게 비용이 일정합니다."""
+    line = (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+    with _journal_lock(file_path):
+        fd = os.open(journal_path(file_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def read_journal(path: str, offset: int = 0) -> Tuple[List[dict], int]:
+    """
+    저널의 offset 이후 완성된 줄들을 읽어 (항목 목록, 다음 offset) 을 반환합니다.
+    쓰다 만 마지막 줄(개행 없음)은 다음 호출에서 읽습니다.
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return [], 0
+    end = chunk.rfind(b"\n") + 1
+    entries = []
+    for raw in chunk[:end].splitlines():
+        if not raw.strip():
+            continue
+        try:
+            entries.append(json.loads(raw))
+        except json.JSONDecodeError:
+            print(f"경고: '{path}' 저널의 손상된 줄을 건너뜁니다.")
+    return entries, offset + end
+
+
+def read_snapshot(file_path: str) -> Optional[dict]:
+    """정식 .json 스냅샷을 읽습니다. 없거나 비어 있으면 None."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except FileNotFoundError:
+        return None
+    return json.loads(content) if content else None
+
+
+def _snapshot_identity(stat: os.stat_result) -> List[int]:
+    return [stat.st_ino, stat.st_size]
+
+
+def pending_compaction_applies(file_path: str) -> bool:
+    """
+    남아 있는 압축 중 저널을 읽을 때 반영해야 하는지 판단합니다.
+    압축은 스냅샷을 교체하기 직전에 새 스냅샷의 (inode, 크기)를 표시 파일(.journal.compacted)에 적고,
+    새 압축 중 저널을 만들기 전에 표시 파일을 지웁니다. 그래서 표시 파일이 지금 스냅샷을 가리키면 이미 합쳐진 것입니다.
+    (수정 시각은 같은 값이 나올 수 있어 비교하지 않습니다)
+    """
+    if _stat(compacting_path(file_path)) is None:
+        return False
+    snapshot = _stat(file_path)
+    if snapshot is None:
+        return True
+    try:
+        with open(compacted_marker_path(file_path), "r", encoding="utf-8") as f:
+            marker = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return True
+    return marker.get("snapshot") != _snapshot_identity(snapshot)
+
+
+def read_knowledge_file(file_path: str) -> Tuple[Optional[dict], int]:
+    """
+    스냅샷 + (압축 중 저널) + 저널을 병합한 내용과 저널을 읽은 위치를 반환합니다.
+    저널이 없고 스냅샷의 최신 컴파일본(.kbc)이 있으면 JSON 대신 그것을 엽니다. (읽기 전용 CompiledDict)
+    """
+    if _stat(journal_path(file_path)) is None and _stat(compacting_path(file_path)) is None:
+        compiled = load_compiled(file_path)
+        if compiled is not None:
+            return compiled, 0
+    data = read_snapshot(file_path)
+    entries = []
+    if pending_compaction_applies(file_path):
+        entries.extend(read_journal(compacting_path(file_path))[0])
+    journal_entries, offset = read_journal(journal_path(file_path))
+    entries.extend(journal_entries)
+    if entries:
+        data = data if isinstance(data, dict) else {}
+        for entry in entries:
+            merge_knowledge(data, entry)
+    return data, offset
+
+
+def _write_temp_json(file_path: str, data: dict) -> str:
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+def atomic_write_json(file_path: str, data: dict):
+    """임시 파일에 쓰고 fsync 한 뒤 rename 으로 교체합니다. 중간에 죽어도 기존 파일은 그대로입니다."""
+    os.replace(_write_temp_json(file_path, data), file_path)
+    _fsync_dir(os.path.dirname(file_path))
+
+
+def _remove_if_exists(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _acquire_lock(file_path: str) -> bool:
+    lock_path = file_path + LOCK_SUFFIX
+    try:
+        fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        lock = _stat(lock_path)
+        if lock and time.time() - lock.st_mtime > STALE_LOCK_SECONDS:
+            os.remove(lock_path)  # 압축 도중 죽은 프로세스가 남긴 잠금
+            return _acquire_lock(file_path)
+        return False
+    os.write(fd, str(os.getpid()).encode())
+    os.close(fd)
+    return True
+
+
+def compact(file_path: str) -> bool:
+    """
+    저널을 스냅샷에 합쳐 정식 .json 으로 다시 씁니다. 다른 프로세스가 압축 중이면 False.
+    1) 저널 잠금 안에서 저널을 .compacting 으로 이름을 바꾸고 읽어 (이후 저장은 새 저널로 감)
+    2) 스냅샷 + .compacting 을 병합해, 표시 파일을 적은 뒤 스냅샷을 원자적으로 교체하고
+    3) 저널 잠금 안에서 .compacting 과 표시 파일을 지웁니다.
+    """
+    if not _acquire_lock(file_path):
+        return False
+    try:
+        pending = compacting_path(file_path)
+        marker = compacted_marker_path(file_path)
+        with _journal_lock(file_path):
+            if _stat(pending) is not None and not pending_compaction_applies(file_path):
+                # 이전 압축이 스냅샷 교체 후 정리 직전에 중단된 경우
+                os.remove(pending)
+            if _stat(pending) is None:
+                if _stat(journal_path(file_path)) is None:
+                    return True
+                _remove_if_exists(marker)  # 표시 파일은 이전 압축 중 저널의 것이므로 새 저널 전에 지웁니다.
+                _fsync_dir(os.path.dirname(file_path))
+                os.replace(journal_path(file_path), pending)
+            # 저장은 잠금을 잡고 저널을 열어 쓰므로, 이름을 바꾼 뒤에는 .compacting 에 줄이 더 붙지 않습니다.
+            entries, _ = read_journal(pending)
+
+        data = read_snapshot(file_path)
+        data = data if isinstance(data, dict) else {}
+        for entry in entries:
+            merge_knowledge(data, entry)
+        tmp_path = _write_temp_json(file_path, data)
+        atomic_write_json(marker, {"snapshot": _snapshot_identity(os.stat(tmp_path))})
+        os.replace(tmp_path, file_path)
+        _fsync_dir(os.path.dirname(file_path))
+
+        with _journal_lock(file_path):
+            os.remove(pending)
+            _remove_if_exists(marker)
+        return True
+    finally:
+        os.remove(file_path + LOCK_SUFFIX)
+
+
+_compacting_now = set()
+
+
+def compact_in_background(file_path: str) -> Optional[threading.Thread]:
+    """같은 파일에 대해 한 번에 하나의 압축 스레드만 띄웁니다."""
+    with _local_lock:
+        if file_path in _compacting_now:
+            return None
+        _compacting_now.add(file_path)
+
+    def run():
+        try:
+            compact(file_path)
+        except OSError as e:
+            print(f"경고: '{file_path}' 압축 실패: {e}")
+        finally:
+            with _local_lock:
+                _compacting_now.discard(file_path)
+
+    thread = threading.Thread(target=run, name="kb-compactor", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,138 @@
+# 파일 경로: modules/keyword_matcher.py
+
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+_NO_MATCH = 1 << 62  # first_match 에서 "아직 못 찾음"을 나타내는 큰 순번
+# 규칙이 이보다 적으면 C 로 구현된 'in' 을 규칙마다 부르는 쪽이 파이썬 오토마톤보다 빠릅니다. (bench_keyword_matcher)
+LINEAR_SCAN_LIMIT = 100
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 오토마톤. 키워드가 몇 개든 텍스트를 한 번만 훑어 포함된 키워드를 모두 찾습니다.
+    키워드 순번(0부터, 입력 순서)으로 결과를 돌려주며, 순번이 작을수록 우선순위가 높습니다.
+    상태는 리스트/딕셔너리만으로 이루어져 pickle 로 worker 프로세스에 넘길 수 있습니다.
+    """
+    __slots__ = ("keywords", "_goto", "_fail", "_out", "_first")
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(index)  # 빈 키워드는 루트에 → 모든 텍스트에 포함
+
+        # 너비 우선으로 실패 링크를 만들고, 실패 링크 쪽 출력도 합쳐 둡니다.
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            out[child].extend(out[0])
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                out[child].extend(i for i in out[self._fail[child]] if i not in out[child])
+                queue.append(child)
+        self._out: List[Tuple[int, ...]] = [tuple(sorted(ids)) for ids in out]
+        self._first: List[int] = [ids[0] if ids else _NO_MATCH for ids in self._out]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _states(self, text: str) -> Iterator[int]:
+        goto, fail = self._goto, self._fail
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            yield state
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(키워드 끝 위치 다음 인덱스, 키워드 순번) 을 텍스트 앞에서부터 내보냅니다."""
+        for index in self._out[0]:  # 빈 키워드
+            yield 0, index
+        for position, state in enumerate(self._states(text), 1):
+            for index in self._out[state]:
+                if self.keywords[index]:
+                    yield position, index
+
+    def matched_ids(self, text: str) -> Set[int]:
+        """텍스트에 포함된 키워드 순번 집합. ('키워드 in 텍스트' 가 참인 키워드 전부)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(out[0])
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def matched_ids_many(self, texts: Iterable[str]) -> Set[int]:
+        """여러 텍스트 중 하나에라도 포함된 키워드 순번 집합. (키워드가 텍스트 경계를 넘지는 않음)"""
+        found: Set[int] = set()
+        for text in texts:
+            found |= self.matched_ids(text)
+        return found
+
+    def first_match(self, text: str) -> Optional[int]:
+        """텍스트에 포함된 키워드 중 순번이 가장 작은 것. (규칙을 순서대로 검사해 처음 맞는 것과 같음)"""
+        goto, fail, first = self._goto, self._fail, self._first
+        best = first[0]
+        if best == 0:
+            return 0
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if first[state] < best:
+                best = first[state]
+                if best == 0:
+                    break
+        return None if best == _NO_MATCH else best
+
+
+class KeywordRules:
+    """(키워드, 값) 규칙 목록을 컴파일한 것. 목록 순서가 우선순위입니다. (pickle 가능)"""
+    __slots__ = ("matcher", "pairs", "values")
+
+    def __init__(self, pairs: Iterable[Tuple[str, Any]]):
+        self.pairs: List[Tuple[str, Any]] = list(pairs)
+        self.matcher = KeywordMatcher(keyword for keyword, _ in self.pairs)
+        self.values: List[Any] = [value for _, value in self.pairs]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def first(self, text: str, default: Any = None) -> Any:
+        """텍스트에 포함된 첫 번째 규칙(목록 순서 기준)의 값. 없으면 default."""
+        if len(self.pairs) < LINEAR_SCAN_LIMIT:
+            for keyword, value in self.pairs:
+                if keyword in text:
+                    return value
+            return default
+        index = self.matcher.first_match(text)
+        return default if index is None else self.values[index]
+
+    def all(self, texts: Sequence[str]) -> List[Any]:
+        """여러 텍스트 중 하나에라도 키워드가 포함된 규칙들의 값 (목록 순서대로)."""
+        if len(self.pairs) < LINEAR_SCAN_LIMIT:
+            return [value for keyword, value in self.pairs if any(keyword in text for text in texts)]
+        return [self.values[i] for i in sorted(self.matcher.matched_ids_many(texts))]
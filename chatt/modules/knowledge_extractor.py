@@ -1,49 +1,217 @@
-# 파일 경로: modules/knowledge_extractor.py
-
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.pydantic_v1 import BaseModel, Field
-from typing import List, Dict
-
-# --- AI가 생성할 JSON의 구조를 미리 정의 ---
-class InterpretationRule(BaseModel):
-    rule_name: str = Field(description="규칙의 이름 (예: '허자의 출현 응기')")
-    conditions: List[str] = Field(description="규칙이 적용되기 위한 조건 목록")
-    result: str = Field(description="조건이 충족될 때의 해석 결과")
-
-class StructuredKnowledge(BaseModel):
-    rules: List[InterpretationRule] = Field(description="문서에서 추출된 사주 해석 규칙 목록")
-
-def extract_structured_knowledge(text_content: str, api_key: str) -> Dict:
-    """
-    입력된 텍스트에서 사주 해석 규칙을 추출하고 JSON 구조로 반환합니다.
-    """
-    # 1. LLM 모델 정의
-    llm = ChatOpenAI(model="gpt-4-turbo", temperature=0, api_key=api_key)
-    
-    # 2. JSON 출력 파서 설정
-    # Pydantic 모델을 기반으로 출력 형식을 강제합니다.
-    parser = JsonOutputParser(pydantic_object=StructuredKnowledge)
-    
-    # 3. AI에게 역할을 부여하는 프롬프트 템플릿
-    prompt = ChatPromptTemplate.from_template(
-        "당신은 사주 명리학의 대가입니다. 아래 제공된 텍스트를 분석하여, "
-        "핵심적인 해석 규칙들을 찾아주세요. 각 규칙을 이름, 조건, 결과로 나누어 "
-        "JSON 형식으로 정리해야 합니다.\n"
-        "{format_instructions}\n\n"
-        "## 분석할 텍스트:\n{text}"
-    )
-    
-    # 4. LCEL 체인 구성
-    chain = prompt | llm | parser
-    
-    # 5. 체인 실행 및 결과 반환
-    try:
-        response = chain.invoke({
-            "text": text_content,
-            "format_instructions": parser.get_format_instructions(),
-        })
-        return response
-    except Exception as e:
-        return {"error": f"AI 규칙 추출 중 오류 발생: {e}"}
\ No newline at end of file
+# 파일 경로: modules/knowledge_extractor.py
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+CHUNK_SIZE = 6000      # 청크 하나의 최대 글자 수 (대략)
+CHUNK_OVERLAP = 400    # 같은 섹션 안에서 잘릴 때 앞 청크 끝을 다음 청크 앞에 겹쳐 넣는 글자 수
+MAX_CONCURRENCY = 4    # 동시에 LLM 에 보내는 청크 수
+
+# 섹션 제목으로 보는 줄: 마크다운 제목, '제3장' 같은 장/절, 사례 머리 (rules_config.blockify 와 같은 형식)
+_SECTION_HEADING = re.compile(r"^(?:#{1,6}\s+\S.*|제\s*\d+\s*[장절편부].*|<사례\s*\d+>.*|사례\d*[\):].*)$")
+_PARAGRAPH_SEPARATOR = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+class TextChunk(NamedTuple):
+    index: int
+    text: str
+    section: str  # 청크가 시작하는 섹션의 제목 (없으면 "")
+
+# --------------------------------------------------
+# 1. 분할: 섹션 경계를 존중하며 겹치는 청크로 나누기
+# --------------------------------------------------
+def _split_sections(text: str) -> List[tuple]:
+    """[(섹션 제목, 섹션 본문)] — 제목 줄은 본문 첫 줄에도 남겨 둡니다."""
+    sections, heading, lines = [], "", []
+    for line in text.splitlines():
+        if _SECTION_HEADING.match(line.strip()) and lines:
+            sections.append((heading, "\n".join(lines)))
+            lines = []
+        if _SECTION_HEADING.match(line.strip()):
+            heading = line.strip()
+        lines.append(line)
+    if lines:
+        sections.append((heading, "\n".join(lines)))
+    return [(h, body.strip()) for h, body in sections if body.strip()]
+
+def _split_to_fit(body: str, limit: int) -> List[str]:
+    """limit 보다 긴 섹션을 문단 → 문장 → 글자 순으로 잘게 나눕니다."""
+    if len(body) <= limit:
+        return [body]
+    pieces = []
+    for para in _PARAGRAPH_SEPARATOR.split(body):
+        if len(para) <= limit:
+            pieces.append(para)
+            continue
+        for sentence in _SENTENCE_END.split(para):
+            pieces.extend(sentence[i:i + limit] for i in range(0, len(sentence), limit))
+    return [p for p in pieces if p.strip()]
+
+def _tail(text: str, overlap: int) -> str:
+    """text 끝의 overlap 글자 정도를, 단어 중간에서 시작하지 않도록 잘라 반환합니다."""
+    if overlap <= 0:
+        return ""
+    tail = text[-overlap:]
+    if len(tail) < len(text):
+        cut = tail.find(" ")
+        tail = tail[cut + 1:] if 0 <= cut < len(tail) - 1 else tail
+    return tail.strip()
+
+def split_into_chunks(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[TextChunk]:
+    """
+    섹션 단위로 청크를 채우고, 한 섹션이 청크를 넘길 때만 문단/문장에서 자릅니다.
+    같은 섹션 안에서 잘린 경우 앞 청크의 끝 overlap 글자를 다음 청크 앞에 겹쳐, 경계에 걸친 규칙도 한 청크에 온전히 들어가게 합니다.
+    """
+    limit = max(1, chunk_size - overlap)
+    chunks: List[TextChunk] = []
+    parts, size, section = [], 0, ""
+
+    for heading, body in _split_sections(text):
+        # 새 섹션이 남은 자리에 다 들어가지 않으면, 청크가 절반 이상 찼을 때는 섹션 경계에서 미리 끊습니다.
+        if parts and size + len(body) > chunk_size and size >= chunk_size // 2:
+            chunks.append(TextChunk(len(chunks), "\n\n".join(parts), section))
+            parts, size = [], 0
+        for i, piece in enumerate(_split_to_fit(body, limit)):
+            if parts and size + len(piece) > chunk_size:
+                chunks.append(TextChunk(len(chunks), "\n\n".join(parts), section))
+                parts, size = [], 0
+                if i > 0:  # 섹션 중간에서 잘림 → 겹침 (앞 섹션 내용은 넘기지 않음)
+                    carry = _tail(chunks[-1].text, overlap)
+                    if heading and heading in carry:
+                        carry = carry[carry.rindex(heading):]
+                    parts, size = [carry], len(carry)
+                section = heading
+            if not parts:
+                section = heading
+            parts.append(piece)
+            size += len(piece) + 2
+    if parts:
+        chunks.append(TextChunk(len(chunks), "\n\n".join(parts), section))
+    return chunks
+
+# --------------------------------------------------
+# 2. 맵: 청크마다 규칙 추출 (병렬, 끝나는 대로 스트리밍)
+# --------------------------------------------------
+@lru_cache(maxsize=None)
+def _output_schema():
+    """AI가 생성할 JSON의 구조. (langchain/pydantic 은 import 가 무거워 처음 쓸 때 불러옵니다)"""
+    try:
+        from langchain_core.pydantic_v1 import BaseModel, Field
+    except ImportError:  # langchain-core 0.3 이후에는 pydantic 을 바로 씁니다.
+        from pydantic import BaseModel, Field
+
+    class InterpretationRule(BaseModel):
+        rule_name: str = Field(description="규칙의 이름 (예: '허자의 출현 응기')")
+        conditions: List[str] = Field(description="규칙이 적용되기 위한 조건 목록")
+        result: str = Field(description="조건이 충족될 때의 해석 결과")
+
+    class StructuredKnowledge(BaseModel):
+        rules: List[InterpretationRule] = Field(description="문서에서 추출된 사주 해석 규칙 목록")
+
+    return StructuredKnowledge
+
+def _build_chain(api_key: Optional[str], llm=None):
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+
+    # 1. LLM 모델 정의 (llm 을 주면 그것을 사용: 시험용 가짜 모델 등)
+    if llm is None:
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(model="gpt-4-turbo", temperature=0, api_key=api_key)
+
+    # 2. JSON 출력 파서 설정
+    # Pydantic 모델을 기반으로 출력 형식을 강제합니다.
+    parser = JsonOutputParser(pydantic_object=_output_schema())
+
+    # 3. AI에게 역할을 부여하는 프롬프트 템플릿
+    prompt = ChatPromptTemplate.from_template(
+        "당신은 사주 명리학의 대가입니다. 아래 제공된 텍스트를 분석하여, "
+        "핵심적인 해석 규칙들을 찾아주세요. 각 규칙을 이름, 조건, 결과로 나누어 "
+        "JSON 형식으로 정리해야 합니다.\n"
+        "{format_instructions}\n\n"
+        "## 섹션: {section}\n"
+        "## 분석할 텍스트:\n{text}"
+    )
+
+    # 4. LCEL 체인 구성
+    return prompt | llm | parser, parser.get_format_instructions()
+
+def stream_structured_knowledge(text_content: str, api_key: Optional[str] = None, llm=None,
+                                chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP,
+                                max_concurrency: int = MAX_CONCURRENCY) -> Iterator[Dict]:
+    """
+    청크별 추출 결과를 끝나는 순서대로 내보냅니다. 동시에 max_concurrency 개까지 LLM 을 호출합니다.
+    각 항목: {"chunk", "section", "chars", "rules", "latency", "error"}
+    """
+    chunks = split_into_chunks(text_content, chunk_size, chunk_overlap)
+    chain, format_instructions = _build_chain(api_key, llm)
+
+    def run(chunk: TextChunk) -> Dict:
+        start = time.perf_counter()
+        try:
+            response = chain.invoke({
+                "text": chunk.text,
+                "section": chunk.section or "(없음)",
+                "format_instructions": format_instructions,
+            })
+            rules = response.get("rules", []) if isinstance(response, dict) else []
+            error = None
+        except Exception as e:
+            rules, error = [], f"AI 규칙 추출 중 오류 발생: {e}"
+        return {"chunk": chunk.index, "section": chunk.section, "chars": len(chunk.text),
+                "rules": rules, "latency": time.perf_counter() - start, "error": error}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        futures = [executor.submit(run, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield future.result()
+
+# --------------------------------------------------
+# 3. 리듀스: 같은 이름의 규칙 병합
+# --------------------------------------------------
+def _normalize(text) -> str:
+    return _WHITESPACE.sub(" ", str(text)).strip()
+
+def merge_rules(rule_lists: List[List[Dict]]) -> List[Dict]:
+    """
+    청크별 규칙 목록을 합칩니다. rule_name(공백 정규화)이 같은 규칙은 하나로 묶어
+    조건은 순서를 유지한 합집합으로, 결과가 서로 다르면 ' / ' 로 이어 붙입니다.
+    rule_lists 는 청크 순서대로 주어야 결과 순서가 문서 순서를 따릅니다.
+    """
+    merged: Dict[str, Dict] = {}
+    for rules in rule_lists:
+        for rule in rules:
+            if not isinstance(rule, dict) or not rule.get("rule_name"):
+                continue
+            name = _normalize(rule["rule_name"])
+            conditions = [_normalize(c) for c in rule.get("conditions") or [] if _normalize(c)]
+            result = _normalize(rule.get("result", ""))
+            target = merged.setdefault(name, {"rule_name": name, "conditions": [], "result": ""})
+            for condition in conditions:
+                if condition not in target["conditions"]:
+                    target["conditions"].append(condition)
+            if result and result not in target["result"].split(" / "):
+                target["result"] = f"{target['result']} / {result}" if target["result"] else result
+    return list(merged.values())
+
+def extract_structured_knowledge(text_content: str, api_key: str, llm=None,
+                                 chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP,
+                                 max_concurrency: int = MAX_CONCURRENCY) -> Dict:
+    """
+    입력된 텍스트에서 사주 해석 규칙을 추출하고 JSON 구조로 반환합니다.
+    긴 텍스트는 청크로 나눠 병렬로 추출한 뒤 병합합니다. (청크별 소요 시간은 "chunks" 에)
+    """
+    reports = sorted(stream_structured_knowledge(text_content, api_key, llm, chunk_size, chunk_overlap,
+                                                 max_concurrency), key=lambda r: r["chunk"])
+    errors = [r["error"] for r in reports if r["error"]]
+    if reports and len(errors) == len(reports):
+        return {"error": errors[0]}
+    return {
+        "rules": merge_rules([r["rules"] for r in reports]),
+        "chunks": [{k: r[k] for k in ("chunk", "section", "chars", "latency", "error")} | {"rules": len(r["rules"])}
+                   for r in reports],
+    }
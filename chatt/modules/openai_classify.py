@@ -0,0 +1,197 @@
+# 파일 경로: modules/openai_classify.py
+
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Dict, List, Optional, Sequence, Union
+
+import openai
+
+OPENAI_MODEL = "gpt-3.5-turbo"
+MAX_CONCURRENCY = 8           # 동시에 보내는 요청 수
+REQUESTS_PER_MINUTE = 500     # 토큰 버킷: 분당 요청 수
+TOKENS_PER_MINUTE = 150_000   # 토큰 버킷: 분당 토큰 수 (프롬프트 길이로 어림)
+BURST_SECONDS = 1             # 버킷에 최대 몇 초 분량까지 쌓아 한꺼번에 보낼 수 있는지
+MAX_RETRIES = 5               # 429 / 시간 초과 / 연결 오류 / 5xx 를 다시 시도하는 횟수
+BACKOFF_BASE = 0.5            # 재시도 대기: BACKOFF_BASE * 2^시도 (지터 포함, BACKOFF_MAX 까지)
+BACKOFF_MAX = 20.0
+REQUEST_TIMEOUT = 30.0
+PACK_SIZE = 1                 # 프롬프트 하나에 넣는 문단 수
+
+FAILED_LABEL = "분류 실패"
+ERROR_LABEL = "API 호출 오류"
+AUTH_ERROR_LABEL = "API 키 인증 실패"
+
+Label = Union[str, List[str]]
+
+_RETRYABLE = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+class TokenBucket:
+    """분당 rate_per_minute 개씩 채워지는 토큰 버킷. 같은 이벤트 루프 안의 코루틴끼리 공유합니다."""
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = BURST_SECONDS):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0):
+        amount = min(amount, self.capacity)  # 버킷보다 큰 요청도 언젠가는 지나가도록
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+def build_prompt(paragraphs: Sequence[str], categories: Sequence[str], multi_label: bool = False) -> str:
+    """문단들에 번호를 붙여 한 프롬프트로 묶고, 번호를 키로 하는 JSON 으로 답하게 합니다."""
+    if multi_label:
+        rule = "해당하는 카테고리를 모두 골라 배열로"
+        example = json.dumps({"1": list(categories[:2]), "2": list(categories[-1:])}, ensure_ascii=False)
+    else:
+        rule = "가장 적합한 카테고리 하나만 골라"
+        example = json.dumps({"1": categories[0], "2": categories[-1]}, ensure_ascii=False)
+    numbered = "\n\n".join(f"[{i}] {para}" for i, para in enumerate(paragraphs, 1))
+    return (f"다음 {len(paragraphs)}개 텍스트를 '{', '.join(categories)}' 카테고리로 분류해줘. "
+            f"각 텍스트마다 {rule}, 번호를 키로 하는 JSON 객체로만 답해줘. 예: {example}\n\n{numbered}")
+
+
+def _clean(label) -> str:
+    return str(label).strip().replace("'", "").replace('"', '')
+
+
+def parse_reply(reply: str, count: int, categories: Sequence[str], multi_label: bool = False) -> List[Label]:
+    """모델 응답을 문단 수만큼의 라벨로 바꿉니다. 카테고리에 없는 값이나 빠진 번호는 FAILED_LABEL."""
+    match = _JSON_OBJECT.search(reply or "")
+    try:
+        answers = json.loads(match.group(0)) if match else None
+    except json.JSONDecodeError:
+        answers = None
+    if not isinstance(answers, dict):
+        # JSON 이 아니면 예전처럼 카테고리 이름만 답한 것으로 봅니다. (문단이 하나일 때만)
+        label = _clean(reply or "")
+        if count == 1 and label in categories:
+            return [[label]] if multi_label else [label]
+        return [FAILED_LABEL] * count
+
+    labels = []
+    for i in range(1, count + 1):
+        value = answers.get(str(i))
+        values = value if isinstance(value, list) else [value]
+        valid = [_clean(v) for v in values if v is not None and _clean(v) in categories]
+        if not valid:
+            labels.append(FAILED_LABEL)
+        else:
+            labels.append(list(dict.fromkeys(valid)) if multi_label else valid[0])
+    return labels
+
+
+class AsyncOpenAIClassifier:
+    """
+    asyncio 로 여러 요청을 동시에 보내는 OpenAI 문단 분류기.
+    동시 요청 수는 세마포어로, 분당 요청/토큰 수는 토큰 버킷으로 제한하고
+    429·시간 초과·연결 오류는 지수 백오프(Retry-After 헤더가 있으면 그 값)로 다시 시도합니다.
+    base_url 로 로컬 스텁 서버를 가리키면 네트워크 없이 시험할 수 있습니다.
+    """
+
+    def __init__(self, api_key: str, model: str = OPENAI_MODEL, base_url: Optional[str] = None,
+                 max_concurrency: int = MAX_CONCURRENCY, requests_per_minute: float = REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = TOKENS_PER_MINUTE, pack_size: int = PACK_SIZE,
+                 multi_label: bool = False, max_retries: int = MAX_RETRIES, timeout: float = REQUEST_TIMEOUT):
+        # 재시도는 여기서 직접 하므로 SDK 의 자동 재시도는 끕니다.
+        self.client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.pack_size = max(1, pack_size)
+        self.multi_label = multi_label
+        self.max_retries = max_retries
+        self.stats: Dict[str, float] = {"paragraphs": 0, "requests": 0, "retries": 0, "rate_limited": 0,
+                                        "timeouts": 0, "failed_requests": 0, "seconds": 0.0}
+
+    async def classify(self, paragraphs: List[str], categories: List[str]) -> List[Label]:
+        """문단 순서대로 라벨을 반환합니다. multi_label 이면 각 라벨은 카테고리 목록입니다."""
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        request_bucket = TokenBucket(self.requests_per_minute)
+        token_bucket = TokenBucket(self.tokens_per_minute)
+        packs = [paragraphs[i:i + self.pack_size] for i in range(0, len(paragraphs), self.pack_size)]
+        results = await asyncio.gather(*(
+            self._classify_pack(pack, categories, semaphore, request_bucket, token_bucket) for pack in packs))
+        self.stats["paragraphs"] += len(paragraphs)
+        self.stats["seconds"] += time.perf_counter() - start
+        return [label for pack_labels in results for label in pack_labels]
+
+    async def close(self):
+        await self.client.close()
+
+    async def _classify_pack(self, pack: List[str], categories: List[str], semaphore: asyncio.Semaphore,
+                             request_bucket: TokenBucket, token_bucket: TokenBucket) -> List[Label]:
+        prompt = build_prompt(pack, categories, self.multi_label)
+        max_tokens = 10 + len(pack) * (40 if self.multi_label else 15)
+        estimated_tokens = len(prompt) + max_tokens  # 한글은 대략 글자당 토큰 하나 이하
+        for attempt in range(self.max_retries + 1):
+            # 세마포어는 요청 한 번 동안만 잡고, 백오프 대기는 풀어 둔 채로 해 다른 묶음이 그 자리를 씁니다.
+            async with semaphore:
+                await request_bucket.acquire()
+                await token_bucket.acquire(estimated_tokens)
+                self.stats["requests"] += 1
+                try:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=max_tokens,
+                        temperature=0,
+                    )
+                    return parse_reply(response.choices[0].message.content, len(pack), categories, self.multi_label)
+                except openai.AuthenticationError:
+                    self.stats["failed_requests"] += 1
+                    return [AUTH_ERROR_LABEL] * len(pack)
+                except _RETRYABLE as e:
+                    if isinstance(e, openai.RateLimitError):
+                        self.stats["rate_limited"] += 1
+                    elif isinstance(e, openai.APITimeoutError):
+                        self.stats["timeouts"] += 1
+                    if attempt == self.max_retries:
+                        break
+                    self.stats["retries"] += 1
+                    delay = self._backoff(attempt, e)
+                except openai.OpenAIError:
+                    break
+            await asyncio.sleep(delay)
+        self.stats["failed_requests"] += 1
+        return [ERROR_LABEL] * len(pack)
+
+    @staticmethod
+    def _backoff(attempt: int, error: Exception) -> float:
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            if retry_after is not None:
+                return min(BACKOFF_MAX, float(retry_after))
+        except ValueError:
+            pass
+        return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def classify_paragraphs(paragraphs: List[str], api_key: str, categories: List[str], **options) -> List[Label]:
+    """동기 코드(streamlit 페이지, worker)에서 쓰는 진입점. options 는 AsyncOpenAIClassifier 인자입니다."""
+    async def run():
+        classifier = AsyncOpenAIClassifier(api_key, **options)
+        try:
+            return await classifier.classify(paragraphs, categories)
+        finally:
+            await classifier.close()
+
+    return asyncio.run(run())
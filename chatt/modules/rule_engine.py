@@ -1,42 +1,112 @@
-# 파일: modules/rule_engine.py
-
-from typing import List, Dict, Callable, Any
-
-class RuleEngine:
-    def __init__(self, rules: List[dict], custom_functions: Dict[str, Callable] = None):
-        self.rules = rules
-        self.custom_functions = custom_functions or {}
-
-    def match_rules(self, saju_status: dict) -> List[dict]:
-        matched = []
-        for rule in self.rules:
-            ok = True
-            for cond in rule["conditions"]:
-                # ["key", value] 형식 (기본 조건)
-                if isinstance(cond, list) and len(cond) == 2:
-                    if saju_status.get(cond[0], False) != cond[1]:
-                        ok = False
-                        break
-                # {"custom_condition": "함수명"} 형식 (커스텀 논리)
-                elif isinstance(cond, dict) and "custom_condition" in cond:
-                    func = self.custom_functions.get(cond["custom_condition"])
-                    if func is None or not func(saju_status):
-                        ok = False
-                        break
-            if ok:
-                matched.append(rule)
-        return matched
-
-    def explain(self, saju_status: dict, matched_rules: List[dict]) -> List[str]:
-        explanations = []
-        for rule in matched_rules:
-            # 템플릿 활용 (상태 dict의 키 사용)
-            if "explanation_template" in rule:
-                try:
-                    explanation = rule["explanation_template"].format(**saju_status)
-                except Exception:
-                    explanation = rule["result"]
-                explanations.append(f"[{rule['rule_name']}] {explanation}")
-            else:
-                explanations.append(f"[{rule['rule_name']}] {rule['result']}")
-        return explanations
+# 파일: modules/rule_engine.py
+
+from collections import defaultdict
+from typing import List, Dict, Callable, Any
+
+import numpy as np
+
+
+class _CompiledRule:
+    """컴파일된 규칙 하나. 조건 노드로 처리되지 않는 나머지(직접 비교/커스텀) 조건을 들고 있습니다."""
+    __slots__ = ("rule", "residual", "customs")
+
+    def __init__(self, rule: dict):
+        self.rule = rule
+        self.residual = []      # 해시할 수 없는 값과의 비교 조건 [(key, value)]
+        self.customs = []       # 커스텀 함수 이름
+
+
+class RuleEngine:
+    def __init__(self, rules: List[dict], custom_functions: Dict[str, Callable] = None):
+        self.rules = rules
+        self.custom_functions = custom_functions or {}
+        self.compile()
+
+    def compile(self):
+        """
+        규칙의 ["key", value] 조건을 판별 네트워크(discrimination network)로 컴파일합니다.
+        서로 다른 (key, value) 조건마다 노드를 하나만 만들어 그 조건을 가진 모든 규칙이 공유하고,
+        각 노드는 자신을 가진 규칙 번호 배열을 기억합니다. self.rules 를 바꾼 뒤에는 다시 호출해야 합니다.
+        """
+        index: Dict[Any, Dict[Any, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self._compiled: List[_CompiledRule] = []
+        required = []
+
+        for order, rule in enumerate(self.rules):
+            compiled = _CompiledRule(rule)
+            nodes = set()
+            for cond in rule["conditions"]:
+                # ["key", value] 형식 (기본 조건)
+                if isinstance(cond, list) and len(cond) == 2:
+                    key, value = cond
+                    try:
+                        if (key, value) not in nodes:
+                            nodes.add((key, value))
+                            index[key][value].append(order)
+                    except TypeError:
+                        # 리스트/딕셔너리처럼 해시할 수 없는 값은 후보 규칙에서 직접 비교합니다.
+                        compiled.residual.append((key, value))
+                # {"custom_condition": "함수명"} 형식 (커스텀 논리)
+                elif isinstance(cond, dict) and "custom_condition" in cond:
+                    compiled.customs.append(cond["custom_condition"])
+            required.append(len(nodes))
+            self._compiled.append(compiled)
+
+        # key → {value: 규칙 번호 배열}
+        self._index: Dict[Any, Dict[Any, np.ndarray]] = {
+            key: {value: np.array(orders, dtype=np.int64) for value, orders in values.items()}
+            for key, values in index.items()
+        }
+        self._required = np.array(required, dtype=np.int64)
+        self._has_extra = [bool(c.residual or c.customs) for c in self._compiled]
+
+    def match_rules(self, saju_status: dict) -> List[dict]:
+        # saju_status 는 dict 또는 get/keys 를 가진 매핑(예: SajuChart)이면 됩니다.
+        # 1. 상태의 각 key 를 한 번씩만 조회해 만족된 조건 노드를 찾고,
+        #    규칙별로 만족된 노드 수를 세어 필요한 수와 같은 규칙만 후보로 남깁니다.
+        hits = []
+        for key, values in self._index.items():
+            try:
+                orders = values.get(saju_status.get(key, False))
+            except TypeError:  # 상태 값이 해시 불가(리스트 등)면 어떤 노드 값과도 같을 수 없습니다.
+                continue
+            if orders is not None:
+                hits.append(orders)
+        if hits:
+            satisfied = np.bincount(np.concatenate(hits), minlength=len(self._compiled))
+        else:
+            satisfied = np.zeros(len(self._compiled), dtype=np.int64)
+        candidates = np.flatnonzero(satisfied == self._required).tolist()
+
+        # 2. 남은 직접 비교 조건, 3. 커스텀 함수 조건(상태별로 한 번만 실행) 순서로 확인합니다.
+        custom_results = {}
+        matched = []
+        for order in candidates:
+            compiled = self._compiled[order]
+            if self._has_extra[order]:
+                if any(saju_status.get(key, False) != value for key, value in compiled.residual):
+                    continue
+                if not all(self._run_custom(name, saju_status, custom_results) for name in compiled.customs):
+                    continue
+            matched.append(compiled.rule)
+        return matched
+
+    def _run_custom(self, name: str, saju_status: dict, memo: dict) -> bool:
+        if name not in memo:
+            func = self.custom_functions.get(name)
+            memo[name] = func is not None and bool(func(saju_status))
+        return memo[name]
+
+    def explain(self, saju_status: dict, matched_rules: List[dict]) -> List[str]:
+        explanations = []
+        for rule in matched_rules:
+            # 템플릿 활용 (상태 dict의 키 사용)
+            if "explanation_template" in rule:
+                try:
+                    explanation = rule["explanation_template"].format(**saju_status)
+                except Exception:
+                    explanation = rule["result"]
+                explanations.append(f"[{rule['rule_name']}] {explanation}")
+            else:
+                explanations.append(f"[{rule['rule_name']}] {rule['result']}")
+        return explanations
@@ -1,68 +1,166 @@
-import os, json, re
-
-# 1. 파일 파서
-def read_lines(filename):
-    with open(filename, encoding='utf-8') as f:
-        return [line.strip() for line in f if line.strip()]
-
-# 2. 군집화/블록화
-def blockify(lines, filename):
-    blocks, block = [], None
-    for line in lines:
-        if re.match(r'^<사례\s*\d+>|^사례\d*[\):]', line):
-            if block: blocks.append(block)
-            block = {"type":"사례", "title":line, "팔자":[], "대운":[], "본문":[], "tags":[], "meta":{"source":filename}}
-        elif block:
-            if re.match(r"^[甲乙丙丁戊己庚辛壬癸⼀-⿕]+.*[(乾)(坤)]?$", line): block["팔자"].append(line)
-            elif re.match(r"^[戌亥子丑寅卯申未午酉辰巳⺒]+$", line): block["팔자"].append(line)
-            elif line.startswith("대운"): continue
-            elif re.match(r"^[甲乙丙丁戊己庚辛壬癸⼀-⿕]+", line): block["대운"].append(line)
-            elif re.match(r"^[戌亥子丑寅卯申未午酉辰巳⺒]+", line): block["대운"].append(line)
-            elif "제압방식" in line or "구조" in line or "格" in line:
-                block["tags"].extend(re.findall(r"[傷官印財比劫官殺格構造제압적포귀격합충파형穿墓공망운응기생극화허투]", line))
-                block["본문"].append(line)
-            else: block["본문"].append(line)
-        else:
-            blocks.append({"type":"해설문", "text":line, "meta":{"source":filename}})
-    if block: blocks.append(block)
-    for b in blocks:
-        if "tags" in b: b["tags"] = list(set(b["tags"]))
-    return blocks
-
-# 3. 중복제거/병합
-def merge_blocks(existing, new):
-    seen, merged = set(), []
-    for b in existing + new:
-        key = json.dumps(b, ensure_ascii=False, sort_keys=True)
-        if key not in seen:
-            merged.append(b)
-            seen.add(key)
-    return merged
-
-# 4. RULES 예시 (UI에서 동적 추가도 가능)
-DEFAULT_RULES = [
-    {"keyword": "직업", "label": "진로"},
-    {"keyword": "관계", "label": "대인관계"},
-]
-
-def apply_rules(blocks, rules):
-    for b in blocks:
-        tags = set(b.get('tags', []))
-        for rule in rules:
-            if '본문' in b and any(rule['keyword'] in txt for txt in b['본문']):
-                tags.add(rule['label'])
-        b['tags'] = list(tags)
-    return blocks
-
-# 5. AI 요약/해설 (openai 필요)
-def ai_generate(text, openai_key, prompt="이 내용을 명리 용어로 간단 요약:"):
-    import openai
-    openai.api_key = openai_key
-    resp = openai.ChatCompletion.create(
-        model="gpt-3.5-turbo",
-        messages=[
-            {"role":"system", "content": prompt},
-            {"role":"user", "content": text}
-        ]
-    )
-    return resp.choices[0].message.content.strip()
+import json, re, hashlib, sqlite3
+
+from modules.keyword_matcher import KeywordRules
+
+# 블록 분류 패턴 (줄마다 다시 컴파일하지 않도록 모듈 로드 시 한 번만)
+CASE_HEADER = re.compile(r'^<사례\s*\d+>|^사례\d*[\):]')
+PALJA_STEM_LINE = re.compile(r"^[甲乙丙丁戊己庚辛壬癸⼀-⿕]+.*[(乾)(坤)]?$")
+PALJA_BRANCH_LINE = re.compile(r"^[戌亥子丑寅卯申未午酉辰巳⺒]+$")
+DAEUN_STEM_LINE = re.compile(r"^[甲乙丙丁戊己庚辛壬癸⼀-⿕]+")
+DAEUN_BRANCH_LINE = re.compile(r"^[戌亥子丑寅卯申未午酉辰巳⺒]+")
+TAG_CHARS = re.compile(r"[傷官印財比劫官殺格構造제압적포귀격합충파형穿墓공망운응기생극화허투]")
+
+BLOCK_INDEX_PATH = "block_index.db"
+
+# 1. 파일 파서
+def iter_lines(filename):
+    """파일을 한 줄씩 읽어 앞뒤 공백을 뗀 비어 있지 않은 줄을 내보냅니다. (파일 크기와 무관하게 메모리 일정)"""
+    with open(filename, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+def read_lines(filename):
+    return list(iter_lines(filename))
+
+# 2. 군집화/블록화
+def _finish(block):
+    block["tags"] = sorted(set(block["tags"]))  # 순서를 고정해야 같은 블록이 같은 해시를 가집니다.
+    return block
+
+def iter_blocks(lines, filename):
+    """줄 스트림을 블록으로 묶어 하나씩 내보냅니다. 메모리에는 만들고 있는 블록 하나만 남습니다."""
+    block = None
+    for line in lines:
+        if CASE_HEADER.match(line):
+            if block: yield _finish(block)
+            block = {"type":"사례", "title":line, "팔자":[], "대운":[], "본문":[], "tags":[], "meta":{"source":filename}}
+        elif block:
+            if PALJA_STEM_LINE.match(line): block["팔자"].append(line)
+            elif PALJA_BRANCH_LINE.match(line): block["팔자"].append(line)
+            elif line.startswith("대운"): continue
+            elif DAEUN_STEM_LINE.match(line): block["대운"].append(line)
+            elif DAEUN_BRANCH_LINE.match(line): block["대운"].append(line)
+            elif "제압방식" in line or "구조" in line or "格" in line:
+                block["tags"].extend(TAG_CHARS.findall(line))
+                block["본문"].append(line)
+            else: block["본문"].append(line)
+        else:
+            yield {"type":"해설문", "text":line, "meta":{"source":filename}}
+    if block: yield _finish(block)
+
+def blockify(lines, filename):
+    return list(iter_blocks(lines, filename))
+
+# 3. 중복제거/병합
+def block_hash(block):
+    """블록 내용의 해시 (키 순서와 무관)."""
+    key = json.dumps(block, ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+class BlockIndex:
+    """
+    이미 병합한 블록의 내용 해시를 SQLite 에 보관합니다.
+    새 블록을 병합할 때 기존 지식 전체를 다시 직렬화하지 않고 새 블록만 해시해 조회하므로 비용이 O(새 블록) 입니다.
+    병합한 블록의 해시는 저장을 기다리다가 commit() 을 호출해야 색인에 기록됩니다.
+    """
+    def __init__(self, path=BLOCK_INDEX_PATH):
+        self.path = path
+        self._pending = set()  # 병합했지만 아직 저장되지 않은 블록의 해시
+        self.con = sqlite3.connect(path)
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.execute("CREATE TABLE IF NOT EXISTS block_hashes (hash TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.con.commit()
+
+    def __len__(self):
+        return self.con.execute("SELECT COUNT(*) FROM block_hashes").fetchone()[0]
+
+    def __contains__(self, block_or_hash):
+        h = block_or_hash if isinstance(block_or_hash, str) else block_hash(block_or_hash)
+        return self.con.execute("SELECT 1 FROM block_hashes WHERE hash = ?", (h,)).fetchone() is not None
+
+    def filter_new(self, blocks):
+        """처음 보는 블록만 반환하고 그 해시를 저장 대기로 둡니다. (blocks 안의 중복도 하나만 남김)"""
+        fresh = []
+        for b in blocks:
+            h = block_hash(b)
+            if h not in self._pending and h not in self:
+                self._pending.add(h)
+                fresh.append(b)
+        return fresh
+
+    def commit(self):
+        """병합 결과를 저장한 뒤 호출합니다. 저장 대기 중인 해시를 색인에 기록합니다."""
+        with self.con:
+            self.con.executemany("INSERT OR IGNORE INTO block_hashes (hash) VALUES (?)", ((h,) for h in self._pending))
+        self._pending.clear()
+
+    def rollback(self):
+        """저장에 실패했을 때 호출합니다. 저장 대기 중인 해시를 버려 다음 병합에서 다시 새 블록으로 봅니다."""
+        self._pending.clear()
+
+    def add_new(self, blocks):
+        """처음 보는 블록만 바로 색인에 기록하고 반환합니다."""
+        fresh = self.filter_new(blocks)
+        self.commit()
+        return fresh
+
+    def rebuild(self, blocks):
+        """기존 지식으로 색인을 처음부터 다시 만듭니다. (색인 파일을 잃었거나 지식을 손으로 고친 경우)"""
+        self._pending.clear()
+        with self.con:
+            self.con.execute("DELETE FROM block_hashes")
+        self.add_new(blocks)
+
+    def close(self):
+        self.con.close()
+
+def merge_blocks(existing, new, index=None):
+    """
+    중복 없이 병합한 새 목록을 반환합니다. index(BlockIndex) 를 주면 existing 은 이미 색인돼 있다고 보고
+    새 블록만 확인해 existing 뒤에 붙입니다. 없으면 전체를 해시합니다.
+    index 를 쓸 때는 결과를 저장한 뒤 index.commit() 을, 저장에 실패하면 index.rollback() 을 호출합니다.
+    """
+    if index is not None:
+        return existing + index.filter_new(new)
+    seen, merged = set(), []
+    for b in existing + new:
+        key = block_hash(b)
+        if key not in seen:
+            merged.append(b)
+            seen.add(key)
+    return merged
+
+# 4. RULES 예시 (UI에서 동적 추가도 가능)
+DEFAULT_RULES = [
+    {"keyword": "직업", "label": "진로"},
+    {"keyword": "관계", "label": "대인관계"},
+]
+
+def compile_rules(rules):
+    """[{"keyword", "label"}] 규칙을 한 번에 훑는 매처로 컴파일합니다. (pickle 가능: worker 에 넘길 수 있음)"""
+    return KeywordRules((rule['keyword'], rule['label']) for rule in rules)
+
+def apply_rules(blocks, rules):
+    """본문에 키워드가 있는 규칙의 label 을 tags 에 더합니다. rules 는 규칙 목록 또는 compile_rules 결과."""
+    compiled = rules if isinstance(rules, KeywordRules) else compile_rules(rules)
+    for b in blocks:
+        tags = set(b.get('tags', []))
+        if '본문' in b:
+            tags.update(compiled.all(b['본문']))
+        b['tags'] = sorted(tags)
+    return blocks
+
+# 5. AI 요약/해설 (openai 필요)
+def ai_generate(text, openai_key, prompt="이 내용을 명리 용어로 간단 요약:"):
+    import openai
+    openai.api_key = openai_key
+    resp = openai.ChatCompletion.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role":"system", "content": prompt},
+            {"role":"user", "content": text}
+        ]
+    )
+    return resp.choices[0].message.content.strip()
@@ -0,0 +1,209 @@
+# 파일 경로: modules/saju_chart.py
+
+from typing import Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from modules.ganji_tables import (CHEONGAN, CHEONGAN_HANJA, JIJI, JIJI_HANJA, SIPSIN_BRANCH, SIPSIN_HIDDEN,
+                                  SIPSIN_ORDER, SIPSIN_STEM)
+
+GAPJA = [CHEONGAN[i % 10] + JIJI[i % 12] for i in range(60)]
+# 한글('갑자')·한자('甲子') 간지 → 60갑자 인덱스
+GAPJA_INDEX = {**{name: i for i, name in enumerate(GAPJA)},
+               **{CHEONGAN_HANJA[i % 10] + JIJI_HANJA[i % 12]: i for i in range(60)}}
+
+# 차트 한 개 = 10바이트. 간지는 60갑자 인덱스, 없는 값은 -1 (대운수 -1 이면 대운 정보 없음, 세운 -1 이면 세운 없음)
+CHART_DTYPE = np.dtype([
+    ("year", "i1"), ("month", "i1"), ("day", "i1"), ("hour", "i1"),
+    ("daeun_su", "i1"), ("forward", "?"), ("daeun_nth", "i1"),  # 대운수, 순행, 현재 대운 순번(0 은 첫 대운 전)
+    ("seun", "i1"), ("seun_year", "<i2"),
+])
+_FIELDS = CHART_DTYPE.names
+DAEUN_COUNT = 10  # 원국 옆에 보여 줄 대운 수 (10년 × 10 = 100년)
+
+_SIPSIN_STEM = SIPSIN_STEM.tolist()
+_SIPSIN_BRANCH = SIPSIN_BRANCH.tolist()
+_SIPSIN_HIDDEN = SIPSIN_HIDDEN.tolist()
+
+
+def _recover_daeun(month: int, nth: int, pillar: str, start_age: int) -> Tuple[int, bool]:
+    """nth 번째 대운의 간지와 시작 나이로 (대운수, 순행)을 구합니다. 월주와 맞지 않으면 ValueError."""
+    index = GAPJA_INDEX[pillar]
+    if index == (month + nth) % 60:
+        forward = True
+    elif index == (month - nth) % 60:
+        forward = False
+    else:
+        raise ValueError(f"월주 {GAPJA[month]} 의 {nth}번째 대운이 될 수 없는 간지입니다: {pillar}")
+    return int(start_age) - (nth - 1) * 10, forward
+
+
+class SajuChart:
+    """
+    정수로 인코딩한 사주 차트. get_saju_info 의 딕셔너리와 손실 없이 오가며(from_dict / to_dict),
+    get/[]/keys 를 지원해 딕셔너리를 받던 조건 함수와 RuleEngine 에 그대로 넘길 수 있습니다.
+    여러 개는 pack() 으로 CHART_DTYPE 구조화 배열에 담아 .npy 로 저장합니다.
+    """
+    __slots__ = _FIELDS
+
+    def __init__(self, year: int, month: int, day: int, hour: int, daeun_su: int = -1, forward: bool = True,
+                 daeun_nth: int = 0, seun: int = -1, seun_year: int = 0):
+        self.year, self.month, self.day, self.hour = year, month, day, hour
+        self.daeun_su, self.forward, self.daeun_nth = daeun_su, forward, daeun_nth
+        self.seun, self.seun_year = seun, seun_year
+
+    # --- 변환 ---
+    @classmethod
+    def from_dict(cls, info: dict) -> "SajuChart":
+        wonguk = info["원국"]
+        chart = cls(*(GAPJA_INDEX[wonguk[key]] for key in ("년주", "월주", "일주", "시주")))
+        daeun, daeun_list = info.get("대운") or {}, info.get("대운목록")
+        if "대운수" in info:
+            chart.daeun_su, chart.forward = int(info["대운수"]), bool(info["순행"])
+        elif daeun_list:
+            # 대운수/순행이 빠진 딕셔너리: 첫 대운의 나이와 간지에서 되살립니다.
+            chart.daeun_su, chart.forward = _recover_daeun(chart.month, 1, daeun_list[0]["간지"], daeun_list[0]["나이"])
+        elif daeun:
+            chart.daeun_su, chart.forward = _recover_daeun(chart.month, int(daeun["순번"]),
+                                                           daeun["천간"] + daeun["지지"], daeun["시작나이"])
+        if chart.daeun_su >= 0:
+            chart.daeun_nth = int(daeun.get("순번", 0))
+        seun = info.get("세운")
+        if seun:
+            chart.seun, chart.seun_year = GAPJA_INDEX[seun["천간"] + seun["지지"]], int(seun.get("연도", 0))
+        return chart
+
+    @classmethod
+    def from_record(cls, record) -> "SajuChart":
+        return cls(*(record.tolist() if isinstance(record, np.void) else record))
+
+    def to_record(self) -> tuple:
+        return (self.year, self.month, self.day, self.hour, self.daeun_su, self.forward, self.daeun_nth,
+                self.seun, self.seun_year)
+
+    def indices(self) -> Tuple[List[int], List[int]]:
+        """(천간 4개, 지지 4개) 인덱스, 시일월년 순서 (ganji_tables 함수들의 입력)."""
+        pillars = (self.hour, self.day, self.month, self.year)
+        return [p % 10 for p in pillars], [p % 12 for p in pillars]
+
+    def _daeun_pillar(self, nth: int) -> int:
+        return (self.month + (nth if self.forward else -nth)) % 60
+
+    def to_dict(self) -> dict:
+        return {key: self[key] for key in self.keys()}
+
+    # --- 딕셔너리처럼 읽기 ---
+    def keys(self) -> List[str]:
+        keys = ["원국", "일간", "십신", "지장간십신"]
+        if self.daeun_su >= 0:
+            keys.append("대운")
+        if self.seun >= 0:
+            keys.append("세운")
+        if self.daeun_su >= 0:
+            keys += ["대운수", "순행", "대운목록"]
+        return keys
+
+    def __getitem__(self, key: str):
+        if key == "원국":
+            return {"년주": GAPJA[self.year], "월주": GAPJA[self.month], "일주": GAPJA[self.day], "시주": GAPJA[self.hour]}
+        if key == "일간":
+            return CHEONGAN[self.day % 10]
+        if key == "십신":
+            # 일간을 뺀 일곱 글자: 시간 월간 년간, 시지 일지 월지 년지 (지지는 본기)
+            day = self.day % 10
+            stems = [_SIPSIN_STEM[day][p % 10] for p in (self.hour, self.month, self.year)]
+            branches = [_SIPSIN_BRANCH[day][p % 12] for p in (self.hour, self.day, self.month, self.year)]
+            return [SIPSIN_ORDER[i] for i in stems + branches]
+        if key == "지장간십신":
+            day = self.day % 10
+            return {f"{name}지": [SIPSIN_ORDER[i] for i in _SIPSIN_HIDDEN[day][p % 12] if i >= 0]
+                    for name, p in zip("시일월년", (self.hour, self.day, self.month, self.year))}
+        if self.daeun_su >= 0:
+            if key == "대운":
+                if self.daeun_nth <= 0:
+                    return {}
+                pillar = GAPJA[self._daeun_pillar(self.daeun_nth)]
+                return {"천간": pillar[0], "지지": pillar[1], "순번": self.daeun_nth,
+                        "시작나이": self.daeun_su + (self.daeun_nth - 1) * 10}
+            if key == "대운수":
+                return self.daeun_su
+            if key == "순행":
+                return self.forward
+            if key == "대운목록":
+                return [{"나이": self.daeun_su + i * 10, "간지": GAPJA[self._daeun_pillar(i + 1)]}
+                        for i in range(DAEUN_COUNT)]
+        if key == "세운" and self.seun >= 0:
+            return {"천간": GAPJA[self.seun][0], "지지": GAPJA[self.seun][1], "연도": self.seun_year}
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key) -> bool:
+        return key in self.keys()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SajuChart) and self.to_record() == other.to_record()
+
+    def __repr__(self) -> str:
+        return (f"SajuChart({GAPJA[self.year]} {GAPJA[self.month]} {GAPJA[self.day]} {GAPJA[self.hour]}, "
+                f"대운수={self.daeun_su}, 순행={self.forward}, 대운순번={self.daeun_nth}, 세운={self.seun})")
+
+
+ChartBatch = Union[np.ndarray, Sequence[SajuChart]]
+
+
+def pack(charts: Iterable[Union[SajuChart, dict]]) -> np.ndarray:
+    """SajuChart(또는 get_saju_info 딕셔너리) 목록 → CHART_DTYPE 구조화 배열."""
+    return np.array([(c if isinstance(c, SajuChart) else SajuChart.from_dict(c)).to_record() for c in charts],
+                    dtype=CHART_DTYPE)
+
+
+def unpack(records: np.ndarray) -> List[SajuChart]:
+    return [SajuChart(*row) for row in records.tolist()]
+
+
+def is_compact(charts) -> bool:
+    """구조화 배열이거나 SajuChart 로만 이루어진 목록인지 (조건 함수가 배열 경로를 쓸 수 있는지)."""
+    if isinstance(charts, np.ndarray):
+        return charts.dtype == CHART_DTYPE
+    return bool(charts) and all(isinstance(c, SajuChart) for c in charts)
+
+
+def as_records(charts: ChartBatch) -> np.ndarray:
+    return charts if isinstance(charts, np.ndarray) else pack(charts)
+
+
+def chart_arrays(records: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """구조화 배열 → (n, 4) 천간/지지 인덱스 (시일월년). 문자열을 거치지 않습니다."""
+    pillars = np.stack([records["hour"], records["day"], records["month"], records["year"]], axis=1).astype(np.int64)
+    return pillars % 10, pillars % 12
+
+
+def daeun_pillars(records: np.ndarray) -> np.ndarray:
+    """현재 대운의 60갑자 인덱스 (대운 전이거나 정보가 없으면 -1)."""
+    nth = records["daeun_nth"].astype(np.int64)
+    pillars = (records["month"] + np.where(records["forward"], nth, -nth)) % 60
+    return np.where((nth > 0) & (records["daeun_su"] >= 0), pillars, -1)
+
+
+def save_charts(path: str, records: np.ndarray):
+    """구조화 배열을 그대로 .npy 로 씁니다. (헤더 + 원본 바이트, 변환 없음)"""
+    np.save(path, np.ascontiguousarray(records, dtype=CHART_DTYPE))
+
+
+def load_charts(path: str, mmap: bool = True) -> np.ndarray:
+    """save_charts 로 저장한 파일을 엽니다. mmap=True 면 복사 없이 메모리 매핑합니다."""
+    records = np.load(path, mmap_mode="r" if mmap else None)
+    if records.dtype != CHART_DTYPE:
+        raise ValueError(f"'{path}' 는 SajuChart 배열이 아닙니다. (dtype {records.dtype})")
+    return records
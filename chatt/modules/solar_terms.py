@@ -0,0 +1,117 @@
+# 파일 경로: modules/solar_terms.py
+
+import math
+import os
+from bisect import bisect_right
+from functools import lru_cache
+
+import numpy as np
+
+# 월주를 나누는 12절(節). 입춘부터 시작하며 각 절이 인월(寅月)~축월(丑月)의 시작입니다.
+JEOLGI_NAMES = ["입춘", "경칩", "청명", "입하", "망종", "소서", "입추", "백로", "한로", "입동", "대설", "소한"]
+# 각 절의 태양 황경(도)
+JEOLGI_LONGITUDES = [315, 345, 15, 45, 75, 105, 135, 165, 195, 225, 255, 285]
+
+FIRST_YEAR = 1800  # 표의 첫 항목: FIRST_YEAR 년 입춘
+LAST_YEAR = 2200   # 표의 마지막 항목: LAST_YEAR 년 소한 (LAST_YEAR+1 년 1월)
+
+TABLE_PATH = os.path.join(os.path.dirname(__file__), "data", "solar_terms.npy")
+
+# 표의 시각은 1970-01-01 00:00 (한국 표준시, UTC+9) 부터의 분(int32) 입니다.
+KST_OFFSET_MINUTES = 9 * 60
+_UNIX_EPOCH_JD = 2440587.5
+_TROPICAL_YEAR = 365.2422
+
+
+def _sun_apparent_longitude(jd_tt: float) -> float:
+    """태양의 겉보기 황경(도). Meeus 『Astronomical Algorithms』 25장 저정밀식 (약 0.01° 오차)."""
+    t = (jd_tt - 2451545.0) / 36525
+    l0 = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    m = math.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    c = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * math.sin(m)
+         + (0.019993 - 0.000101 * t) * math.sin(2 * m)
+         + 0.000289 * math.sin(3 * m))
+    omega = math.radians(125.04 - 1934.136 * t)
+    return (l0 + c - 0.00569 - 0.00478 * math.sin(omega)) % 360
+
+
+def _delta_t_seconds(year: float) -> float:
+    """ΔT(TT-UT) 근사값. Morrison-Stephenson 장기 포물선식."""
+    u = (year - 1820) / 100
+    return -20 + 32 * u * u
+
+
+def _solar_term_jd(year: int, longitude: float) -> float:
+    """year 년에 태양 황경이 longitude 가 되는 순간의 율리우스일(UT)을 뉴턴법으로 구합니다."""
+    # 춘분(3월 21일 무렵)을 기준으로 황경 차이만큼 떨어진 날을 초기값으로 씁니다.
+    offset = longitude if longitude < 270 else longitude - 360
+    jd = 367 * year - (7 * year) // 4 + 80 + 1721013.5 + offset / 360 * _TROPICAL_YEAR
+    for _ in range(20):
+        diff = (longitude - _sun_apparent_longitude(jd) + 180) % 360 - 180
+        jd += diff / 360 * _TROPICAL_YEAR
+        if abs(diff) < 1e-7:
+            break
+    return jd - _delta_t_seconds(year) / 86400
+
+
+def build_solar_term_table(first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR) -> np.ndarray:
+    """first_year 입춘부터 last_year 소한까지 12절 시각(KST 분)을 계산합니다. 시간이 걸리므로 한 번만 실행합니다."""
+    minutes = []
+    for year in range(first_year, last_year + 1):
+        for longitude in JEOLGI_LONGITUDES:
+            # 소한(285°)은 다음 해 1월에 들어옵니다.
+            term_year = year + 1 if longitude == 285 else year
+            jd = _solar_term_jd(term_year, longitude)
+            minutes.append(round((jd - _UNIX_EPOCH_JD) * 1440) + KST_OFFSET_MINUTES)
+    table = np.array(minutes, dtype=np.int32)
+    if np.any(np.diff(table) <= 0):
+        raise ValueError("절기표가 시간 순으로 정렬되지 않았습니다.")
+    return table
+
+
+def save_solar_term_table(path: str = TABLE_PATH) -> np.ndarray:
+    """절기표를 계산해 .npy 바이너리 파일로 저장합니다.  (python -m modules.solar_terms)"""
+    table = build_solar_term_table()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, table)
+    return table
+
+
+@lru_cache(maxsize=None)
+def load_solar_term_table() -> np.ndarray:
+    """패키지에 포함된 절기표를 읽습니다. 파일이 없으면 한 번 계산해 저장합니다."""
+    if os.path.exists(TABLE_PATH):
+        table = np.load(TABLE_PATH)
+    else:
+        table = save_solar_term_table()
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=None)
+def _solar_term_list() -> list:
+    """스칼라 조회(bisect)용 파이썬 리스트 사본."""
+    return load_solar_term_table().tolist()
+
+
+def solar_month_index(kst_minutes):
+    """
+    KST 분 시각(스칼라 또는 배열)이 표의 몇 번째 절기 구간에 속하는지 반환합니다.
+    0 은 FIRST_YEAR 년 인월(입춘~경칩 전)이고, 이후 한 달마다 1씩 증가합니다.
+    """
+    if np.ndim(kst_minutes) == 0:
+        terms = _solar_term_list()
+        index = bisect_right(terms, int(kst_minutes)) - 1
+        out_of_range = index < 0 or index >= len(terms) - 1
+    else:
+        table = load_solar_term_table()
+        index = np.searchsorted(table, kst_minutes, side='right') - 1
+        out_of_range = index.size and (index.min() < 0 or index.max() >= len(table) - 1)
+    if out_of_range:
+        raise ValueError(f"절기표 범위({FIRST_YEAR}년 입춘 ~ {LAST_YEAR + 1}년 1월)를 벗어난 날짜입니다.")
+    return index
+
+
+if __name__ == "__main__":
+    table = save_solar_term_table()
+    print(f"절기표 저장 완료: {TABLE_PATH} ({len(table)}개, {table.nbytes:,} bytes)")
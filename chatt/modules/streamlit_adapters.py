@@ -0,0 +1,36 @@
+# 파일 경로: modules/streamlit_adapters.py
+# Streamlit 페이지 전용 얇은 래퍼. 코어 모듈(ai_utils, analyzer_engine, db_handler ...)은 streamlit 을 import 하지 않고,
+# 페이지는 이 모듈을 통해 st.cache_resource(서버 전체 공유 + 스피너)를 씁니다. worker/CLI 는 이 모듈을 import 하지 않습니다.
+
+from typing import List
+
+import streamlit as st
+
+from modules import ai_utils
+from modules.analyzer_engine import SajuAnalyzer
+from modules.db_handler import get_loader
+
+
+@st.cache_resource(show_spinner="로컬 AI 모델을 불러오는 중입니다...")
+def load_classifier(mode: str = ai_utils.DEFAULT_CLASSIFIER_MODE):
+    return ai_utils.load_classifier(mode)
+
+
+def local_ai_classify(paragraphs: List[str], categories: List[str],
+                      mode: str = ai_utils.DEFAULT_CLASSIFIER_MODE) -> List[str]:
+    """ai_utils.local_ai_classify 와 같지만 모델 로드를 스피너와 함께 먼저 끝냅니다."""
+    load_classifier(mode)
+    return ai_utils.local_ai_classify(paragraphs, categories, mode=mode)
+
+
+@st.cache_resource(max_entries=1)
+def _analyzer(kb_version: int, _kb: dict) -> SajuAnalyzer:
+    # 밑줄로 시작하는 인자는 streamlit 이 해시하지 않습니다. 캐시 키는 로더의 version 이고,
+    # 최신 하나만 두므로 지식이 바뀌면 이전 지식과 분석기는 캐시에서 빠집니다.
+    return SajuAnalyzer(_kb)
+
+
+def get_analyzer() -> SajuAnalyzer:
+    """현재 지식으로 컴파일한 SajuAnalyzer. 지식 파일이 바뀌면(로더 version 증가) 다시 만듭니다."""
+    version, kb = get_loader().load_versioned()
+    return _analyzer(version, kb)
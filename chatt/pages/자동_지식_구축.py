@@ -1,88 +1,140 @@
-import streamlit as st
-import sqlite3
-import json
-import os
-import pandas as pd
-
-# db_handler는 지식 베이스에 최종 저장할 때만 사용
-from modules.db_handler import save_kb, load_kb
-
-st.set_page_config(page_title="자동 지식 구축", layout="wide")
-st.header("✨ 자동 지식 구축 (백그라운드 실행)")
-st.caption("문서를 업로드하여 분석 작업을 등록하면, 백그라운드에서 AI가 자동으로 지식을 추출합니다.")
-st.markdown("---")
-
-# --- 1. 작업 등록 UI ---
-with st.form("job_submission_form"):
-    uploaded_file = st.file_uploader("분석할 문서 업로드", type=["txt", "pdf", "docx"])
-    categories = st.text_input("분류할 카테고리 (쉼표로 구분)", value="격국,십신,재물,혼인,건강,직업,상호작용,기타")
-    submitted = st.form_submit_button("백그라운드 작업 등록")
-
-    if submitted:
-        if uploaded_file and categories:
-            # 업로드된 파일을 서버에 저장
-            save_dir = "uploads"
-            os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, uploaded_file.name)
-            with open(save_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-
-            # DB에 작업 요청 등록
-            try:
-                with sqlite3.connect("jobs.db") as con:
-                    cur = con.cursor()
-                    cur.execute(
-                        "INSERT INTO knowledge_jobs (original_filename, saved_filepath, categories, status) VALUES (?, ?, ?, ?)",
-                        (uploaded_file.name, save_path, json.dumps(categories.split(',')), 'pending')
-                    )
-                    con.commit()
-                st.success(f"'{uploaded_file.name}' 파일에 대한 분석 작업이 백그라운드에 등록되었습니다.")
-            except Exception as e:
-                st.error(f"작업 등록 중 오류 발생: {e}")
-        else:
-            st.error("파일과 카테고리를 모두 입력해주세요.")
-
-# --- 2. 작업 현황 및 결과 처리 UI ---
-st.markdown("---")
-st.subheader("백그라운드 작업 현황")
-
-try:
-    with sqlite3.connect("jobs.db") as con:
-        df = pd.read_sql_query("SELECT id, status, original_filename, created_at FROM knowledge_jobs ORDER BY id DESC", con)
-    st.dataframe(df, use_container_width=True)
-
-    completed_jobs = df[df['status'] == 'completed']
-    if not completed_jobs.empty:
-        job_id_to_process = st.selectbox("결과를 검토하고 저장할 작업 ID를 선택하세요", completed_jobs['id'])
-        
-        if job_id_to_process:
-            with sqlite3.connect("jobs.db") as con:
-                cur = con.cursor()
-                cur.execute("SELECT result_json FROM knowledge_jobs WHERE id = ?", (job_id_to_process,))
-                result_json_str = cur.fetchone()[0]
-            
-            ai_results = json.loads(result_json_str)
-            df_to_edit = pd.DataFrame({
-                "문단": ai_results.get("paragraphs", []),
-                "카테고리": ai_results.get("categories", []),
-                "태그": [""], "리뷰": [""], "승인여부": ["대기"]
-            })
-            
-            st.markdown("### 분류 결과 검토 및 최종 저장")
-            edited_df = st.data_editor(df_to_edit, num_rows="dynamic", use_container_width=True)
-            
-            save_filename = st.text_input("저장할 지식 파일 이름", value="new_rules.json")
-            if st.button("✅ 승인된 내용만 지식 베이스에 저장"):
-                approved_df = edited_df[edited_df['승인여부'] == '승인']
-                # (이 부분은 add_ai_classified_data 함수 로직을 참고하여 재구성 필요)
-                # 예시: save_kb(approved_df.to_dict('records'), save_filename)
-                st.success(f"{len(approved_df)}개의 지식이 '{save_filename}'에 저장되었습니다.")
-                
-                # 처리 완료된 작업은 상태 변경
-                with sqlite3.connect("jobs.db") as con:
-                    cur = con.cursor()
-                    cur.execute("UPDATE knowledge_jobs SET status = 'archived' WHERE id = ?", (job_id_to_process,))
-                    con.commit()
-                st.rerun()
-except Exception as e:
-    st.info("아직 등록된 작업이 없습니다. 데이터베이스가 곧 생성됩니다.")
\ No newline at end of file
+import streamlit as st
+import sqlite3
+import json
+import os
+import pandas as pd
+
+from modules import job_metrics, job_queue
+from modules.ai_utils import CLASSIFIER_MODES, DEFAULT_CLASSIFIER_MODE
+
+st.set_page_config(page_title="자동 지식 구축", layout="wide")
+st.header("✨ 자동 지식 구축 (백그라운드 실행)")
+st.caption("문서를 업로드하여 분석 작업을 등록하면, 백그라운드에서 AI가 자동으로 지식을 추출합니다.")
+st.markdown("---")
+
+job_queue.setup_database()  # worker 보다 먼저 열려도 새 열(classifier_mode 등)과 job_paragraphs 가 있도록
+
+JOBS_PAGE_SIZE = 20          # 작업 목록 한 페이지의 작업 수
+PARAGRAPHS_PAGE_SIZE = 50    # 검토 표 한 페이지의 문단 수
+COMPLETED_CHOICES = 200      # 검토할 작업 선택 목록에 보여 줄 최근 완료 작업 수
+# job_paragraphs 열 → 표 머리글
+PARAGRAPH_LABELS = {"paragraph": "문단", "category": "카테고리", "tag": "태그", "review": "리뷰", "status": "승인여부"}
+LABEL_COLUMNS = {label: column for column, label in PARAGRAPH_LABELS.items()}
+
+
+def _page_count(total: int, size: int) -> int:
+    return max(1, -(-total // size))
+
+
+# --- 1. 작업 등록 UI ---
+with st.form("job_submission_form"):
+    uploaded_file = st.file_uploader("분석할 문서 업로드", type=["txt", "pdf", "docx"])
+    categories = st.text_input("분류할 카테고리 (쉼표로 구분)", value="격국,십신,재물,혼인,건강,직업,상호작용,기타")
+    modes = list(CLASSIFIER_MODES)
+    classifier_mode = st.selectbox("분류 방식", modes, index=modes.index(DEFAULT_CLASSIFIER_MODE),
+                                   format_func=lambda mode: CLASSIFIER_MODES[mode])
+    submitted = st.form_submit_button("백그라운드 작업 등록")
+
+    if submitted:
+        if uploaded_file and categories:
+            # 업로드된 파일을 서버에 저장
+            save_dir = "uploads"
+            os.makedirs(save_dir, exist_ok=True)
+            save_path = os.path.join(save_dir, uploaded_file.name)
+            with open(save_path, "wb") as f:
+                f.write(uploaded_file.getbuffer())
+
+            # DB에 작업 요청 등록
+            try:
+                with sqlite3.connect("jobs.db") as con:
+                    cur = con.cursor()
+                    cur.execute(
+                        "INSERT INTO knowledge_jobs (original_filename, saved_filepath, categories, status, classifier_mode) VALUES (?, ?, ?, ?, ?)",
+                        (uploaded_file.name, save_path, json.dumps(categories.split(',')), 'pending', classifier_mode)
+                    )
+                    con.commit()
+                st.success(f"'{uploaded_file.name}' 파일에 대한 분석 작업이 백그라운드에 등록되었습니다.")
+            except Exception as e:
+                st.error(f"작업 등록 중 오류 발생: {e}")
+        else:
+            st.error("파일과 카테고리를 모두 입력해주세요.")
+
+# --- 2. 작업 현황 및 결과 처리 UI ---
+# 작업 목록과 문단은 한 페이지씩만 읽고, 검토 표에서 고친 행만 job_paragraphs 에 씁니다.
+st.markdown("---")
+st.subheader("백그라운드 작업 현황")
+
+try:
+    with job_queue.connect() as con:
+        total_jobs = job_queue.count_jobs(con)
+        job_pages = _page_count(total_jobs, JOBS_PAGE_SIZE)
+        job_page = st.number_input("작업 목록 페이지", min_value=1, max_value=job_pages, value=1) - 1
+        jobs = job_queue.list_jobs(con, JOBS_PAGE_SIZE, job_page * JOBS_PAGE_SIZE)
+        completed_ids = [row[0] for row in job_queue.list_jobs(con, COMPLETED_CHOICES, status="completed")]
+        summaries = job_metrics.job_summaries(con, [row[0] for row in jobs])
+        stage_totals = job_metrics.stage_totals(con)
+    df = pd.DataFrame(jobs, columns=["id", "status", "original_filename", "classifier_mode", "progress", "created_at"])
+    st.dataframe(df, use_container_width=True)
+    st.caption(f"전체 작업 {total_jobs}개 · {job_page + 1}/{job_pages} 페이지")
+
+    # 처리 지표 (worker 가 job_spans 에 남긴 단계별 시간, 단위: 초)
+    with st.expander("⏱️ 처리 지표"):
+        total = stage_totals.get("total", {})
+        queue_wait, model_load = stage_totals.get("queue_wait", {}), stage_totals.get("model_load", {})
+        cols = st.columns(4)
+        cols[0].metric("처리한 문단", f"{total.get('count') or 0:,}")
+        cols[1].metric("처리량 (문단/s)", f"{(total.get('count') or 0) / total['seconds']:.1f}" if total.get("seconds") else "-")
+        cols[2].metric("평균 대기 (s)", f"{queue_wait['seconds'] / queue_wait['jobs']:.1f}" if queue_wait else "-")
+        cols[3].metric("평균 모델 로드 (s)", f"{model_load['seconds'] / model_load['jobs']:.1f}" if model_load else "-")
+        st.dataframe(pd.DataFrame(summaries).set_index("job_id") if summaries else pd.DataFrame(),
+                     use_container_width=True)
+
+    if completed_ids:
+        job_id_to_process = st.selectbox("결과를 검토하고 저장할 작업 ID를 선택하세요", completed_ids)
+        
+        if job_id_to_process:
+            st.markdown("### 분류 결과 검토 및 최종 저장")
+            status_filter = st.selectbox("승인여부 필터", ("전체",) + job_queue.REVIEW_STATUSES)
+            status = None if status_filter == "전체" else status_filter
+            with job_queue.connect() as con:
+                total = job_queue.count_paragraphs(con, job_id_to_process, status)
+                pages = _page_count(total, PARAGRAPHS_PAGE_SIZE)
+                page = st.number_input("문단 페이지", min_value=1, max_value=pages, value=1,
+                                       key=f"paragraph_page_{job_id_to_process}_{status_filter}") - 1
+                after = job_queue.page_start(con, job_id_to_process, page, PARAGRAPHS_PAGE_SIZE, status)
+                rows = job_queue.load_paragraphs(con, job_id_to_process, PARAGRAPHS_PAGE_SIZE, after, status)
+            page_df = pd.DataFrame(rows, columns=["ordinal", *PARAGRAPH_LABELS.values()]).set_index("ordinal")
+            st.caption(f"문단 {total}개 · {page + 1}/{pages} 페이지")
+
+            # 저장할 때마다 키를 바꿔 편집 상태(edited_rows)를 비웁니다.
+            editor_key = (f"paragraphs_{job_id_to_process}_{status_filter}_{page}_"
+                          f"{st.session_state.get('paragraph_saves', 0)}")
+            st.data_editor(page_df, key=editor_key, num_rows="fixed", use_container_width=True, disabled=["문단"],
+                           column_config={"승인여부": st.column_config.SelectboxColumn(
+                               options=list(job_queue.REVIEW_STATUSES), required=True)})
+            edited_rows = st.session_state.get(editor_key, {}).get("edited_rows", {})
+            if st.button(f"💾 수정한 {len(edited_rows)}개 행 저장", disabled=not edited_rows):
+                changes = {int(page_df.index[int(position)]): {LABEL_COLUMNS[label]: value for label, value in values.items()}
+                           for position, values in edited_rows.items()}
+                with job_queue.connect() as con:
+                    updated = job_queue.update_paragraphs(con, job_id_to_process, changes)
+                st.session_state["paragraph_saves"] = st.session_state.get("paragraph_saves", 0) + 1
+                st.success(f"{updated}개 행을 저장했습니다.")
+                st.rerun()
+
+            save_filename = st.text_input("저장할 지식 파일 이름", value="new_rules.json")
+            if st.button("✅ 승인된 내용만 지식 베이스에 저장"):
+                with job_queue.connect() as con:
+                    approved = list(job_queue.iter_paragraphs(con, job_id_to_process, status="승인"))
+                # (이 부분은 add_ai_classified_data 함수 로직을 참고하여 재구성 필요)
+                # 예시: save_kb([{"문단": r[1], "카테고리": r[2], "태그": r[3], "리뷰": r[4]} for r in approved], save_filename)
+                st.success(f"{len(approved)}개의 지식이 '{save_filename}'에 저장되었습니다.")
+                
+                # 처리 완료된 작업은 상태 변경
+                with job_queue.connect() as con:
+                    con.execute("UPDATE knowledge_jobs SET status = 'archived' WHERE id = ?", (job_id_to_process,))
+                    con.commit()
+                st.rerun()
+except sqlite3.OperationalError as e:
+    # 코드 오류는 그대로 드러나게 두고, DB 를 읽지 못한 경우만 알립니다. (잠김, 손상 등)
+    st.error(f"작업 현황을 불러오는 중 오류 발생: {e}")
\ No newline at end of file
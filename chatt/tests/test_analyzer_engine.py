@@ -0,0 +1,45 @@
+# 파일 경로: tests/test_analyzer_engine.py
+# 실행: chatt 폴더에서  python -m pytest -q
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from modules.analyzer_engine import GAPJA, get_ganji, get_ganji_indices_batch, get_luck_timeline, get_saju_info
+from modules.solar_terms import FIRST_YEAR, load_solar_term_table
+
+
+def _ipchun(year: int) -> datetime:
+    """절기표의 year 년 입춘 시각 (KST)."""
+    minutes = int(load_solar_term_table()[(year - FIRST_YEAR) * 12])
+    return datetime(1970, 1, 1) + timedelta(minutes=minutes)
+
+
+@pytest.mark.parametrize("offset, year_pillar, month_pillar", [(-3, "계묘", "을축"), (3, "갑진", "병인")])
+def test_minutes_around_ipchun(offset, year_pillar, month_pillar):
+    birth = _ipchun(2024) + timedelta(minutes=offset)
+    assert birth.hour == (birth - timedelta(minutes=offset)).hour  # 같은 '시' 안에서 분만 다름
+
+    info = get_saju_info(birth.date(), birth.time(), "남", False, ref_date=date(2030, 1, 1))
+    assert (info["원국"]["년주"], info["원국"]["월주"]) == (year_pillar, month_pillar)
+
+    ganji = get_ganji(birth.year, birth.month, birth.day, birth.hour, birth.minute)
+    assert (ganji["년주"], ganji["월주"]) == (year_pillar, month_pillar)
+
+    batch = get_ganji_indices_batch(np.array([birth], dtype="datetime64[m]"))
+    assert (GAPJA[batch["년주"][0]], GAPJA[batch["월주"][0]]) == (year_pillar, month_pillar)
+
+
+def test_luck_timeline_measures_from_minute():
+    # 입춘 3분 뒤 양남(갑진년 남자)은 순행이고, 다음 절(경칩)까지의 날 수로 대운 시작 나이를 잽니다.
+    birth = _ipchun(2024) + timedelta(minutes=3)
+    timeline = get_luck_timeline(birth, "남")
+    gyeongchip = datetime(1970, 1, 1) + timedelta(minutes=int(load_solar_term_table()[(2024 - FIRST_YEAR) * 12 + 1]))
+    assert bool(timeline["순행"])
+    assert timeline["시작나이"] == pytest.approx((gyeongchip - birth).total_seconds() / 86400 / 3)
+
+
+def test_outside_solar_term_table_raises():
+    with pytest.raises(ValueError):
+        get_ganji(1700, 6, 1, 12)
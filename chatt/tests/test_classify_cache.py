@@ -0,0 +1,23 @@
+# 파일 경로: tests/test_classify_cache.py
+# 실행: chatt 폴더에서  python -m pytest -q
+
+from modules.classify_cache import ClassificationCache
+
+
+def _count(cache):
+    return cache._con.execute("SELECT COUNT(*) FROM classify_cache").fetchone()[0]
+
+
+def test_running_entry_count_tracks_inserts_and_eviction(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = ClassificationCache(db_path, max_entries=100)
+    classify = lambda paragraphs, categories: ["재물"] * len(paragraphs)
+    for start in range(0, 130, 10):
+        cache.classify([f"문단 {n}" for n in range(start, start + 10)] + ["문단 0"], ["재물"], "m", classify)
+        assert cache.stats()["entries"] == _count(cache) <= 100
+    cache.close()
+
+    # 다시 열면 저장된 항목 수를 이어서 씁니다.
+    reopened = ClassificationCache(db_path, max_entries=100)
+    assert reopened.stats()["entries"] == _count(reopened)
+    reopened.close()
@@ -0,0 +1,21 @@
+# 파일 경로: tests/test_doc_stream.py
+# 실행: chatt 폴더에서  python -m pytest -q
+
+import random
+import re
+
+from modules.doc_stream import iter_paragraphs
+
+
+def _split(text, cuts):
+    bounds = [0] + sorted(cuts) + [len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+def test_iter_paragraphs_matches_whole_text_split():
+    rng = random.Random(0)
+    for _ in range(300):
+        text = "".join(rng.choice(["가", "나", " ", "\n", "\t", "\n\n", " \n \n"]) for _ in range(rng.randrange(60)))
+        expected = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+        cuts = [rng.randrange(len(text) + 1) for _ in range(rng.randrange(8))]
+        assert list(iter_paragraphs(_split(text, cuts))) == expected
@@ -0,0 +1,15 @@
+# 파일 경로: tests/test_ganji_tables.py
+# 실행: chatt 폴더에서  python -m pytest -q
+
+from modules.ganji_tables import CHEONGAN_HANJA, JIJI_HANJA, SIPSIN_BRANCH, SIPSIN_HIDDEN, SIPSIN_ORDER
+
+
+def test_sipsin_branch_uses_main_hidden_stem():
+    # 지지 십신은 지장간 정기(마지막 칸) 십신과 같아야 합니다.
+    assert (SIPSIN_BRANCH == SIPSIN_HIDDEN[:, :, 2]).all()
+
+
+def test_sipsin_branch_yin_yang_reversed_branches():
+    day = CHEONGAN_HANJA.index("甲")
+    expected = {"子": "정인", "午": "상관", "巳": "식신", "亥": "편인"}
+    assert {b: SIPSIN_ORDER[SIPSIN_BRANCH[day, JIJI_HANJA.index(b)]] for b in expected} == expected
@@ -0,0 +1,22 @@
+# 파일 경로: tests/test_kb_loader.py
+# 실행: chatt 폴더에서  python -m pytest -q
+
+import copy
+
+from modules.kb_loader import KnowledgeLoader
+from modules.kb_storage import append_journal, atomic_write_json
+
+
+def test_journal_append_does_not_mutate_previous_result(tmp_path):
+    file_path = str(tmp_path / "rules.json")
+    atomic_write_json(file_path, {"격국": {"정관격": "a"}, "규칙": [1]})
+    append_journal(file_path, {"규칙": [2]})
+    loader = KnowledgeLoader(str(tmp_path))
+    before = loader.load()
+    snapshot = copy.deepcopy(before)
+
+    append_journal(file_path, {"격국": {"편관격": "b"}, "규칙": [3]})
+    after = loader.load()
+
+    assert before == snapshot
+    assert after == {"격국": {"정관격": "a", "편관격": "b"}, "규칙": [1, 2, 3]}
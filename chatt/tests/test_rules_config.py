@@ -0,0 +1,25 @@
+# 파일 경로: tests/test_rules_config.py
+# 실행: chatt 폴더에서  python -m pytest -q
+
+from modules.rules_config import BlockIndex, merge_blocks
+
+
+def _block(n):
+    return {"type": "해설문", "text": f"문단 {n}", "meta": {"source": "test"}}
+
+
+def test_indexed_merge_records_hashes_only_after_commit(tmp_path):
+    index = BlockIndex(str(tmp_path / "block_index.db"))
+    existing = [_block(0)]
+    index.rebuild(existing)
+
+    merged = merge_blocks(existing, [_block(0), _block(1), _block(1)], index=index)
+    assert merged == [_block(0), _block(1)]
+    assert existing == [_block(0)]  # 새 목록을 반환하고 existing 은 그대로
+    assert _block(1) not in index
+
+    index.rollback()  # 저장 실패: 다음 병합에서 다시 새 블록으로 봅니다.
+    assert merge_blocks(existing, [_block(1)], index=index) == merged
+    index.commit()
+    assert _block(1) in index and len(index) == 2
+    index.close()
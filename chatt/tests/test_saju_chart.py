@@ -0,0 +1,28 @@
+# 파일 경로: tests/test_saju_chart.py
+# 실행: chatt 폴더에서  python -m pytest -q
+
+from datetime import date, time
+
+import pytest
+
+from modules.analyzer_engine import get_saju_info
+from modules.saju_chart import SajuChart
+
+
+@pytest.mark.parametrize("gender", ["남", "여"])
+def test_from_dict_keeps_daeun_without_daeun_su(gender):
+    chart = get_saju_info(date(1990, 5, 17), time(8, 20), gender, False, ref_date=date(2025, 3, 1), compact=True)
+    info = chart.to_dict()
+    del info["대운수"], info["순행"]
+    assert SajuChart.from_dict(info) == chart
+    # 대운목록도 없으면 현재 대운에서 되살립니다.
+    del info["대운목록"]
+    assert SajuChart.from_dict(info) == chart
+
+
+def test_from_dict_rejects_daeun_not_matching_month_pillar():
+    info = get_saju_info(date(1990, 5, 17), time(8, 20), "남", False, ref_date=date(2025, 3, 1))
+    del info["대운수"], info["순행"]
+    info["대운목록"] = [{"나이": 5, "간지": info["원국"]["월주"]}] + info["대운목록"][1:]
+    with pytest.raises(ValueError):
+        SajuChart.from_dict(info)
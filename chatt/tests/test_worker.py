@@ -0,0 +1,28 @@
+# 파일 경로: tests/test_worker.py
+# 실행: chatt 폴더에서  python -m pytest -q
+
+import json
+
+import worker
+from modules import job_queue
+
+
+def test_model_load_failure_fails_claimed_job(tmp_path, monkeypatch):
+    def broken_loader(mode):
+        raise OSError("모델 파일 없음")
+
+    monkeypatch.chdir(tmp_path)  # 분류 캐시 DB 를 임시 폴더에 만듭니다.
+    monkeypatch.setattr(worker, "load_classifier", broken_loader)
+    upload = tmp_path / "doc.txt"
+    upload.write_text("첫 문단\n\n둘째 문단", encoding="utf-8")
+    db_path = str(tmp_path / "jobs.db")
+    job_queue.setup_database(db_path)
+    with job_queue.connect(db_path) as con:
+        con.execute("INSERT INTO knowledge_jobs (original_filename, saved_filepath, categories, status) "
+                    "VALUES (?, ?, ?, 'pending')", ("doc.txt", str(upload), json.dumps(["재물"])))
+
+    worker.run_worker(db_path=db_path, stop_when_idle=True)
+
+    with job_queue.connect(db_path) as con:
+        status, result = con.execute("SELECT status, result_json FROM knowledge_jobs").fetchone()
+    assert status == "failed" and "모델 파일 없음" in result
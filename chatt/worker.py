@@ -1,97 +1,246 @@
-# 파일명: worker.py
-
-import sqlite3
-import json
-import time
-import os
-import re
-from itertools import chain
-from PyPDF2 import PdfReader
-import docx
-
-# modules 폴더의 AI 유틸리티를 가져옵니다.
-from modules.ai_utils import local_ai_classify
-from modules.db_handler import save_kb # 최종 저장을 위해 save_kb를 사용
-
-def setup_database():
-    """jobs.db 데이터베이스와 테이블을 생성합니다."""
-    with sqlite3.connect("jobs.db") as con:
-        cur = con.cursor()
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS knowledge_jobs (
-                id INTEGER PRIMARY KEY,
-                original_filename TEXT NOT NULL,
-                saved_filepath TEXT NOT NULL,
-                categories TEXT NOT NULL,
-                status TEXT NOT NULL DEFAULT 'pending',
-                result_json TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        con.commit()
-
-def extract_text(filepath):
-    """파일 경로를 받아 텍스트를 추출하는 함수."""
-    try:
-        if filepath.endswith('.pdf'):
-            with open(filepath, 'rb') as f:
-                pdf_reader = PdfReader(f)
-                return "".join([page.extract_text() or "" for page in pdf_reader.pages])
-        elif filepath.endswith('.docx'):
-            doc = docx.Document(filepath)
-            return "\n".join([para.text for para in doc.paragraphs])
-        elif filepath.endswith('.txt'):
-            with open(filepath, 'rb') as f:
-                raw_bytes = f.read()
-                try: return raw_bytes.decode('utf-8')
-                except UnicodeDecodeError: return raw_bytes.decode('cp949', errors='ignore')
-        return None
-    except Exception as e:
-        print(f"텍스트 추출 오류: {e}")
-        return None
-
-def process_pending_job():
-    """'pending' 상태의 작업을 하나 가져와 처리합니다."""
-    job_processed = False
-    with sqlite3.connect("jobs.db") as con:
-        cur = con.cursor()
-        cur.execute("SELECT * FROM knowledge_jobs WHERE status = 'pending' ORDER BY id LIMIT 1")
-        job = cur.fetchone()
-
-        if job:
-            job_id, _, filepath, categories_json, _, _, _ = job
-            job_processed = True
-            print(f"▶️ 작업 시작: Job ID {job_id}, File: {filepath}")
-            
-            cur.execute("UPDATE knowledge_jobs SET status = 'running' WHERE id = ?", (job_id,))
-            con.commit()
-
-            try:
-                text = extract_text(filepath)
-                if text:
-                    paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
-                    cat_list = json.loads(categories_json)
-                    
-                    results = local_ai_classify(paragraphs, cat_list)
-                    
-                    # 결과를 JSON 형태로 변환
-                    output_data = {"paragraphs": paragraphs, "categories": results}
-                    result_json_str = json.dumps(output_data, ensure_ascii=False)
-                    
-                    cur.execute("UPDATE knowledge_jobs SET status = 'completed', result_json = ? WHERE id = ?", (result_json_str, job_id))
-                    print(f"✅ 작업 완료: Job ID {job_id}")
-                else:
-                    raise ValueError("파일에서 텍스트를 추출하지 못했습니다.")
-            except Exception as e:
-                cur.execute("UPDATE knowledge_jobs SET status = 'failed', result_json = ? WHERE id = ?", (str(e), job_id))
-                print(f"❌ 작업 실패: Job ID {job_id}, Error: {e}")
-            
-            con.commit()
-    return job_processed
-
-if __name__ == "__main__":
-    setup_database()
-    print("백그라운드 작업자(worker)를 시작합니다. (Ctrl+C로 종료)")
-    while True:
-        if not process_pending_job():
-            time.sleep(5) # 할 일이 없으면 5초 대기
\ No newline at end of file
+# 파일명: worker.py
+
+import argparse
+import json
+import time
+import os
+import threading
+import multiprocessing
+from itertools import islice
+
+# modules 폴더의 AI 유틸리티를 가져옵니다.
+from modules.ai_utils import local_ai_classify, load_classifier, DEFAULT_CLASSIFIER_MODE
+from modules import doc_stream, job_metrics, job_queue
+from modules.classify_cache import ClassificationCache
+
+IDLE_SLEEP_MIN = 0.5   # 할 일이 없을 때 처음 대기 시간(초)
+IDLE_SLEEP_MAX = 10.0  # 대기 시간은 두 배씩 늘어나 이 값에서 멈춥니다.
+CHUNK_SIZE = 32        # 한 번에 분류하고 커밋하는 문단 수
+
+def setup_database():
+    """jobs.db 데이터베이스와 테이블을 생성합니다."""
+    job_queue.setup_database()
+
+def _keep_lease(con, job_id, worker_id, stop_event):
+    """작업을 처리하는 동안 주기적으로 임대를 연장합니다."""
+    while not stop_event.wait(job_queue.LEASE_SECONDS / 3):
+        if not job_queue.renew_lease(con, job_id, worker_id):
+            return
+
+def _db_path_of(con):
+    """연결이 가리키는 데이터베이스 파일 경로."""
+    return con.execute("PRAGMA database_list").fetchone()[2]
+
+def _run_job(con, job, worker_id, classify, timer):
+    """가져온 작업 하나를 청크 단위로 분류해 커밋하고 완료/실패를 기록합니다."""
+    job_id, filepath, categories_json, mode = job
+    started = time.perf_counter()
+    paragraph_count = 0
+    try:
+        if not filepath.endswith(('.pdf', '.docx', '.txt')):
+            raise ValueError("파일에서 텍스트를 추출하지 못했습니다.")
+        cat_list = json.loads(categories_json)
+
+        # 이전에 커밋된 청크는 건너뛰고 이어서 처리합니다. (문서 전체를 메모리에 올리지 않음)
+        chunks_done, chunk_size = job_queue.start_progress(con, job_id, CHUNK_SIZE)
+        if chunks_done:
+            print(f"↪️ 이어서 처리: Job ID {job_id}, {chunks_done}번째 청크부터")
+        # doc_stream.iter_document_paragraphs 와 같은 흐름이지만, 추출(조각 읽기)과 분할(문단 나누기)을 따로 잽니다.
+        pieces = timer.iterate("extract", doc_stream.iter_text_pieces(filepath))
+        paragraphs = timer.iterate("split", islice(doc_stream.iter_paragraphs(pieces), chunks_done * chunk_size, None))
+        chunk_index = chunks_done
+        for chunk in doc_stream.chunked(paragraphs, chunk_size):
+            with timer.span("classify", len(chunk)):
+                results = classify(chunk, cat_list, mode=mode)
+            with timer.span("db_write", len(chunk)):
+                saved = job_queue.save_chunk(con, job_id, worker_id, chunk_index, chunk, results)
+            if not saved:
+                print(f"⚠️ 임대를 잃어 중단: Job ID {job_id}")
+                return
+            chunk_index += 1
+            paragraph_count += len(chunk)
+
+        if chunk_index == 0:
+            raise ValueError("파일에서 텍스트를 추출하지 못했습니다.")
+        # 결과는 문단별로 job_paragraphs 에 있습니다. (job_queue.load_paragraphs 로 조회)
+        job_queue.finish_job(con, job_id, worker_id, 'completed', None)
+        print(f"✅ 작업 완료: Job ID {job_id}")
+    except Exception as e:
+        job_queue.finish_job(con, job_id, worker_id, 'failed', str(e))
+        print(f"❌ 작업 실패: Job ID {job_id}, Error: {e}")
+    finally:
+        timer.add("total", time.perf_counter() - started, paragraph_count)
+
+def process_pending_job(con=None, worker_id=None, classify=local_ai_classify, timer=None):
+    """
+    'pending' 상태의 작업을 하나 원자적으로 가져와 처리합니다.
+    classify(문단들, 카테고리, mode=작업의 분류 방식) 로 청크를 분류합니다.
+    단계별 시간(추출/분할/분류/DB 쓰기, 대기 시간)은 timer(job_metrics.StageTimer)에 모아 job_spans 에 남기고,
+    JOB_PROFILE 환경 변수로 고른 작업은 프로파일을 남깁니다. (modules/job_metrics.py)
+    """
+    own_connection = con is None
+    if own_connection:
+        con = job_queue.connect()
+    worker_id = worker_id or job_queue.worker_name()
+    try:
+        job = job_queue.claim_job(con, worker_id)
+        if not job:
+            return False
+
+        job_id, filepath, _, mode = job
+        print(f"▶️ 작업 시작: Job ID {job_id}, File: {filepath}, 분류 방식: {mode} ({worker_id})")
+        timer = timer or job_metrics.StageTimer()
+        wait = job_metrics.queue_wait_seconds(con, job_id)
+        if wait is not None:
+            timer.add("queue_wait", wait)
+
+        # 임대 연장은 별도 연결로 (sqlite 연결은 스레드 간에 공유하지 않습니다)
+        stop_event = threading.Event()
+        lease_con = job_queue.connect(_db_path_of(con))
+        heartbeat = threading.Thread(target=_keep_lease, args=(lease_con, job_id, worker_id, stop_event), daemon=True)
+        heartbeat.start()
+        try:
+            with job_metrics.profile_job(job_id) as profile_path:
+                _run_job(con, job, worker_id, classify, timer)
+            if profile_path:
+                print(f"🔬 프로파일 저장: {profile_path}")
+        finally:
+            stop_event.set()
+            heartbeat.join()
+            lease_con.close()
+            _record_metrics(con, job_id, worker_id, timer)
+        return True
+    finally:
+        if own_connection:
+            con.close()
+
+def _record_metrics(con, job_id, worker_id, timer):
+    """단계 시간을 job_spans 에 더하고, 설정돼 있으면 Prometheus 지표 파일을 갱신합니다."""
+    try:
+        timer.save(con, job_id, worker_id)
+        metrics_file = os.environ.get(job_metrics.METRICS_FILE_ENV)
+        if metrics_file:
+            job_metrics.write_prometheus(con, metrics_file)
+    except Exception as e:  # 지표 기록 실패가 작업 처리를 막지는 않습니다.
+        print(f"⚠️ 지표 기록 실패: Job ID {job_id}, {e}")
+    total = timer.seconds["total"]
+    if total:
+        stages = ", ".join(f"{stage} {timer.seconds[stage]:.2f}s" for stage in job_metrics.PIPELINE_STAGES)
+        print(f"⏱️ Job ID {job_id}: {timer.counts['total']}문단 {total:.2f}s "
+              f"({timer.counts['total'] / total:.1f} 문단/s; {stages})")
+
+def print_stats(db_path=job_queue.DB_PATH, limit=20, prometheus_path=None):
+    """최근 작업들의 단계별 시간과 전체 합계를 출력합니다. prometheus_path 를 주면 지표 파일도 씁니다."""
+    def fmt(value, spec=".2f"):
+        return "-" if value is None else format(value, spec)
+
+    job_queue.setup_database(db_path)
+    with job_queue.connect(db_path) as con:
+        jobs = job_queue.list_jobs(con, limit)
+        summaries = job_metrics.job_summaries(con, [job[0] for job in jobs])
+        columns = job_metrics.JOB_STAGES + job_metrics.PIPELINE_STAGES
+        print(f"{'job':>5} {'status':<10} {'문단':>6} {'문단/s':>8} " + " ".join(f"{c:>10}" for c in columns))
+        for job, summary in zip(jobs, summaries):
+            print(f"{job[0]:>5} {job[1]:<10} {summary['paragraphs']:>6} {fmt(summary['paragraphs_per_sec'], '.1f'):>8} "
+                  + " ".join(f"{fmt(summary[c]):>10}" for c in columns))
+        totals = job_metrics.stage_totals(con)
+        print("\n전체 (초, 배타 시간):")
+        for stage in columns:
+            if stage in totals:
+                print(f"  {stage:<10} {totals[stage]['seconds']:>10.2f} s  "
+                      f"(작업 {totals[stage]['jobs']}개, 처리 {totals[stage]['count']}개)")
+        if prometheus_path:
+            job_metrics.write_prometheus(con, prometheus_path)
+            print(f"Prometheus 지표: {prometheus_path}")
+
+def run_worker(index=0, db_path=job_queue.DB_PATH, classify=None, stop_when_idle=False):
+    """
+    작업자 한 명의 반복 루프. 프로세스마다 모델을 한 번만 로드하고 (로드 시간은 첫 작업의 model_load 로 기록),
+    할 일이 없으면 대기 시간을 IDLE_SLEEP_MIN 부터 IDLE_SLEEP_MAX 까지 두 배씩 늘립니다.
+    모델 로드에 실패해도 작업자는 멈추지 않고, 가져온 작업을 그 오류 메시지로 실패 처리합니다.
+    """
+    cache = None
+    model_load = 0.0
+    if classify is None:
+        started = time.perf_counter()
+        try:
+            load_classifier(DEFAULT_CLASSIFIER_MODE)  # 첫 작업 전에 기본 모델을 미리 로드 (다른 방식은 처음 쓸 때 로드)
+        except Exception as e:
+            print(f"⚠️ 분류 모델 로드 실패 ({DEFAULT_CLASSIFIER_MODE}): {e}")
+        model_load = time.perf_counter() - started
+        cache = ClassificationCache()
+
+        def classify(paragraphs, categories, mode):
+            # 로드된 모델은 캐시에서 바로 돌려받고, 로드에 실패하면 예외가 _run_job 까지 올라가 작업이 실패로 기록됩니다.
+            load_classifier(mode)
+            return local_ai_classify(paragraphs, categories, cache=cache, mode=mode)
+    worker_id = job_queue.worker_name(index)
+    idle_sleep = IDLE_SLEEP_MIN
+    with job_queue.connect(db_path) as con:
+        while True:
+            timer = job_metrics.StageTimer()
+            if model_load:
+                timer.add("model_load", model_load)
+            if process_pending_job(con, worker_id, classify, timer):
+                idle_sleep = IDLE_SLEEP_MIN
+                model_load = 0.0
+                if cache is not None:
+                    stats = cache.stats()
+                    print(f"📦 분류 캐시: 적중 {stats['hits']} / 실패 {stats['misses']} "
+                          f"(적중률 {stats['hit_rate']:.0%}, 배치 내 중복 {stats['batch_duplicates']})")
+            elif stop_when_idle:
+                return
+            else:
+                time.sleep(idle_sleep)
+                idle_sleep = min(idle_sleep * 2, IDLE_SLEEP_MAX)
+
+def run_pool(workers, db_path=job_queue.DB_PATH, classify=None, stop_when_idle=False):
+    """workers 개의 프로세스에서 run_worker 를 실행하고 모두 끝날 때까지 기다립니다."""
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(i, db_path, classify, stop_when_idle), name=f"worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="지식 추출 백그라운드 작업자")
+    parser.add_argument("command", nargs="?", choices=("run", "stats"), default="run",
+                        help="run: 작업자 실행 (기본), stats: 작업별 단계 시간과 처리량 출력")
+    parser.add_argument("--workers", type=int, default=1, help="동시에 실행할 작업자 프로세스 수")
+    parser.add_argument("--limit", type=int, default=20, help="stats: 보여 줄 최근 작업 수")
+    parser.add_argument("--prometheus", metavar="PATH",
+                        help="Prometheus 텍스트 지표 파일 경로 (run: 작업마다 갱신, stats: 한 번 쓰기)")
+    parser.add_argument("--profile", metavar="JOB_IDS", help="프로파일할 작업 ID (쉼표로 구분, *: 전부)")
+    parser.add_argument("--profile-dir", default=job_metrics.DEFAULT_PROFILE_DIR, help="프로파일 저장 폴더")
+    parser.add_argument("--profiler", choices=("cprofile", "pyinstrument"), default="cprofile")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print_stats(limit=args.limit, prometheus_path=args.prometheus)
+        raise SystemExit(0)
+    # 작업자 프로세스(run_pool)도 물려받도록 환경 변수로 넘깁니다.
+    if args.prometheus:
+        os.environ[job_metrics.METRICS_FILE_ENV] = args.prometheus
+    if args.profile:
+        os.environ[job_metrics.PROFILE_ENV] = args.profile
+        os.environ[job_metrics.PROFILE_DIR_ENV] = args.profile_dir
+        os.environ[job_metrics.PROFILER_ENV] = args.profiler
+
+    setup_database()
+    print(f"백그라운드 작업자(worker) {args.workers}개를 시작합니다. (Ctrl+C로 종료)")
+    if args.workers > 1:
+        run_pool(args.workers)
+    else:
+        try:
+            run_worker()
+        except KeyboardInterrupt:
+            pass